@@ -1,16 +1,32 @@
-from datetime import datetime, timezone
-from uuid import uuid4
-from sqlmodel import Session
+import logging
+from datetime import datetime, timezone, timedelta
+from uuid import UUID, uuid4
+from sqlmodel.ext.asyncio.session import AsyncSession
 from fastapi import HTTPException
 
-from app.constants.user_constants import UserRoles
+from app.constants.response_codes import PayTrackResponseCodes
+from app.constants.user_constants import UserRoles, VerificationModels
+from app.core.http_response import PayTrackHttpResponse
+from app.core.settings import settings
 from app.models.users.user_model import UserModel
 from app.api.users.user_service import UserService
-from app.api.auth.auth_schema import SignupSchema, AuthResponseSchema
-from app.utils.security import get_user_token, verify_password
+from app.api.auth.auth_schema import (
+    SignupSchema,
+    AuthResponseSchema,
+    RefreshResponseSchema,
+    ResetPasswordRequest,
+)
+from app.core.auth import RefreshTokenSchema
+from app.utils.email import EmailService
+from app.utils.security import create_access_token, get_user_token
+from app.utils.password_hasher import password_hasher
+from app.utils.refresh_tokens import refresh_token_store
+from app.utils.verification_codes import verification_code_store
+
+logger = logging.getLogger(__name__)
 
 class AuthController:
-    def __init__(self, session: Session):
+    def __init__(self, session: AsyncSession):
         self.session = session
 
     async def signup(self, data: SignupSchema) -> AuthResponseSchema:
@@ -29,10 +45,15 @@ class AuthController:
                 role=UserRoles.CUSTOMER.value,
                 session=self.session
             )
+
+            try:
+                await self.send_verification_code(user)
+            except Exception as e:
+                # La cuenta ya existe: puede pedir otro código con /auth/resend-code
+                logger.error("Verification code for %s not sent: %r", user.user_id, e)
             
             # Generar tokens
-            access_token = get_user_token(user, is_refresh=False)
-            refresh_token = get_user_token(user, is_refresh=True)
+            access_token, refresh_token = await self.issue_tokens(user)
             
             return AuthResponseSchema(
                 user_id=user.user_id,
@@ -62,9 +83,10 @@ class AuthController:
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
-    def verify_user_password(self, user: UserModel, password: str) -> bool:
-        is_valid_password = verify_password(
-            plain_password=password, hashed_password=user.password
+    async def verify_user_password(self, user: UserModel, password: str) -> bool:
+        hashed_password = await UserService.get_password_hash(user.user_id, self.session)
+        is_valid_password = hashed_password is not None and await password_hasher.verify(
+            plain_password=password, hashed_password=hashed_password
         )
         if not is_valid_password:
             raise HTTPException(status_code=401, detail="Invalid credentials")
@@ -79,8 +101,7 @@ class AuthController:
 
     async def login(self, user: UserModel, password: str) -> AuthResponseSchema:
         try:
-            access_token = get_user_token(user, is_refresh=False)
-            refresh_token = get_user_token(user, is_refresh=True)
+            access_token, refresh_token = await self.issue_tokens(user)
             
             return AuthResponseSchema(
                 user_id=user.user_id,
@@ -94,3 +115,73 @@ class AuthController:
             )
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
+
+    async def issue_tokens(self, user: UserModel) -> tuple[str, str]:
+        """Access token y refresh token en una familia nueva."""
+        jti, family_id = await refresh_token_store.issue(user.user_id)
+        return (
+            get_user_token(user, is_refresh=False),
+            get_user_token(user, is_refresh=True, jti=jti, family_id=family_id),
+        )
+
+    async def send_verification_code(self, user: UserModel) -> None:
+        code = await verification_code_store.issue(
+            VerificationModels.VERIFICATION_CODE_MODEL, user.user_id
+        )
+        await EmailService.send_verification_email(user.name, user.email, code)
+
+    async def verify(self, user_id: UUID, code: str) -> None:
+        await verification_code_store.consume(
+            VerificationModels.VERIFICATION_CODE_MODEL, user_id, code
+        )
+        await UserService.verify_user(user_id, self.session)
+
+    async def resend_code(self, email: str) -> None:
+        """Sin error si el correo no existe o ya está verificado: no revela cuentas."""
+        user = await UserService.get_user_by_email(email, self.session)
+        if user and not user.is_verified:
+            await self.send_verification_code(user)
+
+    async def request_password_reset(self, email: str) -> None:
+        user = await UserService.get_user_by_email(email, self.session)
+        if user:
+            code = await verification_code_store.issue(
+                VerificationModels.VERIFICATION_CODE_PASSWORD_RESET_MODEL, user.user_id
+            )
+            await EmailService.send_password_reset_email(user.name, user.email, code)
+
+    async def reset_password(self, data: ResetPasswordRequest) -> None:
+        user = await UserService.get_user_by_email(data.email, self.session)
+        if not user:
+            # La misma respuesta que un código inexistente
+            PayTrackHttpResponse.not_found(
+                data={"message": PayTrackResponseCodes.UNEXISTING_CODE.detail},
+                error_id=PayTrackResponseCodes.UNEXISTING_CODE.code,
+            )
+        await verification_code_store.consume(
+            VerificationModels.VERIFICATION_CODE_PASSWORD_RESET_MODEL, user.user_id, data.code
+        )
+        await UserService.update_user_password(user.user_id, data.password, self.session)
+
+    @staticmethod
+    def refresh(current_user: RefreshTokenSchema) -> RefreshResponseSchema:
+        """Firma los tokens del sucesor que CurrentUserRefresh ya registró en la familia."""
+        try:
+            user_data = {
+                "id": str(current_user.id),
+                "email": current_user.email,
+                "name": current_user.name,
+                "role": current_user.role,
+            }
+            return RefreshResponseSchema(
+                access_token=create_access_token(user_data=user_data),
+                refresh_token=create_access_token(
+                    user_data=user_data,
+                    expires_delta=timedelta(seconds=settings.REFRESH_TOKEN_TTL),
+                    refresh_token=True,
+                    jti=current_user.next_jti,
+                    family_id=current_user.family_id,
+                ),
+            )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
@@ -1,35 +1,113 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session
+from fastapi import APIRouter, Depends, HTTPException, Response
 
-from app.core.database import get_db
+from app.constants.response_codes import PayTrackResponseCodes
+from app.core.auth import CurrentUser, CurrentUserRefresh, RefreshTokenSchema, UserTokenSchema
+from app.core.database import SessionDep
+from app.core.http_response import PayTrackHttpResponse, PayTrackORJSONResponse
+from app.core.rate_limit import codes_rate_limit, signin_rate_limit, signup_rate_limit
+from app.core.settings import settings
+from app.utils.security import jwks_document
 from app.api.auth.auth_controller import AuthController
-from app.api.auth.auth_schema import SignupSchema, AuthResponseSchema, LoginSchema
+from app.api.auth.auth_schema import (
+    SignupSchema,
+    AuthResponseSchema,
+    LoginSchema,
+    RefreshResponseSchema,
+    RequestPasswordChange,
+    ResendCode,
+    ResetPasswordRequest,
+    VerificationRequest,
+)
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
+well_known_router = APIRouter(prefix="/.well-known", tags=["Authentication"])
 
-@router.post("/signup", response_model=AuthResponseSchema)
+@router.post(
+    "/signup",
+    response_model=AuthResponseSchema,
+    dependencies=[Depends(signup_rate_limit)],
+)
 async def signup(
     data: SignupSchema,
-    session: Session = Depends(get_db)
+    session: SessionDep
 ):
     """Registrar un nuevo usuario"""
     try:
         controller = AuthController(session)
-        return await controller.signup(data)
+        return PayTrackORJSONResponse(content=await controller.signup(data))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/signin", response_model=AuthResponseSchema) 
+@router.post(
+    "/signin",
+    response_model=AuthResponseSchema,
+    dependencies=[Depends(signin_rate_limit)],
+)
 async def signin(
     data: LoginSchema,
-    session: Session = Depends(get_db)
+    session: SessionDep
 ):
     """Iniciar sesión"""
     try:
         controller = AuthController(session)
         user = await controller.get_current_user_from_login(data.email)
-        controller.verify_user_password(user, data.password)
+        await controller.verify_user_password(user, data.password)
         await controller.is_user_verified(user)
-        return await controller.login(user, data.password)
+        return PayTrackORJSONResponse(
+            content=await controller.login(user, data.password)
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/refresh", response_model=RefreshResponseSchema)
+async def refresh(current_user: RefreshTokenSchema = CurrentUserRefresh):
+    """Rotar el refresh token y emitir un access token nuevo"""
+    try:
+        return PayTrackORJSONResponse(content=AuthController.refresh(current_user))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/verify")
+async def verify(
+    data: VerificationRequest,
+    session: SessionDep,
+    current_user: UserTokenSchema = CurrentUser,
+):
+    """Verificar la cuenta con el código enviado por correo"""
+    await AuthController(session).verify(current_user.id, data.code)
+    return PayTrackHttpResponse.updated(
+        {"message": PayTrackResponseCodes.VERIFIED_USER.detail}
+    )
+
+@router.post("/resend-code", dependencies=[Depends(codes_rate_limit)])
+async def resend_code(data: ResendCode, session: SessionDep):
+    """Enviar un código de verificación nuevo (invalida el anterior)"""
+    await AuthController(session).resend_code(data.email)
+    return PayTrackHttpResponse.no_content()
+
+@router.post("/password-reset/request", dependencies=[Depends(codes_rate_limit)])
+async def request_password_reset(data: RequestPasswordChange, session: SessionDep):
+    """Enviar un código para restablecer la contraseña"""
+    await AuthController(session).request_password_reset(data.email)
+    return PayTrackHttpResponse.no_content()
+
+@router.post("/password-reset", dependencies=[Depends(signin_rate_limit)])
+async def reset_password(data: ResetPasswordRequest, session: SessionDep):
+    """Restablecer la contraseña con el código; cierra las sesiones abiertas"""
+    await AuthController(session).reset_password(data)
+    return PayTrackHttpResponse.updated()
+
+@well_known_router.get("/jwks.json")
+async def jwks():
+    """Llaves públicas para verificar localmente los JWT de la API"""
+    return Response(
+        content=jwks_document(),
+        media_type="application/json",
+        headers={"Cache-Control": f"public, max-age={settings.JWKS_CACHE_MAX_AGE}"},
+    )
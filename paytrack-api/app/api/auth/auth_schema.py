@@ -1,4 +1,5 @@
 from uuid import UUID
+from datetime import date
 from pydantic import BaseModel, EmailStr, Field
 from pydantic.alias_generators import to_camel
 
@@ -7,7 +8,8 @@ class SignupSchema(BaseModel):
     last_name: str = Field(min_length=2, max_length=30)
     email: EmailStr
     password: str = Field(min_length=8, max_length=50)
-    birth_date: str
+    # "YYYY-MM-DD"; un valor inválido responde 422 en vez de fallar al insertar
+    birth_date: date
     
     class Config:
         alias_generator = to_camel
@@ -31,6 +33,10 @@ class AuthResponseSchema(BaseModel):
     refresh_token: str
     is_verified: bool
 
+class RefreshResponseSchema(BaseModel):
+    access_token: str
+    refresh_token: str
+
 class VerificationRequest(BaseModel):
     code: str
 
@@ -47,6 +53,7 @@ class RequestPasswordChange(BaseModel):
 
 class ResetPasswordRequest(BaseModel):
     email: EmailStr = Field(max_length=40)
+    code: str
     password: str = Field(min_length=8, max_length=50)
 
     class Config:
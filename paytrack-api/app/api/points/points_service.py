@@ -0,0 +1,212 @@
+import asyncio
+import logging
+from uuid import UUID
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import func, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.base_model import utc_now
+from app.core.database import async_session_maker
+from app.core.settings import settings
+from app.models.points.points_ledger_model import PointsLedgerModel
+from app.models.users.user_model import UserModel
+from app.utils.user_cache import user_cache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PointsCredit:
+    user_id: UUID
+    delta: int
+    idempotency_key: str
+    reason: str
+
+
+class PointsService:
+    @staticmethod
+    async def apply_credits(
+        credits: list[PointsCredit], session: AsyncSession
+    ) -> dict[str, str]:
+        """
+        Inserta los movimientos y suma los deltas a `users.points` en una sola
+        sentencia (CTEs de escritura), sin leer el saldo. Los movimientos con
+        una idempotency_key ya registrada se ignoran. Regresa las llaves que sí
+        se aplicaron con el email de su usuario (para invalidar user_cache); el
+        commit queda a cargo de quien llama.
+        """
+        now = utc_now()
+        inserted = (
+            insert(PointsLedgerModel)
+            .values(
+                [
+                    {
+                        "ledger_id": func.gen_random_uuid(),
+                        "user_id": credit.user_id,
+                        "delta": credit.delta,
+                        "idempotency_key": credit.idempotency_key,
+                        "reason": credit.reason,
+                        "created_at": now,
+                    }
+                    for credit in credits
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=[PointsLedgerModel.idempotency_key])
+            .returning(
+                PointsLedgerModel.idempotency_key,
+                PointsLedgerModel.user_id,
+                PointsLedgerModel.delta,
+            )
+            .cte("inserted")
+        )
+        # Varios créditos al mismo usuario se agregan en un solo UPDATE de su fila
+        totals = (
+            select(inserted.c.user_id, func.sum(inserted.c.delta).label("total"))
+            .group_by(inserted.c.user_id)
+            .cte("totals")
+        )
+        updated = (
+            update(UserModel)
+            .where(UserModel.user_id == totals.c.user_id)
+            .values(points=UserModel.points + totals.c.total, updated_at=now)
+            .returning(UserModel.user_id, UserModel.email)
+            .cte("updated")
+        )
+        statement = select(inserted.c.idempotency_key, updated.c.email).join(
+            updated, updated.c.user_id == inserted.c.user_id
+        )
+
+        result = await session.exec(statement)
+        return dict(result.all())
+
+    @staticmethod
+    async def credit(
+        user_id: UUID,
+        delta: int,
+        idempotency_key: str,
+        reason: str,
+        session: AsyncSession,
+    ) -> bool:
+        """Aplica un movimiento y hace commit; False si la llave ya existía."""
+        applied = await PointsService.apply_credits(
+            [PointsCredit(user_id, delta, idempotency_key, reason)], session
+        )
+        await session.commit()
+        if applied:
+            await user_cache.invalidate(user_id, applied[idempotency_key])
+        return bool(applied)
+
+
+class PointsCreditBatcher:
+    """
+    Junta créditos concurrentes y los aplica en una sola transacción cada
+    `max_delay` segundos o al llegar a `max_batch`. Cada llamada a `credit`
+    espera el commit de su lote y recibe si su movimiento se aplicó. Si una
+    idempotency_key se repite en el lote solo la primera puede aplicarse; las
+    demás reciben False, igual que una llave ya registrada.
+
+    Si el lote falla (p. ej. un user_id inexistente viola la FK) se reintenta
+    cada crédito en su propia transacción: solo fallan los que tienen error.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker,
+        max_batch: int = 500,
+        max_delay: float = 0.01,
+    ):
+        self.session_maker = session_maker
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+
+        self._pending: list[tuple[PointsCredit, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # Referencias a los lotes en curso: el loop solo guarda referencias débiles
+        self._tasks: set[asyncio.Task] = set()
+
+    async def credit(
+        self, user_id: UUID, delta: int, idempotency_key: str, reason: str
+    ) -> bool:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append(
+            (PointsCredit(user_id, delta, idempotency_key, reason), future)
+        )
+
+        if len(self._pending) >= self.max_batch:
+            self._flush_pending()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_delay, self._flush_pending)
+
+        return await future
+
+    def _take_pending(self) -> list[tuple[PointsCredit, asyncio.Future]]:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        return batch
+
+    def _flush_pending(self) -> None:
+        batch = self._take_pending()
+        if batch:
+            task = asyncio.create_task(self._flush(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _flush(self, batch: list[tuple[PointsCredit, asyncio.Future]]) -> None:
+        unique: dict[str, PointsCredit] = {}
+        for credit, _ in batch:
+            unique.setdefault(credit.idempotency_key, credit)
+
+        try:
+            async with self.session_maker() as session:
+                applied = await PointsService.apply_credits(list(unique.values()), session)
+                await session.commit()
+        except Exception as e:
+            if len(batch) > 1:
+                logger.warning(
+                    "Points batch of %d credits failed, retrying one by one: %r", len(batch), e
+                )
+                for item in batch:
+                    await self._flush([item])
+                return
+            logger.error("Points credit %s failed: %r", batch[0][0].idempotency_key, e)
+            if not batch[0][1].done():
+                batch[0][1].set_exception(e)
+            return
+
+        applied_users = {
+            credit.user_id: applied[credit.idempotency_key]
+            for credit in unique.values()
+            if credit.idempotency_key in applied
+        }
+        for user_id, email in applied_users.items():
+            await user_cache.invalidate(user_id, email)
+        for credit, future in batch:
+            if not future.done():
+                # Solo la primera aparición de la llave cuenta como aplicada
+                future.set_result(
+                    credit.idempotency_key in applied
+                    and unique[credit.idempotency_key] is credit
+                )
+
+    async def flush(self) -> None:
+        """Aplica lo pendiente de inmediato y espera los lotes en curso (p. ej. al apagar)."""
+        batch = self._take_pending()
+        if batch:
+            await self._flush(batch)
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+points_batcher = PointsCreditBatcher(
+    session_maker=async_session_maker,
+    max_batch=settings.POINTS_BATCH_MAX_SIZE,
+    max_delay=settings.POINTS_BATCH_MAX_DELAY,
+)
@@ -0,0 +1,52 @@
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.auth import UserTokenSchema
+from app.core.http_response import PayTrackHttpResponse
+from app.constants.response_codes import PayTrackResponseCodes
+from app.api.qr_codes.qr_code_service import QRCodeService
+from app.api.qr_codes.qr_code_schema import (
+    QRCodeResponseSchema,
+    QRCodeSignedValidationResponseSchema,
+    QRCodeValidationResponseSchema,
+)
+from app.utils.qr_signing import InvalidQRPayload
+
+
+class QRCodeController:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def issue(
+        self, current_user: UserTokenSchema, signed: bool = False
+    ) -> QRCodeResponseSchema:
+        qr_code = await QRCodeService.issue_qr_code(
+            user_id=current_user.id, session=self.session, signed=signed
+        )
+        return QRCodeResponseSchema.model_validate(qr_code)
+
+    async def validate(self, qr_code_string: str) -> QRCodeValidationResponseSchema:
+        qr_code = await QRCodeService.validate_qr_code(
+            qr_code_string=qr_code_string, session=self.session
+        )
+        if not qr_code:
+            PayTrackHttpResponse.not_found(
+                data={"message": PayTrackResponseCodes.INVALID_QR_CODE.detail},
+                error_id=PayTrackResponseCodes.INVALID_QR_CODE.code,
+            )
+        return QRCodeValidationResponseSchema.model_validate(qr_code)
+
+    @staticmethod
+    def verify_signed(qr_code_string: str) -> QRCodeSignedValidationResponseSchema:
+        try:
+            payload = QRCodeService.verify_signed_qr_code(qr_code_string)
+        except InvalidQRPayload as e:
+            response_code = (
+                PayTrackResponseCodes.EXPIRED_QR_CODE
+                if e.reason == "expired"
+                else PayTrackResponseCodes.INVALID_QR_CODE
+            )
+            PayTrackHttpResponse.not_found(
+                data={"message": response_code.detail, "reason": e.reason},
+                error_id=response_code.code,
+            )
+        return QRCodeSignedValidationResponseSchema.model_validate(payload)
@@ -0,0 +1,60 @@
+from fastapi import APIRouter
+
+from app.core.auth import CurrentUser, UserTokenSchema
+from app.core.database import SessionDep
+from app.core.http_response import PayTrackHttpResponse
+from app.core.settings import settings
+from app.api.qr_codes.qr_code_controller import QRCodeController
+from app.api.qr_codes.qr_code_service import qr_revocation_list, qr_signing_jwk
+from app.api.qr_codes.qr_code_schema import QRCodeValidationRequest
+
+router = APIRouter(prefix="/qr-codes", tags=["QR Codes"])
+
+
+@router.post("")
+async def issue_qr_code(
+    session: SessionDep,
+    signed: bool = False,
+    current_user: UserTokenSchema = CurrentUser,
+):
+    """Emitir un nuevo QR para el usuario actual (revoca los anteriores)"""
+    controller = QRCodeController(session)
+    qr_code = await controller.issue(current_user, signed=signed)
+    return PayTrackHttpResponse.created(qr_code.model_dump(by_alias=True))
+
+
+@router.post("/validate")
+async def validate_qr_code(
+    data: QRCodeValidationRequest,
+    session: SessionDep,
+    current_user: UserTokenSchema = CurrentUser,
+):
+    """Validar un QR escaneado en el punto de pago"""
+    controller = QRCodeController(session)
+    qr_code = await controller.validate(data.qr_code_string)
+    return PayTrackHttpResponse.ok(qr_code.model_dump(by_alias=True))
+
+
+@router.post("/verify-signed")
+async def verify_signed_qr_code(
+    data: QRCodeValidationRequest,
+    current_user: UserTokenSchema = CurrentUser,
+):
+    """Validar un QR firmado sin consultar la base de datos"""
+    payload = QRCodeController.verify_signed(data.qr_code_string)
+    return PayTrackHttpResponse.ok(payload.model_dump(by_alias=True))
+
+
+@router.get("/signing-key")
+async def get_qr_signing_key():
+    """Llave pública (JWK) para verificar QR firmados en escáneres offline"""
+    response = PayTrackHttpResponse.ok(qr_signing_jwk())
+    response.headers["Cache-Control"] = f"public, max-age={settings.JWKS_CACHE_MAX_AGE}"
+    return response
+
+
+@router.get("/revocations")
+async def get_qr_code_revocations(current_user: UserTokenSchema = CurrentUser):
+    """Lista de QR firmados revocados y vigentes, para escáneres offline"""
+    revoked = sorted(str(qr_code_id) for qr_code_id in qr_revocation_list.revoked)
+    return PayTrackHttpResponse.ok(revoked)
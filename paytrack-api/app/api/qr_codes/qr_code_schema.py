@@ -0,0 +1,46 @@
+from uuid import UUID
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+from pydantic.alias_generators import to_camel
+
+
+class QRCodeValidationRequest(BaseModel):
+    qr_code_string: str = Field(min_length=1, max_length=512)
+
+    class Config:
+        alias_generator = to_camel
+        populate_by_name = True
+
+
+class QRCodeResponseSchema(BaseModel):
+    qr_code_id: UUID
+    user_id: UUID
+    qr_code_string: str
+    created_at: datetime
+
+    class Config:
+        alias_generator = to_camel
+        populate_by_name = True
+        from_attributes = True
+
+
+class QRCodeValidationResponseSchema(BaseModel):
+    qr_code_id: UUID
+    user_id: UUID
+
+    class Config:
+        alias_generator = to_camel
+        populate_by_name = True
+        from_attributes = True
+
+
+class QRCodeSignedValidationResponseSchema(BaseModel):
+    qr_code_id: UUID
+    user_id: UUID
+    expires_at: int
+
+    class Config:
+        alias_generator = to_camel
+        populate_by_name = True
+        from_attributes = True
@@ -0,0 +1,192 @@
+import time
+import asyncio
+import logging
+import secrets
+from uuid import UUID, uuid4
+from datetime import timedelta
+from functools import cache
+from typing import Optional
+
+from sqlalchemy import update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.base_model import utc_now
+from app.core.database import async_session_maker
+from app.constants.response_codes import PayTrackResponseCodes
+from app.core.http_response import PayTrackHttpResponse
+from app.core.redis import redis_client
+from app.core.settings import settings
+from app.models.users.user_qr_code_model import UserQRCodeModel
+from app.utils.qr_code_filter import QRCodeFilter
+from app.utils.qr_signing import PREFIX, QRPayload, QRPayloadSigner, load_private_key
+
+logger = logging.getLogger(__name__)
+
+
+class QRRevocationList:
+    """
+    IDs de QR firmados revocados que aún no expiran. Es pequeña porque un QR
+    firmado deja de importar al pasar su expiración; se reemplaza completa en
+    cada sincronización, conservando lo agregado localmente mientras corría.
+    """
+
+    def __init__(self, signed_ttl: int):
+        self.signed_ttl = signed_ttl
+        self.revoked: frozenset[UUID] = frozenset()
+
+    def add(self, *qr_code_ids: UUID) -> None:
+        self.revoked = self.revoked.union(qr_code_ids)
+
+    def __contains__(self, qr_code_id: UUID) -> bool:
+        return qr_code_id in self.revoked
+
+    async def refresh(self, session_maker) -> int:
+        cutoff = utc_now() - timedelta(seconds=self.signed_ttl)
+        # Revocar actualiza updated_at y un QR se revoca después de crearse: el
+        # rango sobre updated_at usa ix_user_qr_codes_updated_at_qr_code_id
+        statement = select(UserQRCodeModel.qr_code_id).where(
+            UserQRCodeModel.updated_at > cutoff,
+            ~UserQRCodeModel.is_alive,
+            UserQRCodeModel.qr_code_string.startswith(PREFIX),
+            UserQRCodeModel.created_at > cutoff,
+        )
+        before = self.revoked
+        async with session_maker() as session:
+            revoked = frozenset((await session.exec(statement)).all())
+        # add() solo agrega: la diferencia es lo revocado durante la consulta
+        self.revoked = revoked | (self.revoked - before)
+        return len(self.revoked)
+
+    async def run_forever(self, session_maker, interval: float) -> None:
+        while True:
+            try:
+                await self.refresh(session_maker)
+            except Exception as e:
+                logger.error("QR revocation list refresh failed: %r", e)
+            await asyncio.sleep(interval)
+
+
+qr_code_filter = QRCodeFilter(
+    redis=redis_client,
+    batch_size=settings.QR_FILTER_BATCH_SIZE,
+    reload_interval=settings.QR_FILTER_RELOAD_INTERVAL,
+)
+qr_revocation_list = QRRevocationList(signed_ttl=settings.QR_SIGNED_TTL)
+
+
+@cache
+def qr_signer() -> Optional[QRPayloadSigner]:
+    """Firmador con la llave de QR_SIGNING_KEY_FILE, o None si no hay llave."""
+    if not settings.QR_SIGNING_KEY_FILE:
+        return None
+    with open(settings.QR_SIGNING_KEY_FILE, "rb") as f:
+        return QRPayloadSigner(load_private_key(f.read()))
+
+
+def require_qr_signer() -> QRPayloadSigner:
+    signer = qr_signer()
+    if signer is None:
+        PayTrackHttpResponse.bad_request(
+            data={"message": PayTrackResponseCodes.SIGNED_QR_DISABLED.detail},
+            error_id=PayTrackResponseCodes.SIGNED_QR_DISABLED.code,
+        )
+    return signer
+
+
+def qr_signing_jwk() -> dict:
+    """Llave pública de los QR firmados como JWK, para los escáneres."""
+    from jwt.algorithms import OKPAlgorithm
+
+    return {
+        **OKPAlgorithm.to_jwk(require_qr_signer().public_key, as_dict=True),
+        "alg": "EdDSA",
+        "use": "sig",
+    }
+
+
+class QRCodeService:
+    @staticmethod
+    async def issue_qr_code(
+        user_id: UUID, session: AsyncSession, signed: bool = False
+    ) -> UserQRCodeModel:
+        """
+        Revoca los QR vivos del usuario y emite uno nuevo. Con `signed` el
+        `qr_code_string` es un payload firmado verificable sin base de datos.
+        """
+        signer = require_qr_signer() if signed else None
+        now = utc_now()
+        revoked = await session.exec(
+            update(UserQRCodeModel)
+            .where(UserQRCodeModel.user_id == user_id, UserQRCodeModel.is_alive)
+            .values(is_alive=False, updated_at=now)
+            .returning(UserQRCodeModel.qr_code_id, UserQRCodeModel.qr_code_string)
+        )
+        revoked_rows = revoked.all()
+
+        qr_code_id = uuid4()
+        if signer is not None:
+            qr_code_string = signer.sign(
+                user_id=user_id,
+                qr_code_id=qr_code_id,
+                expires_at=int(time.time()) + settings.QR_SIGNED_TTL,
+            )
+        else:
+            qr_code_string = secrets.token_urlsafe(24)
+
+        qr_code = UserQRCodeModel(
+            qr_code_id=qr_code_id,
+            user_id=user_id,
+            qr_code_string=qr_code_string,
+            created_at=now,
+            updated_at=now,
+        )
+        session.add(qr_code)
+
+        # Antes del commit: un QR vivo que otro worker no conoce se rechazaría en el pago
+        try:
+            await qr_code_filter.announce([qr_code_string])
+        except Exception as e:
+            logger.error("QR code filter announce failed: %r", e)
+            await session.rollback()
+            PayTrackHttpResponse.service_unavailable(retry_after=1)
+
+        await session.commit()
+        await session.refresh(qr_code)
+
+        # Después del commit, para que quien reciba la baja ya la vea en la base
+        await qr_code_filter.publish_removed(
+            [revoked_string for _, revoked_string in revoked_rows]
+        )
+        for revoked_id, revoked_string in revoked_rows:
+            if revoked_string.startswith(PREFIX):
+                qr_revocation_list.add(revoked_id)
+
+        return qr_code
+
+    @staticmethod
+    async def validate_qr_code(
+        qr_code_string: str, session: AsyncSession
+    ) -> Optional[UserQRCodeModel]:
+        if qr_code_filter.ready and not qr_code_filter.might_contain(qr_code_string):
+            return None
+
+        statement = select(UserQRCodeModel).where(
+            UserQRCodeModel.qr_code_string == qr_code_string, UserQRCodeModel.is_alive
+        )
+        return (await session.exec(statement)).first()
+
+    @staticmethod
+    def verify_signed_qr_code(qr_code_string: str) -> QRPayload:
+        """Valida firma, expiración y revocación sin tocar la base de datos."""
+        return require_qr_signer().verify(qr_code_string, revoked=qr_revocation_list)
+
+
+async def run_qr_code_filter() -> None:
+    await qr_code_filter.run_forever(async_session_maker)
+
+
+async def run_qr_revocation_list() -> None:
+    await qr_revocation_list.run_forever(
+        async_session_maker, settings.QR_REVOCATION_REFRESH_INTERVAL
+    )
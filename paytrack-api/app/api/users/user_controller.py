@@ -1,15 +1,28 @@
 
 
+from uuid import UUID
+from datetime import datetime
+from typing import Optional
+
 from pydantic import EmailStr
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.api.users.user_service import UserService
+from app.api.users.user_schema import UserProfileSchema
 from app.constants.response_codes import PayTrackResponseCodes
-from app.core.http_response import PayTrackHttpResponse
+from app.core.http_response import PaginationType, PayTrackHttpResponse
+from app.utils.etag import if_none_match, strong_etag
+
+# Cambiar si cambia la forma de UserProfileSchema, para invalidar los ETags emitidos
+PROFILE_ETAG_VERSION = 1
+
+
+def profile_etag(user_id: UUID, updated_at: datetime) -> str:
+    return strong_etag(PROFILE_ETAG_VERSION, user_id, updated_at.isoformat())
 
 
 class UserController:
-    def __init__(self, session: Session):
+    def __init__(self, session: AsyncSession):
         self.session = session
 
     async def validate_existing_user(self, user_email: EmailStr) -> bool:
@@ -24,4 +37,38 @@ class UserController:
                 },
                 error_id=PayTrackResponseCodes.EXISTING_EMAIL.code,
             )
-        return True
\ No newline at end of file
+        return True
+
+    async def get_profile(
+        self, user_id: UUID, if_none_match_header: Optional[str] = None
+    ) -> tuple[str, Optional[UserProfileSchema]]:
+        """
+        Regresa (etag, perfil). Si el cliente ya tiene la versión actual el
+        perfil es None y solo se consultó `updated_at`.
+        """
+        if if_none_match_header:
+            updated_at = await UserService.get_user_updated_at(user_id, self.session)
+            if updated_at is None:
+                self.raise_user_not_found()
+            etag = profile_etag(user_id, updated_at)
+            if if_none_match(if_none_match_header, etag):
+                return etag, None
+
+        user = await UserService.fetch_user_by_id(user_id, self.session)
+        if user is None:
+            self.raise_user_not_found()
+        # El ETag sale de la fila enviada: pudo cambiar después del probe
+        return profile_etag(user.user_id, user.updated_at), UserProfileSchema.from_user(user)
+
+    async def list_users(
+        self, cursor: Optional[str], page_size: Optional[int]
+    ) -> tuple[list[UserProfileSchema], PaginationType]:
+        users, pagination = await UserService.list_users(self.session, cursor, page_size)
+        return [UserProfileSchema.from_user(user) for user in users], pagination
+
+    @staticmethod
+    def raise_user_not_found() -> None:
+        PayTrackHttpResponse.not_found(
+            data={"message": PayTrackResponseCodes.UNEXISTING_USER.detail},
+            error_id=PayTrackResponseCodes.UNEXISTING_USER.code,
+        )
@@ -0,0 +1,63 @@
+from uuid import UUID
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Header, Query, Response
+
+from app.core.auth import CurrentAdmin, CurrentUser, UserTokenSchema
+from app.core.database import SessionDep
+from app.core.http_response import HttpStatus, PayTrackHttpResponse
+from app.api.users.user_controller import UserController
+
+router = APIRouter(prefix="/users", tags=["Users"])
+
+# Solo el cliente puede guardar la respuesta, y debe revalidarla en cada uso
+# (la mayoría de las revalidaciones terminan en 304 sin cuerpo)
+PROFILE_CACHE_HEADERS = {"Cache-Control": "private, no-cache", "Vary": "Authorization"}
+
+
+async def profile_response(
+    controller: UserController, user_id: UUID, if_none_match: Optional[str]
+) -> Response:
+    etag, profile = await controller.get_profile(user_id, if_none_match)
+    headers = {**PROFILE_CACHE_HEADERS, "ETag": etag}
+    if profile is None:
+        return Response(status_code=HttpStatus.NOT_MODIFIED, headers=headers)
+
+    response = PayTrackHttpResponse.ok(profile.model_dump(by_alias=True))
+    response.headers.update(headers)
+    return response
+
+
+@router.get("")
+async def list_users(
+    session: SessionDep,
+    cursor: Optional[str] = None,
+    page_size: Annotated[Optional[int], Query(alias="pageSize", ge=1)] = None,
+    current_user: UserTokenSchema = CurrentAdmin,
+):
+    """Usuarios paginados por cursor, más recientes primero (solo admin)"""
+    profiles, pagination = await UserController(session).list_users(cursor, page_size)
+    return PayTrackHttpResponse.ok(
+        [profile.model_dump(by_alias=True) for profile in profiles], pagination=pagination
+    )
+
+
+@router.get("/me")
+async def get_me(
+    session: SessionDep,
+    if_none_match: Annotated[Optional[str], Header()] = None,
+    current_user: UserTokenSchema = CurrentUser,
+):
+    """Perfil del usuario actual (soporta If-None-Match)"""
+    return await profile_response(UserController(session), current_user.id, if_none_match)
+
+
+@router.get("/{user_id}")
+async def get_user(
+    user_id: UUID,
+    session: SessionDep,
+    if_none_match: Annotated[Optional[str], Header()] = None,
+    current_user: UserTokenSchema = CurrentAdmin,
+):
+    """Perfil de cualquier usuario (solo admin, soporta If-None-Match)"""
+    return await profile_response(UserController(session), user_id, if_none_match)
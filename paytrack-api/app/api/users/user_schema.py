@@ -1,10 +1,12 @@
 from uuid import UUID
-from datetime import datetime
+from datetime import date, datetime
 
 from pydantic import BaseModel, EmailStr, Field
 from pydantic.alias_generators import to_camel
 
+from app.constants.user_constants import POINTS_MINOR_UNITS
 from app.core.mixins.password_validation_mixin import PasswordValidationMixin
+from app.models.users.user_model import UserModel
 
 from app.utils.regex import Regex
 
@@ -17,6 +19,7 @@ class UserSchema(BaseModel):
     last_name: str = Field(min_length=2, max_length=30)
     email: EmailStr = Field(max_length=40)
     birth_date: datetime | None = None
+    # En la API siempre son puntos; solo la base guarda centésimas
     points: float = 0.0
     is_verified: bool = False
 
@@ -36,3 +39,36 @@ class UserCreateSchema(UserSchema, PasswordValidationMixin):
 class UserResponseSchema(UserSchema):
     created_at: datetime
     updated_at: datetime
+
+
+class UserProfileSchema(BaseModel):
+    user_id: UUID
+    role: str
+    name: str
+    last_name: str
+    email: str
+    birth_date: date
+    points: float
+    is_verified: bool
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        alias_generator = to_camel
+        populate_by_name = True
+
+    @classmethod
+    def from_user(cls, user: UserModel) -> "UserProfileSchema":
+        return cls(
+            user_id=user.user_id,
+            role=getattr(user.role, "value", user.role),
+            name=user.name,
+            last_name=user.last_name,
+            email=user.email,
+            birth_date=user.birth_date,
+            # users.points guarda centésimas
+            points=user.points / POINTS_MINOR_UNITS,
+            is_verified=user.is_verified,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
@@ -1,23 +1,36 @@
 from uuid import UUID
-from datetime import datetime, timezone
+from datetime import datetime
+from typing import Optional
 
-from sqlmodel import Session, select
+from fastapi import HTTPException
+from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.models.users.user_model import UserModel
 from .user_schema import UserCreateSchema
 
 from app.constants.user_constants import UserRoles
-from app.utils.security import get_password_hash
-from app.core.http_response import PayTrackHttpResponse
+from app.utils.password_hasher import password_hasher
+from app.utils.refresh_tokens import refresh_token_store
+from app.utils.user_cache import user_cache
+from app.core.base_model import utc_now
+from app.core.http_response import PaginationType, PayTrackHttpResponse
+from app.core.pagination import KeysetPaginator
+from app.core.replicas import read_replica
+
+# Más recientes primero; (created_at, user_id) usa ix_users_created_at_user_id
+users_paginator = KeysetPaginator(
+    order_by=[UserModel.created_at, UserModel.user_id], descending=True
+)
 
 
 class UserService:
     @staticmethod
     async def create_user(
-        user_data: UserCreateSchema, role: str, session: Session
+        user_data: UserCreateSchema, role: str, session: AsyncSession
     ) -> UserModel:
         try:
-            hashed_password = get_password_hash(user_data.password)
+            hashed_password = await password_hasher.hash(user_data.password)
 
             user_dump = user_data.model_dump()
 
@@ -28,59 +41,132 @@ class UserService:
                 birth_date=user_dump.get("birth_date"),
                 email=user_dump["email"],
                 password=hashed_password,
-                points=user_dump.get("points", 0.0),
+                # El saldo inicial siempre es 0: los puntos entran por points_ledger
+                points=0,
                 is_verified=user_dump.get("is_verified", False)
             )
 
             session.add(new_user)
-            session.commit()
-            session.refresh(new_user)
+            await session.commit()
+            await session.refresh(new_user)
+            await user_cache.set(new_user)
 
             return new_user
         except Exception as e:
             raise e
 
     @staticmethod
-    async def get_user_by_id(user_id: UUID, session: Session) -> UserModel:
+    @read_replica
+    async def _first_from_replica(statement, session: AsyncSession) -> Optional[UserModel]:
+        return (await session.exec(statement)).first()
+
+    @staticmethod
+    async def _load_user(statement, session: AsyncSession, pinned: bool) -> Optional[UserModel]:
+        """
+        Un usuario invalidado hace poco (pinned) se lee del primario y se
+        reescribe en el cache. Si no, se lee de una réplica y solo se guarda si
+        la llave sigue vacía: una fila atrasada no debe pisar una invalidación.
+        """
+        if pinned:
+            user = (await session.exec(statement)).first()
+        else:
+            user = await UserService._first_from_replica(statement, session)
+        if user:
+            await user_cache.set(user, only_if_absent=not pinned)
+        return user
+
+    @staticmethod
+    async def get_user_by_id(user_id: UUID, session: AsyncSession) -> UserModel:
+        try:
+            cached = await user_cache.lookup_by_id(user_id)
+            if cached.user:
+                return cached.user
+
+            statement = select(UserModel).where(UserModel.user_id == user_id)
+            return await UserService._load_user(statement, session, cached.pinned)
+        except Exception:
+            PayTrackHttpResponse.internal_error()
+
+    @staticmethod
+    async def get_password_hash(user_id: UUID, session: AsyncSession) -> Optional[str]:
+        """Hash de la contraseña desde el primario: user_cache no lo guarda y una réplica podría tener el anterior."""
+        try:
+            statement = select(UserModel.password).where(UserModel.user_id == user_id)
+            return (await session.exec(statement)).first()
+        except Exception:
+            PayTrackHttpResponse.internal_error()
+
+    @staticmethod
+    async def get_user_updated_at(user_id: UUID, session: AsyncSession) -> Optional[datetime]:
+        """Solo `updated_at`, para validar ETags sin cargar ni serializar el usuario."""
+        try:
+            statement = select(UserModel.updated_at).where(UserModel.user_id == user_id)
+            return (await session.exec(statement)).first()
+        except Exception:
+            PayTrackHttpResponse.internal_error()
+
+    @staticmethod
+    async def fetch_user_by_id(user_id: UUID, session: AsyncSession) -> Optional[UserModel]:
+        """Lee el usuario de la base sin pasar por user_cache: el cuerpo debe coincidir con su ETag."""
         try:
             statement = select(UserModel).where(UserModel.user_id == user_id)
-            user = session.exec(statement).first()
-            return user
+            return (await session.exec(statement)).first()
         except Exception:
             PayTrackHttpResponse.internal_error()
 
     @staticmethod
-    async def get_user_by_email(email: str, session: Session) -> UserModel | bool:
+    async def get_user_by_email(email: str, session: AsyncSession) -> UserModel | bool:
         try:
-            statement = select(UserModel).where(UserModel.email == email)
-            user = session.exec(statement).first()
+            cached = await user_cache.lookup_by_email(email)
+            if cached.user:
+                return cached.user
+
+            statement = select(UserModel).where(
+                func.lower(UserModel.email) == email.lower()
+            )
+            user = await UserService._load_user(statement, session, cached.pinned)
             return user if user else False
         except Exception as e:
             PayTrackHttpResponse.internal_error()
 
     @staticmethod
-    async def verify_user(user_id: UUID, session: Session):
+    @read_replica
+    async def list_users(
+        session: AsyncSession, cursor: Optional[str], page_size: Optional[int]
+    ) -> tuple[list[UserModel], PaginationType]:
+        return await users_paginator.paginate(
+            session, select(UserModel), cursor=cursor, page_size=page_size
+        )
+
+    @staticmethod
+    async def verify_user(user_id: UUID, session: AsyncSession):
         try:
             statement = select(UserModel).where(UserModel.user_id == user_id)
-            user = session.exec(statement).first()
+            user = (await session.exec(statement)).first()
             if user:
                 user.is_verified = True
-                user.updated_at = datetime.now(timezone.utc)
+                user.updated_at = utc_now()
                 session.add(user)
-                session.commit()
+                await session.commit()
+                await user_cache.invalidate(user.user_id, user.email)
         except Exception:
             PayTrackHttpResponse.internal_error()
 
     @staticmethod
-    async def update_user_password(user_id: UUID, password: str, session: Session):
+    async def update_user_password(user_id: UUID, password: str, session: AsyncSession):
         try:
-            hashed_password = get_password_hash(password)
+            hashed_password = await password_hasher.hash(password)
             statement = select(UserModel).where(UserModel.user_id == user_id)
-            user = session.exec(statement).first()
+            user = (await session.exec(statement)).first()
             if user:
                 user.password = hashed_password
-                user.updated_at = datetime.now(timezone.utc)
+                user.updated_at = utc_now()
                 session.add(user)
-                session.commit()
+                await session.commit()
+                await user_cache.invalidate(user.user_id, user.email)
+                # Cerrar las sesiones abiertas con la contraseña anterior
+                await refresh_token_store.revoke_user(user.user_id)
+        except HTTPException:
+            raise
         except Exception:
             PayTrackHttpResponse.internal_error()
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class EmailKinds(Enum):
+    VERIFICATION = "VERIFICATION"
+    CONNECTION_CODE = "CONNECTION_CODE"
+    PASSWORD_RESET = "PASSWORD_RESET"
@@ -20,4 +20,8 @@ class PayTrackResponseCodes:
     UNEXISTING_USER = create_response_code("E010", "User does not exist")
     UNVERIFIED_USER = create_response_code("E011", "User is not verified")
     INVALID_CODE = create_response_code("E012", "Invalid code")
+    TOO_MANY_CODE_ATTEMPTS = create_response_code("E013", "Too many attempts, request a new code")
+    INVALID_QR_CODE = create_response_code("E014", "QR code is invalid or has been revoked")
+    EXPIRED_QR_CODE = create_response_code("E015", "QR code has expired")
+    SIGNED_QR_DISABLED = create_response_code("E016", "Signed QR codes are not enabled")
 
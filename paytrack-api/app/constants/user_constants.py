@@ -9,4 +9,8 @@ class UserRoles(Enum):
 
 class VerificationModels(Enum):
     VERIFICATION_CODE_MODEL = "VERIFICATION_CODE_MODEL"
-    VERIFICATION_CODE_PASSWORD_RESET_MODEL = "VERIFICATION_CODE_PASSWORD_RESET_MODEL"
\ No newline at end of file
+    VERIFICATION_CODE_PASSWORD_RESET_MODEL = "VERIFICATION_CODE_PASSWORD_RESET_MODEL"
+
+
+# users.points y points_ledger.delta guardan centésimas de punto
+POINTS_MINOR_UNITS = 100
@@ -1,3 +1,6 @@
+import hashlib
+import logging
+from uuid import UUID
 from typing import Annotated
 
 from pydantic import BaseModel
@@ -7,26 +10,51 @@ from fastapi import Request, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 
 from app.utils.security import decode_token
+from app.utils.refresh_tokens import RefreshTokenResult, refresh_token_store
+from app.utils.ttl_cache import TTLCache
 
 from app.api.users.user_service import UserService
+from app.constants.user_constants import UserRoles
 
 from .database import SessionDep
+from .settings import settings
 
 
 class UserTokenSchema(BaseModel):
-    id: int
+    id: UUID
     email: str
     name: str
     exp: int
+    role: str
+
+
+class RefreshTokenSchema(UserTokenSchema):
+    jti: str
+    family_id: str
+    # Sucesor ya registrado en la familia por la rotación
+    next_jti: str
 
 
 class Oauth2AccessTokenBearer(OAuth2PasswordBearer):
     def __init__(self, auto_error=True):
         super().__init__(tokenUrl="/auth/login", auto_error=auto_error)
+        # Un cache por bearer: un token validado como access no debe servir como refresh
+        self.cache: TTLCache[str, UserTokenSchema] = TTLCache(
+            max_size=settings.TOKEN_CACHE_MAX_SIZE, ttl=settings.TOKEN_CACHE_TTL
+        )
 
     async def __call__(self, request: Request, session: SessionDep) -> UserTokenSchema:
         token = await super().__call__(request=request)
 
+        token_digest = hashlib.sha256(token.encode()).hexdigest()
+
+        return await self.cache.get_or_load(
+            token_digest, lambda: self.validate_token(token=token, session=session)
+        )
+
+    async def validate_token(
+        self, token: str, session: SessionDep
+    ) -> tuple[UserTokenSchema, int]:
         token_data = decode_token(token)
 
         if token_data is None:
@@ -47,7 +75,9 @@ class Oauth2AccessTokenBearer(OAuth2PasswordBearer):
                 status_code=status.HTTP_403_FORBIDDEN, detail="Invalid or expired token"
             )
 
-        return UserTokenSchema(id=id, email=email, name=name, exp=exp)
+        # El rol sale del usuario actual, no del token: un cambio de rol aplica sin reemitirlo
+        role = getattr(user.role, "value", user.role)
+        return UserTokenSchema(id=id, email=email, name=name, exp=exp, role=role), exp
 
     def get_user_token_data(self, token_data: dict):
         try:
@@ -76,6 +106,57 @@ class Oauth2AccessTokenBearer(Oauth2AccessTokenBearer):
 
 
 class Oauth2RefreshTokenBearer(Oauth2AccessTokenBearer):
+    """
+    Valida y rota el refresh token con una sola operación atómica en el
+    refresh_token_store, sin consultar la base ni usar el cache del bearer:
+    cada token sirve una vez y su reutilización revoca la familia.
+    """
+
+    async def __call__(self, request: Request) -> RefreshTokenSchema:
+        token = await OAuth2PasswordBearer.__call__(self, request=request)
+
+        token_data = decode_token(token)
+        if token_data is None:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN, detail="Invalid or expired token"
+            )
+
+        self.verify_token_data_type(token_data=token_data)
+
+        id, email, name, exp = self.get_user_token_data(token_data=token_data)
+        try:
+            role = token_data["user"]["role"]
+            jti = token_data["jti"]
+            family_id = token_data["fam"]
+        except KeyError as e:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Missing field in token: {str(e)}",
+            )
+
+        result, next_jti = await refresh_token_store.rotate(id, jti, family_id)
+        if result == RefreshTokenResult.REUSED:
+            logging.warning("Refresh token reuse for user %s, family %s revoked", id, family_id)
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Refresh token already used; session revoked",
+            )
+        if result != RefreshTokenResult.VALID:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN, detail="Invalid or expired token"
+            )
+
+        return RefreshTokenSchema(
+            id=id,
+            email=email,
+            name=name,
+            exp=exp,
+            role=role,
+            jti=jti,
+            family_id=family_id,
+            next_jti=next_jti,
+        )
+
     def verify_token_data_type(self, token_data: dict) -> None:
         if token_data and not token_data["refresh"]:
             raise HTTPException(
@@ -88,5 +169,16 @@ oauth2_access_token = Oauth2AccessTokenBearer()
 oauth2_refresh_token = Oauth2RefreshTokenBearer()
 
 CurrentUser: UserTokenSchema = Depends(oauth2_access_token)
-CurrentUserRefresh: UserTokenSchema = Depends(oauth2_refresh_token)
+
+
+async def current_admin(current_user: UserTokenSchema = CurrentUser) -> UserTokenSchema:
+    if current_user.role != UserRoles.ADMIN.value:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Admin role required"
+        )
+    return current_user
+
+
+CurrentAdmin: UserTokenSchema = Depends(current_admin)
+CurrentUserRefresh: RefreshTokenSchema = Depends(oauth2_refresh_token)
 LoginFormDataDep = Annotated[OAuth2PasswordRequestForm, Depends()]
@@ -7,13 +7,21 @@ from sqlalchemy import event
 from sqlalchemy.orm import Session
 
 
+def utc_now() -> datetime:
+    """
+    UTC actual sin tzinfo: las columnas son `timestamp without time zone` y
+    asyncpg rechaza datetimes con zona horaria para ese tipo.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 class BasePayTrackModel(ABC, SQLModel):
     """
     Modelo base que proporciona campos de auditoría.
     No incluye 'id' para permitir que cada modelo defina su propia primary key.
     """
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: datetime = Field(default_factory=utc_now)
+    updated_at: datetime = Field(default_factory=utc_now)
 
     def __init__(self, **data):
         super().__init__(**data)
@@ -24,4 +32,4 @@ class BasePayTrackModel(ABC, SQLModel):
 
     @staticmethod
     def _update_timestamp(mapper, connection, target):
-        target.updated_at = datetime.now(timezone.utc)
+        target.updated_at = utc_now()
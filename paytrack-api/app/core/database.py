@@ -1,31 +1,131 @@
-from typing import Generator, Annotated
+from uuid import uuid4
+from typing import AsyncGenerator, Annotated, Literal, Optional
 
 from fastapi import Depends
 from sqlalchemy.sql import text
-from sqlmodel import create_engine, Session
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker
+from sqlmodel.ext.asyncio.session import AsyncSession
+from .metrics import DB_SESSION_TIME
+from .query_profiler import install_query_profiler
+from .replicas import ReplicaSet, routing_session_class
 from .settings import settings
 
 
-engine = create_engine(settings.DATABASE_URL_EFFECTIVE, pool_pre_ping=True)
+PoolRole = Literal["web", "auxiliary"]
 
 
-def get_db() -> Generator[Session, None, None]:
-    """Yields a database session for use in FastAPI endpoints."""
-    session = Session(engine)
-    try:
-        yield session
-    finally:
-        session.close()
+def engine_options(url: str, pool: PoolRole = "auxiliary") -> dict:
+    """Opciones del engine según el driver y el presupuesto de conexiones."""
+    options = {"pool_pre_ping": True, "pool_recycle": settings.DB_POOL_RECYCLE}
+    if make_url(url).get_backend_name() != "postgresql":
+        return options
+
+    pool_size, max_overflow = (
+        settings.DB_POOL_LIMITS if pool == "web" else settings.DB_AUX_POOL_LIMITS
+    )
+    options.update(
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    if settings.DB_PGBOUNCER:
+        # En transaction mode cada transacción puede caer en otra conexión del
+        # servidor: sin caché de prepared statements y con nombres únicos.
+        # PgBouncer no acepta server_settings; el statement_timeout va en el rol
+        # (ALTER ROLE ... SET statement_timeout).
+        options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    else:
+        options["connect_args"] = {
+            "server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT)}
+        }
+    return options
+
+
+class LazySessionMaker(async_sessionmaker):
+    """async_sessionmaker que crea el engine en la primera sesión si aún no existe."""
+
+    def __call__(self, **local_kw):
+        if self.kw.get("bind") is None:
+            get_engine()
+        return super().__call__(**local_kw)
+
+
+async_session_maker = LazySessionMaker(class_=AsyncSession, expire_on_commit=False)
+
+_engine: Optional[AsyncEngine] = None
+_replica_set: Optional[ReplicaSet] = None
+
+
+def get_engine(pool: PoolRole = "auxiliary") -> AsyncEngine:
+    """
+    Engine primario (y réplicas), creado en el primer uso: importar este módulo
+    no carga el driver ni lee la configuración del pool. La API lo crea en el
+    lifespan con su parte del presupuesto (`pool="web"`); los workers y
+    scripts en su primera query, con el pool chico de procesos auxiliares.
+    """
+    global _engine, _replica_set
+    if _engine is not None:
+        return _engine
+
+    engine = create_async_engine(
+        settings.DATABASE_URL_ASYNC, **engine_options(settings.DATABASE_URL_ASYNC, pool)
+    )
+    replica_engines = [
+        create_async_engine(url, **engine_options(url, pool))
+        for url in settings.DATABASE_REPLICA_URLS_ASYNC
+    ]
+    if settings.QUERY_PROFILER_ENABLED:
+        for sync_engine in [engine.sync_engine, *(e.sync_engine for e in replica_engines)]:
+            install_query_profiler(sync_engine)
+
+    _replica_set = (
+        ReplicaSet(replica_engines, max_lag=settings.DB_REPLICA_MAX_LAG)
+        if replica_engines
+        else None
+    )
+    async_session_maker.configure(
+        bind=engine, sync_session_class=routing_session_class(_replica_set)
+    )
+    _engine = engine
+    return engine
+
+
+def get_replica_set() -> Optional[ReplicaSet]:
+    get_engine()
+    return _replica_set
+
+
+async def dispose_engine() -> None:
+    global _engine, _replica_set
+    if _replica_set is not None:
+        await _replica_set.dispose()
+    if _engine is not None:
+        await _engine.dispose()
+    async_session_maker.configure(bind=None)
+    _engine = _replica_set = None
+
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """Yields an async database session for use in FastAPI endpoints."""
+    with DB_SESSION_TIME.time():
+        async with async_session_maker() as session:
+            yield session
 
 
-def create_db_and_tables():
+async def create_db_and_tables():
     """Creates the database and tables if they don't exist, but should be replaced with migrations."""
     try:
-        with engine.connect() as conn:
+        async with get_engine().connect() as conn:
             stmt = text("select * from pg_database")
-            print(conn.execute(stmt).fetchall())
+            result = await conn.execute(stmt)
+            print(result.fetchall())
     except Exception as e:
         print(f"An error occurred while connecting to the database: {e}")
 
 
-SessionDep = Annotated[Session, Depends(get_db)]
+SessionDep = Annotated[AsyncSession, Depends(get_db)]
@@ -1,6 +1,7 @@
+import orjson
 from fastapi import HTTPException
 from pydantic import BaseModel
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import Response
 from typing import Generic, TypeVar, Optional
 
 
@@ -19,17 +20,22 @@ class HttpResponseMessages:
     FORBIDDEN = "Forbidden"
     INTERNAL_SERVER_ERROR = "Internal server error"
     BAD_REQUEST = "Bad request"
+    SERVICE_UNAVAILABLE = "Service temporarily unavailable"
+    TOO_MANY_REQUESTS = "Too many requests"
 
 
 class HttpStatus:
     OK = 200
     CREATED = 201
     NO_CONTENT = 204
+    NOT_MODIFIED = 304
     NOT_FOUND = 404
     UNAUTHORIZED = 401
     FORBIDDEN = 403
     INTERNAL_SERVER_ERROR = 500
     BAD_REQUEST = 400
+    SERVICE_UNAVAILABLE = 503
+    TOO_MANY_REQUESTS = 429
 
 
 class PaginationType(BaseModel):
@@ -38,6 +44,9 @@ class PaginationType(BaseModel):
     nextPage: Optional[int] = None
     prevPage: Optional[int] = None
     lastPage: int
+    nextCursor: Optional[str] = None
+    prevCursor: Optional[str] = None
+    isApproximate: bool = False
 
 
 class PayTrackResponseModel(BaseModel, Generic[T]):
@@ -47,32 +56,88 @@ class PayTrackResponseModel(BaseModel, Generic[T]):
     pagination: Optional[PaginationType] = None
 
 
-class PayTrackHttpResponse(Generic[T]):
-    @staticmethod
-    def ok(data: T, pagination: Optional[PaginationType] = None) -> JSONResponse:
-        content = {
-            "status": HttpStatus.OK,
-            "statusMessage": HttpResponseMessages.SUCCESS,
-            "data": data,
-        }
+def _orjson_default(obj):
+    if isinstance(obj, BaseModel):
+        # Igual que response_model: alias y tipos ya convertidos a JSON
+        return obj.model_dump(mode="json", by_alias=True)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content) -> bytes:
+    """orjson con soporte nativo de UUID/datetime/enum y de modelos pydantic."""
+    return orjson.dumps(content, default=_orjson_default)
+
+
+class PayTrackORJSONResponse(Response):
+    """
+    JSONResponse serializado con orjson. Si un endpoint regresa esta respuesta
+    directamente, FastAPI no vuelve a validar ni serializar su response_model.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dumps(content)
 
-        if isinstance(data, list):
-            content["pagination"] = pagination.model_dump() if pagination else None
 
-        return JSONResponse(
+class PayTrackEnvelopeResponse(PayTrackORJSONResponse):
+    """
+    Respuesta con el sobre `{"status", "statusMessage", "data", "pagination"}`.
+    El prefijo constante de cada status se codifica una sola vez.
+    """
+
+    _prefixes: dict[tuple[int, str], bytes] = {}
+
+    def __init__(
+        self,
+        status_code: int,
+        status_message: str,
+        data=None,
+        pagination: Optional[PaginationType] = None,
+        include_pagination: bool = False,
+        **kwargs,
+    ):
+        self.status_message = status_message
+        self.pagination = pagination
+        self.include_pagination = include_pagination
+        super().__init__(content=data, status_code=status_code, **kwargs)
+
+    @classmethod
+    def prefix(cls, status_code: int, status_message: str) -> bytes:
+        key = (status_code, status_message)
+        prefix = cls._prefixes.get(key)
+        if prefix is None:
+            prefix = dumps({"status": status_code, "statusMessage": status_message})
+            prefix = prefix[:-1] + b',"data":'
+            cls._prefixes[key] = prefix
+        return prefix
+
+    def render(self, content) -> bytes:
+        body = self.prefix(self.status_code, self.status_message) + dumps(content)
+        if self.include_pagination:
+            body += b',"pagination":' + dumps(self.pagination)
+        return body + b"}"
+
+
+class PayTrackHttpResponse(Generic[T]):
+    @staticmethod
+    def ok(
+        data: T, pagination: Optional[PaginationType] = None
+    ) -> PayTrackEnvelopeResponse:
+        return PayTrackEnvelopeResponse(
             status_code=HttpStatus.OK,
-            content=content,
+            status_message=HttpResponseMessages.SUCCESS,
+            data=data,
+            pagination=pagination,
+            include_pagination=isinstance(data, list),
         )
 
     @staticmethod
-    def created(data: T) -> JSONResponse:
-        return JSONResponse(
+    def created(data: T) -> PayTrackEnvelopeResponse:
+        return PayTrackEnvelopeResponse(
             status_code=HttpStatus.CREATED,
-            content={
-                "status": HttpStatus.CREATED,
-                "statusMessage": HttpResponseMessages.CREATED,
-                "data": data,
-            },
+            status_message=HttpResponseMessages.CREATED,
+            data=data,
         )
 
     @staticmethod
@@ -80,14 +145,11 @@ class PayTrackHttpResponse(Generic[T]):
         return Response(status_code=HttpStatus.NO_CONTENT)
 
     @staticmethod
-    def updated(data: Optional[T] = None) -> JSONResponse:
-        return JSONResponse(
+    def updated(data: Optional[T] = None) -> PayTrackEnvelopeResponse:
+        return PayTrackEnvelopeResponse(
             status_code=HttpStatus.OK,
-            content={
-                "status": HttpStatus.OK,
-                "statusMessage": HttpResponseMessages.UPDATED,
-                "data": data,
-            },
+            status_message=HttpResponseMessages.UPDATED,
+            data=data,
         )
 
     @staticmethod
@@ -155,3 +217,25 @@ class PayTrackHttpResponse(Generic[T]):
                 },
             },
         )
+
+    @staticmethod
+    def service_unavailable(retry_after: Optional[int] = None) -> HTTPException:
+        raise HTTPException(
+            status_code=HttpStatus.SERVICE_UNAVAILABLE,
+            detail={
+                "status": HttpStatus.SERVICE_UNAVAILABLE,
+                "statusMessage": HttpResponseMessages.SERVICE_UNAVAILABLE,
+            },
+            headers={"Retry-After": str(retry_after)} if retry_after else None,
+        )
+
+    @staticmethod
+    def too_many_requests(retry_after: int) -> HTTPException:
+        raise HTTPException(
+            status_code=HttpStatus.TOO_MANY_REQUESTS,
+            detail={
+                "status": HttpStatus.TOO_MANY_REQUESTS,
+                "statusMessage": HttpResponseMessages.TOO_MANY_REQUESTS,
+            },
+            headers={"Retry-After": str(retry_after)},
+        )
@@ -0,0 +1,136 @@
+"""
+Métricas Prometheus de la API.
+
+Con varios workers de uvicorn/gunicorn hay que exportar PROMETHEUS_MULTIPROC_DIR
+(un directorio vacío por despliegue) antes de arrancar: prometheus_client lee la
+variable al importarse y cada proceso escribe sus valores en archivos que
+/metrics agrega. Al morir un worker debe llamarse
+`prometheus_client.multiprocess.mark_process_dead(pid)`.
+"""
+import os
+import time
+
+from fastapi import APIRouter, Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+UNMATCHED_ROUTE = "<unmatched>"
+
+REQUEST_DURATION = Histogram(
+    "paytrack_http_request_duration_seconds",
+    "Duración de las requests HTTP por ruta",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "paytrack_http_requests_in_flight",
+    "Requests HTTP en curso",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+OPERATION_DURATION = Histogram(
+    "paytrack_operation_duration_seconds",
+    "Duración de operaciones internas (bcrypt, JWT, sesión de DB, SMTP)",
+    ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+# El contador de requests por status sale del _count del histograma; este
+# solo cuenta las que terminaron en excepción sin respuesta
+UNHANDLED_ERRORS = Counter(
+    "paytrack_http_unhandled_errors",
+    "Requests que terminaron en una excepción no manejada",
+    ["method", "route"],
+)
+# Filas borradas por app.workers.reaper, por tabla y motivo (dead/expired)
+REAPER_ROWS_RECLAIMED = Counter(
+    "paytrack_reaper_rows_reclaimed",
+    "Filas borradas por el reaper",
+    ["table", "reason"],
+)
+
+BCRYPT_HASH_TIME = OPERATION_DURATION.labels("bcrypt_hash")
+BCRYPT_VERIFY_TIME = OPERATION_DURATION.labels("bcrypt_verify")
+JWT_DECODE_TIME = OPERATION_DURATION.labels("jwt_decode")
+DB_SESSION_TIME = OPERATION_DURATION.labels("db_session")
+SMTP_SEND_TIME = OPERATION_DURATION.labels("smtp_send")
+
+
+class PrometheusMiddleware:
+    """
+    Middleware ASGI: histograma de duración por (método, ruta, status) y
+    gauge de requests en curso. La ruta es la plantilla de FastAPI
+    (/users/{user_id}), no el path, para no disparar la cardinalidad.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        # labels() toma un lock en cada llamada; los hijos se cachean aquí
+        self._durations: dict[tuple, object] = {}
+        self._in_flight: dict[str, object] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        in_flight = self._in_flight.get(method)
+        if in_flight is None:
+            in_flight = self._in_flight[method] = REQUESTS_IN_FLIGHT.labels(method)
+
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            UNHANDLED_ERRORS.labels(method, route_template(scope)).inc()
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            in_flight.dec()
+            route = scope.get("route")
+            key = (method, route.path if route is not None else UNMATCHED_ROUTE, status)
+            child = self._durations.get(key)
+            if child is None:
+                child = self._durations[key] = REQUEST_DURATION.labels(*key[:2], str(status))
+            child.observe(elapsed)
+
+
+def route_template(scope) -> str:
+    route = scope.get("route")
+    return route.path if route is not None else UNMATCHED_ROUTE
+
+
+def render_metrics() -> bytes:
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE_LATEST)
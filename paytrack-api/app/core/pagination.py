@@ -0,0 +1,199 @@
+import math
+import base64
+from uuid import UUID
+from datetime import date, datetime
+from typing import Any, Literal, Optional, Sequence
+
+import orjson
+from sqlalchemy import func, text, tuple_
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import ColumnElement
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.http_response import PaginationType, PayTrackHttpResponse
+from app.utils.ttl_cache import TTLCache
+
+CountMode = Literal["estimate", "cached", "exact"]
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, UUID):
+        return {"u": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        if "u" in value:
+            return UUID(value["u"])
+    return value
+
+
+def encode_cursor(keys: Sequence[Any], page: int, direction: str) -> str:
+    payload = {"k": [_encode_value(k) for k in keys], "p": page, "d": direction}
+    return base64.urlsafe_b64encode(orjson.dumps(payload)).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[list[Any], int, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = orjson.loads(base64.urlsafe_b64decode(padded))
+        keys = [_decode_value(k) for k in payload["k"]]
+        return keys, int(payload["p"]), payload["d"]
+    except Exception:
+        PayTrackHttpResponse.bad_request(data={"message": "Invalid cursor"})
+
+
+class KeysetPaginator:
+    """
+    Paginación por cursor (keyset) para sentencias `select()` de SQLModel.
+
+    Cada página filtra con `(col1, col2, ...) > (:v1, :v2, ...)` sobre columnas
+    indexadas, así que la página 500 cuesta lo mismo que la primera. El total
+    para `lastPage` se obtiene según `count_mode`:
+
+    - "estimate": estimación del planner de Postgres (EXPLAIN), sin leer filas.
+    - "cached": COUNT(*) real, cacheado `count_ttl` segundos por consulta.
+    - "exact": COUNT(*) en cada llamada.
+
+    Sin `count_mode` se usa "estimate" en Postgres y "exact" en otros motores,
+    que no tienen un EXPLAIN equivalente (igual que un "estimate" explícito).
+
+    Las columnas de `order_by` deben formar una llave única (p. ej.
+    `created_at, user_id`).
+    """
+
+    def __init__(
+        self,
+        order_by: Sequence[ColumnElement],
+        page_size: int = 20,
+        max_page_size: int = 100,
+        descending: bool = False,
+        count_mode: Optional[CountMode] = None,
+        count_ttl: float = 60.0,
+    ):
+        self.order_by = list(order_by)
+        self.page_size = page_size
+        self.max_page_size = max_page_size
+        self.descending = descending
+        self.count_mode = count_mode
+        self._count_cache: TTLCache[str, int] = TTLCache(max_size=256, ttl=count_ttl)
+
+    def _ordered(self, statement: Select, reverse: bool) -> Select:
+        descending = self.descending != reverse
+        return statement.order_by(
+            *(col.desc() if descending else col.asc() for col in self.order_by)
+        )
+
+    def _after(self, statement: Select, keys: list[Any], reverse: bool) -> Select:
+        row = tuple_(*self.order_by)
+        descending = self.descending != reverse
+        return statement.where(row < tuple_(*keys) if descending else row > tuple_(*keys))
+
+    def _row_keys(self, item: Any) -> list[Any]:
+        return [getattr(item, col.key) for col in self.order_by]
+
+    def resolve_count_mode(self, session: AsyncSession) -> CountMode:
+        if session.get_bind().dialect.name != "postgresql":
+            return "exact" if self.count_mode in (None, "estimate") else self.count_mode
+        return self.count_mode or "estimate"
+
+    async def count(self, session: AsyncSession, statement: Select) -> int:
+        count_mode = self.resolve_count_mode(session)
+        count_statement = select_count(statement)
+
+        if count_mode == "exact":
+            return (await session.exec(count_statement)).one()
+
+        cache_key = str(statement.compile(compile_kwargs={"literal_binds": True}))
+        cached = self._count_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        if count_mode == "estimate":
+            total = await estimate_count(session, statement)
+        else:
+            total = (await session.exec(count_statement)).one()
+
+        self._count_cache.set(cache_key, total)
+        return total
+
+    async def paginate(
+        self,
+        session: AsyncSession,
+        statement: Select,
+        cursor: Optional[str] = None,
+        page_size: Optional[int] = None,
+    ) -> tuple[list[Any], PaginationType]:
+        size = min(page_size or self.page_size, self.max_page_size)
+
+        page, reverse, keys = 1, False, None
+        if cursor:
+            keys, page, direction = decode_cursor(cursor)
+            # Un cursor de otra consulta armaría un tuple_ de otra aridad: error en la base
+            if len(keys) != len(self.order_by) or direction not in ("next", "prev"):
+                PayTrackHttpResponse.bad_request(data={"message": "Invalid cursor"})
+            reverse = direction == "prev"
+
+        page_statement = self._ordered(statement, reverse)
+        if keys is not None:
+            page_statement = self._after(page_statement, keys, reverse)
+
+        rows = list((await session.exec(page_statement.limit(size + 1))).all())
+        has_more = len(rows) > size
+        items = rows[:size]
+        if reverse:
+            items.reverse()
+
+        has_next = has_more if not reverse else True
+        has_prev = page > 1
+
+        total = await self.count(session, statement)
+        # El total puede ser aproximado; lo que sabemos de la página actual manda
+        last_page = max(math.ceil(total / size), page + 1) if has_next else page
+
+        pagination = PaginationType(
+            count=total,
+            currentPage=page,
+            nextPage=page + 1 if has_next and items else None,
+            prevPage=page - 1 if has_prev else None,
+            lastPage=last_page,
+            nextCursor=(
+                encode_cursor(self._row_keys(items[-1]), page + 1, "next")
+                if has_next and items
+                else None
+            ),
+            prevCursor=(
+                encode_cursor(self._row_keys(items[0]), page - 1, "prev")
+                if has_prev and items
+                else None
+            ),
+            isApproximate=self.resolve_count_mode(session) == "estimate",
+        )
+        return items, pagination
+
+
+def select_count(statement: Select) -> Select:
+    return select(func.count()).select_from(statement.order_by(None).subquery())
+
+
+async def estimate_count(session: AsyncSession, statement: Select) -> int:
+    """Filas estimadas por el planner de Postgres para `statement`."""
+    bind = session.get_bind()
+    compiled = statement.order_by(None).compile(
+        dialect=bind.dialect, compile_kwargs={"literal_binds": True}
+    )
+    result = await session.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+    plan = result.scalar_one()
+    if isinstance(plan, (str, bytes)):
+        plan = orjson.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
@@ -0,0 +1,127 @@
+"""
+Perfilado de queries SQL por request.
+
+Los eventos before/after_cursor_execute del engine acumulan cantidad de
+queries y tiempo en el QueryStats de la request actual (contextvar), loguean
+las queries lentas con los parámetros redactados y, al cerrar la request,
+avisan si una misma sentencia se repitió muchas veces (N+1 típico al
+recorrer relaciones como UserModel.qr_codes).
+"""
+import re
+import time
+import logging
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .settings import settings
+
+logger = logging.getLogger("paytrack.sql")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    total_time: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    "query_stats", default=None
+)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+
+def redact_parameters(parameters) -> object:
+    """Reemplaza cada valor por su tipo: el log muestra la forma, no los datos."""
+    if isinstance(parameters, dict):
+        return {key: f"<{type(value).__name__}>" for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [redact_parameters(value) if isinstance(value, (dict, list, tuple))
+                else f"<{type(value).__name__}>" for value in parameters]
+    return f"<{type(parameters).__name__}>"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.total_time += elapsed
+        stats.shapes[statement] += 1
+
+    if elapsed >= settings.SLOW_QUERY_THRESHOLD:
+        logger.warning(
+            "Slow query (%.1f ms): %s | params=%s",
+            elapsed * 1000,
+            _WHITESPACE.sub(" ", statement).strip(),
+            redact_parameters(parameters),
+        )
+
+
+def install_query_profiler(engine: Engine) -> None:
+    """Registra los hooks en un engine sync (para AsyncEngine usar .sync_engine)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def report_repeated_statements(stats: QueryStats, route: str) -> None:
+    for statement, count in stats.shapes.items():
+        if count >= settings.QUERY_N_PLUS_ONE_THRESHOLD:
+            logger.warning(
+                "Possible N+1 on %s: statement executed %d times: %s",
+                route,
+                count,
+                _WHITESPACE.sub(" ", statement).strip()[:200],
+            )
+
+
+class QueryProfilerMiddleware:
+    """
+    Abre un QueryStats por request. Fuera de producción agrega
+    `Server-Timing: db;dur=<ms>;desc="<n> queries"` a la respuesta.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.server_timing = settings.ENV != "production"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current_stats.set(stats)
+
+        async def send_wrapper(message):
+            if self.server_timing and message["type"] == "http.response.start":
+                header = f'db;dur={stats.total_time * 1000:.2f};desc="{stats.count} queries"'
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"server-timing", header.encode("latin-1")),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_stats.reset(token)
+            route = scope.get("route")
+            report_repeated_statements(
+                stats, route.path if route is not None else scope["path"]
+            )
@@ -0,0 +1,192 @@
+import math
+import time
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import Request
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from .redis import redis_client
+from .settings import settings
+from .http_response import PayTrackHttpResponse
+
+logger = logging.getLogger(__name__)
+
+
+# Token bucket atómico. Usa el reloj de Redis para que todos los workers
+# compartan la misma noción de tiempo. Regresa {permitido, retry_after_ms}.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local allowed = 0
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    retry_after = math.ceil((1 - tokens) / rate)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate))
+return {allowed, retry_after}
+"""
+
+
+@dataclass(frozen=True)
+class BucketLimit:
+    capacity: int
+    # Segundos para rellenar el bucket completo
+    period: float
+
+    @property
+    def rate_per_ms(self) -> float:
+        return self.capacity / (self.period * 1000)
+
+
+class LocalTokenBuckets:
+    """Fallback en memoria del proceso cuando Redis no está disponible."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def hit(self, key: str, limit: BucketLimit) -> tuple[bool, int]:
+        now = time.monotonic() * 1000
+        tokens, ts = self._buckets.get(key, (limit.capacity, now))
+        tokens = min(limit.capacity, tokens + max(0.0, now - ts) * limit.rate_per_ms)
+
+        allowed, retry_after = False, 0
+        if tokens >= 1:
+            tokens -= 1
+            allowed = True
+        else:
+            retry_after = math.ceil((1 - tokens) / limit.rate_per_ms)
+
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return allowed, retry_after
+
+
+class TokenBucketLimiter:
+    KEY_PREFIX = "paytrack:ratelimit"
+
+    def __init__(self, redis: Redis, retry_redis_after: float = 5.0):
+        self.redis = redis
+        self.local = LocalTokenBuckets()
+        self.retry_redis_after = retry_redis_after
+        self._redis_down_until = 0.0
+        self._script = redis.register_script(TOKEN_BUCKET_SCRIPT)
+
+    async def hit(self, key: str, limit: BucketLimit) -> tuple[bool, int]:
+        """Consume un token; regresa `(permitido, retry_after_ms)`."""
+        if time.monotonic() >= self._redis_down_until:
+            try:
+                allowed, retry_after = await self._script(
+                    keys=[f"{self.KEY_PREFIX}:{key}"],
+                    args=[limit.capacity, limit.rate_per_ms],
+                )
+                return bool(allowed), int(retry_after)
+            except (RedisError, OSError) as e:
+                logger.warning("Rate limiter using local fallback: %r", e)
+                self._redis_down_until = time.monotonic() + self.retry_redis_after
+
+        return self.local.hit(key, limit)
+
+
+token_bucket_limiter = TokenBucketLimiter(redis_client)
+
+
+def get_client_ip(request: Request) -> str:
+    """
+    IP del cliente. Cada proxy agrega a X-Forwarded-For la IP de quien le
+    habló, así que solo las últimas RATE_LIMIT_TRUSTED_PROXIES entradas son
+    confiables; lo que está más a la izquierda lo controla el cliente.
+    """
+    hops = settings.RATE_LIMIT_TRUSTED_PROXIES
+    if settings.RATE_LIMIT_TRUST_FORWARDED and hops > 0:
+        forwarded = [
+            ip.strip()
+            for header in request.headers.getlist("x-forwarded-for")
+            for ip in header.split(",")
+            if ip.strip()
+        ]
+        # Con menos entradas que proxies la cadena no pasó por los nuestros
+        if len(forwarded) >= hops:
+            return forwarded[-hops]
+    return request.client.host if request.client else "unknown"
+
+
+class RateLimit:
+    """
+    Dependencia que limita por IP y por el `email` del body. Corre antes del
+    handler, así que un rechazo no toca la base ni calcula bcrypt.
+    """
+
+    def __init__(
+        self,
+        scope: str,
+        per_ip: BucketLimit,
+        per_email: Optional[BucketLimit] = None,
+        limiter: TokenBucketLimiter = token_bucket_limiter,
+    ):
+        self.scope = scope
+        self.per_ip = per_ip
+        self.per_email = per_email
+        self.limiter = limiter
+
+    async def _email(self, request: Request) -> Optional[str]:
+        try:
+            body = await request.json()
+        except ValueError:
+            return None
+        email = body.get("email") if isinstance(body, dict) else None
+        return email.strip().lower() if isinstance(email, str) else None
+
+    async def _check(self, key: str, limit: BucketLimit) -> None:
+        allowed, retry_after_ms = await self.limiter.hit(key, limit)
+        if not allowed:
+            PayTrackHttpResponse.too_many_requests(
+                retry_after=max(1, math.ceil(retry_after_ms / 1000))
+            )
+
+    async def __call__(self, request: Request) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+
+        await self._check(f"{self.scope}:ip:{get_client_ip(request)}", self.per_ip)
+
+        if self.per_email:
+            email = await self._email(request)
+            if email:
+                await self._check(f"{self.scope}:email:{email}", self.per_email)
+
+
+signin_rate_limit = RateLimit(
+    scope="signin",
+    per_ip=BucketLimit(settings.RATE_LIMIT_SIGNIN_IP_CAPACITY, settings.RATE_LIMIT_PERIOD),
+    per_email=BucketLimit(settings.RATE_LIMIT_SIGNIN_EMAIL_CAPACITY, settings.RATE_LIMIT_PERIOD),
+)
+signup_rate_limit = RateLimit(
+    scope="signup",
+    per_ip=BucketLimit(settings.RATE_LIMIT_SIGNUP_IP_CAPACITY, settings.RATE_LIMIT_PERIOD),
+    per_email=BucketLimit(settings.RATE_LIMIT_SIGNUP_EMAIL_CAPACITY, settings.RATE_LIMIT_PERIOD),
+)
+codes_rate_limit = RateLimit(
+    scope="codes",
+    per_ip=BucketLimit(settings.RATE_LIMIT_CODES_IP_CAPACITY, settings.RATE_LIMIT_PERIOD),
+    per_email=BucketLimit(settings.RATE_LIMIT_CODES_EMAIL_CAPACITY, settings.RATE_LIMIT_PERIOD),
+)
@@ -0,0 +1,11 @@
+from redis.asyncio import Redis
+
+from .settings import settings
+
+
+redis_client = Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT)
+
+
+async def get_redis() -> Redis:
+    """Returns the shared Redis client for use in FastAPI endpoints."""
+    return redis_client
@@ -0,0 +1,138 @@
+"""
+Ruteo de lecturas a réplicas.
+
+Las sesiones usan RoutingSession: por defecto todo va al primario, y solo los
+SELECT que corren dentro de un método marcado con @read_replica se mandan a
+una réplica sana (round-robin). Una vez que la sesión escribe (flush o
+INSERT/UPDATE/DELETE explícito) queda fijada al primario hasta cerrarse, así
+una request lee lo que acaba de escribir.
+"""
+import asyncio
+import logging
+import functools
+import itertools
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.sql import Select
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import Session
+
+logger = logging.getLogger(__name__)
+
+PRIMARY_PINNED = "primary_pinned"
+
+_read_only: ContextVar[bool] = ContextVar("read_only", default=False)
+
+# 0 si la réplica ya aplicó todo lo recibido; si no, segundos desde la
+# última transacción aplicada
+POSTGRES_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+def read_replica(func):
+    """Permite que los SELECT del método vayan a una réplica."""
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        token = _read_only.set(True)
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            _read_only.reset(token)
+
+    return wrapper
+
+
+class ReplicaSet:
+    """
+    Réplicas con round-robin sobre las sanas. Una réplica sale de rotación si
+    falla el chequeo, supera max_lag o su conexión se cae, y vuelve en el
+    siguiente chequeo exitoso.
+    """
+
+    def __init__(self, engines: list[AsyncEngine], max_lag: float):
+        self.engines = engines
+        self.max_lag = max_lag
+        self.healthy: list[AsyncEngine] = list(engines)
+        self._counter = itertools.count()
+        for engine in engines:
+            event.listen(engine.sync_engine, "handle_error", self._on_error(engine))
+
+    def _on_error(self, engine: AsyncEngine):
+        def handle_error(context):
+            if context.is_disconnect:
+                self.eject(engine)
+
+        return handle_error
+
+    def next(self) -> Optional[AsyncEngine]:
+        healthy = self.healthy
+        if not healthy:
+            return None
+        return healthy[next(self._counter) % len(healthy)]
+
+    def eject(self, engine: AsyncEngine) -> None:
+        if engine in self.healthy:
+            logger.warning("Replica %s ejected", engine.url.render_as_string())
+            self.healthy = [e for e in self.healthy if e is not engine]
+
+    async def lag(self, engine: AsyncEngine) -> float:
+        async with engine.connect() as conn:
+            if engine.dialect.name == "postgresql":
+                return float((await conn.execute(POSTGRES_LAG_QUERY)).scalar_one())
+            await conn.execute(text("SELECT 1"))
+            return 0.0
+
+    async def check(self) -> None:
+        healthy = []
+        for engine in self.engines:
+            try:
+                lag = await asyncio.wait_for(self.lag(engine), timeout=self.max_lag)
+            except Exception as e:
+                logger.warning("Replica %s health check failed: %s", engine.url.render_as_string(), e)
+                continue
+            if lag <= self.max_lag:
+                healthy.append(engine)
+            else:
+                logger.warning("Replica %s lagging %.1fs", engine.url.render_as_string(), lag)
+        self.healthy = healthy
+
+    async def run_health_checks(self, interval: float) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(interval)
+
+    async def dispose(self) -> None:
+        for engine in self.engines:
+            await engine.dispose()
+
+
+class RoutingSession(Session):
+    replicas: Optional[ReplicaSet] = None
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        primary = super().get_bind(mapper=mapper, clause=clause, **kwargs)
+        if self.replicas is None or self.info.get(PRIMARY_PINNED):
+            return primary
+
+        if self._flushing or (clause is not None and not isinstance(clause, Select)):
+            self.info[PRIMARY_PINNED] = True
+            return primary
+
+        if not _read_only.get() or not isinstance(clause, Select):
+            return primary
+
+        replica = self.replicas.next()
+        return replica.sync_engine if replica is not None else primary
+
+
+def routing_session_class(replicas: Optional[ReplicaSet]) -> type[RoutingSession]:
+    return type("PayTrackRoutingSession", (RoutingSession,), {"replicas": replicas})
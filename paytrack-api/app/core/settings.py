@@ -1,6 +1,13 @@
+import os
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from dotenv import load_dotenv
 
+# A diferencia del engine y del CryptContext, .env y Settings se cargan al
+# importar a propósito: cuestan ~4 ms y los singletons de módulo (redis_client,
+# rate limits, pool SMTP, hasher, middlewares de app.main) ya leen settings al
+# importarse, así que un get_settings() perezoso correría en el mismo import.
+# Además una variable faltante falla al arrancar y no en el primer request.
 load_dotenv()
 
 
@@ -13,6 +20,7 @@ class Settings(BaseSettings):
     # API Configuration
     API_V1: str
     PROJECT_NAME: str
+    ENV: str = "development"
 
     # Database Configuration
     DB_USER: str
@@ -21,19 +29,128 @@ class Settings(BaseSettings):
     DB_HOST: str
     DB_PORT: int
 
+    # Pool de conexiones: DB_CONNECTION_BUDGET (total de la API contra Postgres
+    # o PgBouncer). DB_AUX_CONNECTIONS se reserva para los procesos auxiliares
+    # (reaper, reconciliador, scripts), cada uno con un pool de DB_AUX_POOL_SIZE;
+    # el resto se reparte entre los WEB_CONCURRENCY workers
+    WEB_CONCURRENCY: int | None = None
+    DB_CONNECTION_BUDGET: int = 60
+    DB_AUX_CONNECTIONS: int = 6
+    DB_AUX_POOL_SIZE: int = 2
+    DB_POOL_OVERFLOW_RATIO: float = 0.25
+    DB_POOL_TIMEOUT: float = 10.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_STATEMENT_TIMEOUT: int = 30000
+    DB_PGBOUNCER: bool = False
+
+    # Réplicas de lectura (URLs separadas por coma); sin réplicas todo va al primario
+    DATABASE_REPLICA_URLS: str | None = None
+    DB_REPLICA_MAX_LAG: float = 5.0
+    DB_REPLICA_HEALTH_INTERVAL: float = 5.0
+
     # JWT Configuration
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str
+    # Firma asimétrica (EdDSA/ES256): <kid>.pem en JWT_KEYS_DIR, ver app/utils/jwt_keys.py.
+    # Sin JWT_KEYS_DIR se firma con JWT_SECRET_KEY y JWT_ALGORITHM (HMAC).
+    JWT_KEYS_DIR: str | None = None
+    JWT_ACTIVE_KID: str | None = None
+    # Aceptar tokens HMAC sin kid mientras se migra a llaves asimétricas
+    JWT_ACCEPT_LEGACY_HMAC: bool = True
+    JWKS_CACHE_MAX_AGE: int = 3600
+    TOKEN_CACHE_MAX_SIZE: int = 10000
+    TOKEN_CACHE_TTL: float = 60.0
+
+    # Refresh tokens con rotación ("redis" o "memory" para pruebas sin Redis)
+    REFRESH_TOKEN_BACKEND: str = "redis"
+    REFRESH_TOKEN_TTL: int = 2 * 24 * 3600
+
+    # Rate limiting de /auth (token bucket; el bucket se rellena en RATE_LIMIT_PERIOD segundos)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_TRUST_FORWARDED: bool = False
+    # Proxies propios delante de la API; la IP del cliente es la entrada de
+    # X-Forwarded-For que agregó el más externo (las de la izquierda las manda el cliente)
+    RATE_LIMIT_TRUSTED_PROXIES: int = 1
+    RATE_LIMIT_PERIOD: float = 60.0
+    RATE_LIMIT_SIGNIN_IP_CAPACITY: int = 20
+    RATE_LIMIT_SIGNIN_EMAIL_CAPACITY: int = 5
+    RATE_LIMIT_SIGNUP_IP_CAPACITY: int = 5
+    RATE_LIMIT_SIGNUP_EMAIL_CAPACITY: int = 3
+    # Reenvío de código y solicitud de cambio de contraseña (cada uno manda un correo)
+    RATE_LIMIT_CODES_IP_CAPACITY: int = 5
+    RATE_LIMIT_CODES_EMAIL_CAPACITY: int = 2
+
+    # Métricas Prometheus en /metrics (PROMETHEUS_MULTIPROC_DIR con varios workers)
+    METRICS_ENABLED: bool = True
+
+    # Perfilado de queries SQL (Server-Timing solo fuera de producción)
+    QUERY_PROFILER_ENABLED: bool = True
+    SLOW_QUERY_THRESHOLD: float = 0.2
+    QUERY_N_PLUS_ONE_THRESHOLD: int = 5
+
+    # Presupuesto de `import app.main` (python -m scripts.check_import_time)
+    IMPORT_TIME_BUDGET_MS: float = 1500.0
 
     # Redis Configuration
     REDIS_HOST: str
     REDIS_PORT: int
 
+    # User cache ("redis" o "memory" para pruebas sin Redis)
+    USER_CACHE_BACKEND: str = "redis"
+    USER_CACHE_TTL: float = 300.0
+    USER_CACHE_LOCAL_TTL: float = 30.0
+
+    # Verification codes ("redis" o "sql" para usar las tablas verification_codes*)
+    VERIFICATION_CODE_BACKEND: str = "redis"
+    VERIFICATION_CODE_TTL: int = 900
+    VERIFICATION_CODE_MAX_ATTEMPTS: int = 5
+    VERIFICATION_CODE_LENGTH: int = 6
+
+    # Reaper de códigos muertos (en la API si REAPER_ENABLED, o `python -m app.workers.reaper`)
+    REAPER_ENABLED: bool = False
+    REAPER_INTERVAL: float = 3600.0
+    REAPER_BATCH_SIZE: int = 1000
+    REAPER_BATCH_PAUSE: float = 0.1
+    REAPER_MAX_BATCHES: int = 100
+    REAPER_QR_CODE_RETENTION: int = 7 * 24 * 3600
+
+    # Filtro en memoria de QR vivos (por worker, sincronizado por pub/sub de Redis)
+    QR_FILTER_BATCH_SIZE: int = 5000
+    QR_FILTER_RELOAD_INTERVAL: float = 60.0
+
+    # QR firmados: llave privada Ed25519 en PEM, ver app/utils/qr_signing.py.
+    # Sin QR_SIGNING_KEY_FILE no se emiten ni verifican QR firmados.
+    QR_SIGNING_KEY_FILE: str | None = None
+    QR_SIGNED_TTL: int = 300
+    QR_REVOCATION_REFRESH_INTERVAL: float = 5.0
+
+    # Points ledger
+    POINTS_BATCH_MAX_SIZE: int = 500
+    POINTS_BATCH_MAX_DELAY: float = 0.01
+    POINTS_RECONCILE_INTERVAL: float = 3600.0
+
     # Email Configuration
     SMTP_SERVER: str
     SMTP_PORT: int
     SMTP_USERNAME: str
     SMTP_PASSWORD: str
+    SMTP_START_TLS: bool = True
+    SMTP_POOL_SIZE: int = 4
+    SMTP_MAX_MESSAGES_PER_CONNECTION: int = 100
+    SMTP_IDLE_TIMEOUT: float = 60.0
+
+    # Email outbox worker
+    EMAIL_OUTBOX_BATCH_SIZE: int = 50
+    EMAIL_OUTBOX_POLL_INTERVAL: float = 1.0
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = 5
+    EMAIL_OUTBOX_BASE_BACKOFF: float = 2.0
+    EMAIL_OUTBOX_MAX_BACKOFF: float = 300.0
+    # Debe superar lo que tarda un lote en enviarse: al vencer, otro worker lo reenvía
+    EMAIL_OUTBOX_LEASE_TIMEOUT: float = 300.0
+
+    # Password hashing (bcrypt) process pool
+    PASSWORD_HASH_WORKERS: int | None = None
+    PASSWORD_HASH_MAX_PENDING: int | None = None
 
     SUPABASE_JWT_SECRET: str | None = None
     SUPABASE_URL: str | None = None
@@ -41,6 +158,30 @@ class Settings(BaseSettings):
     SUPABASE_SERVICE_ROLE_KEY: str | None = None
     DATABASE_URL: str
 
+    @property
+    def WORKERS(self) -> int:
+        return self.WEB_CONCURRENCY or os.cpu_count() or 1
+
+    @property
+    def DB_WEB_CONNECTION_BUDGET(self) -> int:
+        return self.DB_CONNECTION_BUDGET - self.DB_AUX_CONNECTIONS
+
+    @property
+    def DB_POOL_LIMITS(self) -> tuple[int, int]:
+        """
+        (pool_size, max_overflow) por worker web. Con más workers que
+        DB_WEB_CONNECTION_BUDGET cada uno sigue teniendo una conexión y el total
+        se pasa: gunicorn.conf.py se niega a arrancar en ese caso.
+        """
+        per_worker = max(1, self.DB_WEB_CONNECTION_BUDGET // self.WORKERS)
+        max_overflow = int(per_worker * self.DB_POOL_OVERFLOW_RATIO)
+        return max(1, per_worker - max_overflow), max_overflow
+
+    @property
+    def DB_AUX_POOL_LIMITS(self) -> tuple[int, int]:
+        """(pool_size, max_overflow) de un proceso auxiliar, sin overflow."""
+        return self.DB_AUX_POOL_SIZE, 0
+
     @property
     def DATABASE_URL_EFFECTIVE(self):
         if self.DATABASE_URL:
@@ -49,5 +190,25 @@ class Settings(BaseSettings):
             return f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
         raise RuntimeError("DATABASE_URL no configurada")
 
+    @property
+    def DATABASE_URL_ASYNC(self):
+        """DATABASE_URL_EFFECTIVE con el driver async (asyncpg, o aiosqlite para pruebas)."""
+        return to_async_url(self.DATABASE_URL_EFFECTIVE)
+
+    @property
+    def DATABASE_REPLICA_URLS_ASYNC(self) -> list[str]:
+        if not self.DATABASE_REPLICA_URLS:
+            return []
+        return [to_async_url(url.strip()) for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+
+
+def to_async_url(url: str) -> str:
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    return url
+
 
 settings = Settings()
@@ -1,14 +1,75 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
-from app.api.auth.auth_router import router as auth_router
+from app.api.auth.auth_router import router as auth_router, well_known_router
+from app.api.points.points_service import points_batcher
+from app.api.qr_codes.qr_code_router import router as qr_code_router
+from app.api.users.user_router import router as user_router
+from app.api.qr_codes.qr_code_service import run_qr_code_filter, run_qr_revocation_list
+from app.core.database import dispose_engine, get_engine, get_replica_set
+from app.core.redis import redis_client
+from app.core.settings import settings
+from app.core.http_response import PayTrackORJSONResponse
+from app.core.metrics import PrometheusMiddleware, router as metrics_router
+from app.core.query_profiler import QueryProfilerMiddleware
+from app.utils.password_hasher import password_hasher
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # El engine se crea aquí y no al importar app.main
+    get_engine(pool="web")
+    replica_set = get_replica_set()
+
+    background_tasks = [
+        asyncio.create_task(run_qr_code_filter()),
+        asyncio.create_task(run_qr_revocation_list()),
+    ]
+    if replica_set is not None:
+        background_tasks.append(
+            asyncio.create_task(
+                replica_set.run_health_checks(settings.DB_REPLICA_HEALTH_INTERVAL)
+            )
+        )
+    if settings.REAPER_ENABLED:
+        from app.workers.reaper import reaper
+
+        background_tasks.append(
+            asyncio.create_task(reaper.run_forever(settings.REAPER_INTERVAL))
+        )
+
+    yield
+
+    for task in background_tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    await points_batcher.flush()
+    await dispose_engine()
+    await redis_client.aclose()
+    password_hasher.shutdown()
+
 
 app = FastAPI(
     title="PayTrack API",
     description="API para gestión de pagos",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=PayTrackORJSONResponse,
 )
 
+if settings.QUERY_PROFILER_ENABLED:
+    app.add_middleware(QueryProfilerMiddleware)
+if settings.METRICS_ENABLED:
+    app.add_middleware(PrometheusMiddleware)
+    app.include_router(metrics_router)
+
 # Incluir routers
 app.include_router(auth_router)
+app.include_router(well_known_router)
+app.include_router(qr_code_router)
+app.include_router(user_router)
 
 @app.get("/")
 def read_root():
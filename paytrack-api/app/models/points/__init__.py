@@ -0,0 +1,3 @@
+from .points_ledger_model import PointsLedgerModel
+
+PointsLedgerModel.model_rebuild()
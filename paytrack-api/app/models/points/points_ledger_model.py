@@ -0,0 +1,26 @@
+from uuid import UUID, uuid4
+from datetime import datetime
+
+from sqlmodel import Field, SQLModel
+from sqlalchemy import BigInteger, Index
+
+from app.core.base_model import utc_now
+
+
+class PointsLedgerModel(SQLModel, table=True):
+    """
+    Movimientos de puntos, solo se insertan. `delta` va en unidades menores
+    (ver POINTS_MINOR_UNITS) y `users.points` es la suma materializada.
+    """
+
+    __tablename__ = "points_ledger"
+    __table_args__ = (
+        Index("ix_points_ledger_user_id_created_at", "user_id", "created_at"),
+    )
+
+    ledger_id: UUID = Field(default_factory=uuid4, primary_key=True)
+    user_id: UUID = Field(foreign_key="users.user_id")
+    delta: int = Field(sa_type=BigInteger)
+    idempotency_key: str = Field(unique=True, max_length=128)
+    reason: str = Field(max_length=64)
+    created_at: datetime = Field(default_factory=utc_now)
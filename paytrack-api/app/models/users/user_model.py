@@ -1,5 +1,6 @@
 from typing import TYPE_CHECKING, Optional, List
 from sqlmodel import Field, Relationship, Column, Enum
+from sqlalchemy import BigInteger, Index, text
 from app.core.base_model import BasePayTrackModel
 from datetime import datetime, date
 from uuid import UUID, uuid4
@@ -17,15 +18,20 @@ class UserRole(str, enum.Enum):
 
 class UserModel(BasePayTrackModel, table=True):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_email_lower", text("lower(email)"), unique=True),
+        Index("ix_users_created_at_user_id", "created_at", "user_id"),
+    )
 
     user_id: UUID = Field(default_factory=uuid4, primary_key=True)
     role: UserRole = Field(default=UserRole.customer, sa_column=Column(Enum(UserRole), nullable=False))
     name: str
     last_name: str
     birth_date: date
-    email: str = Field(index=True, unique=True)
+    email: str
     password: str
-    points: float = Field(default=0.0)
+    # Unidades menores; solo se modifica a través de points_ledger
+    points: int = Field(default=0, sa_type=BigInteger)
     is_verified: bool = Field(default=False)
 
     qr_codes: List["UserQRCodeModel"] = Relationship(back_populates="user")
@@ -1,5 +1,6 @@
 from typing import Optional, TYPE_CHECKING
 from sqlmodel import Field, Relationship
+from sqlalchemy import Index, text
 from app.core.base_model import BasePayTrackModel
 from datetime import datetime
 from uuid import UUID, uuid4
@@ -9,8 +10,13 @@ if TYPE_CHECKING:
 
 class UserQRCodeModel(BasePayTrackModel, table=True):
     __tablename__ = "user_qr_codes"
+    __table_args__ = (
+        Index("ix_user_qr_codes_user_id_alive", "user_id", postgresql_where=text("is_alive")),
+        Index("ix_user_qr_codes_qr_code_string_alive", "qr_code_string", unique=True, postgresql_where=text("is_alive")),
+        Index("ix_user_qr_codes_updated_at_qr_code_id", "updated_at", "qr_code_id"),
+    )
 
-    qr_code_id: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
+    qr_code_id: UUID = Field(default_factory=uuid4, primary_key=True)
     user_id: UUID = Field(foreign_key="users.user_id")
     qr_code_string: str
     is_alive: bool = Field(default=True)
@@ -1,5 +1,6 @@
 from typing import Optional, TYPE_CHECKING
 from sqlmodel import Field, Relationship
+from sqlalchemy import Index, text
 from app.core.base_model import BasePayTrackModel
 from uuid import UUID, uuid4
 
@@ -8,10 +9,18 @@ if TYPE_CHECKING:
 
 class VerificationCodePasswordResetModel(BasePayTrackModel, table=True):
     __tablename__ = "verification_codes_password_reset"
+    __table_args__ = (
+        Index("ix_verification_codes_password_reset_user_id_code_alive", "user_id", "code", postgresql_where=text("is_alive")),
+        # Reaper: expirados y muertos
+        Index("ix_verification_codes_password_reset_created_at", "created_at"),
+        Index("ix_verification_codes_password_reset_dead", "verification_code_id", postgresql_where=text("NOT is_alive")),
+    )
 
-    verification_code_id: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
+    verification_code_id: UUID = Field(default_factory=uuid4, primary_key=True)
     user_id: UUID = Field(foreign_key="users.user_id")
     code: str
     is_alive: bool = Field(default=True)
+    # Intentos fallidos; al llegar a VERIFICATION_CODE_MAX_ATTEMPTS el código muere
+    attempts: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
 
     user: "UserModel" = Relationship(back_populates="verification_codes_password_reset")
@@ -1,4 +1,3 @@
-import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
@@ -6,98 +5,92 @@ from app.core.settings import settings
 
 from app.core.http_response import PayTrackHttpResponse
 
+from app.constants.email_constants import EmailKinds
 from app.constants.email_template import new_user_verification_code_email_tempalte
 
+from app.utils.email_outbox import email_outbox
+
 
 class EmailService:
     @staticmethod
-    async def send_verification_email(
-        to_name: str, to_email: str, verification_code: str
-    ):
-        smtp_server = settings.SMTP_SERVER
-        smtp_port = settings.SMTP_PORT
-        smtp_username = settings.SMTP_USERNAME
-        smtp_password = settings.SMTP_PASSWORD
-        verification_code = verification_code
-
+    def build_message(
+        to_email: str, subject: str, text: str, html: str
+    ) -> MIMEMultipart:
         msg = MIMEMultipart("alternative")
-        msg["From"] = smtp_username
+        msg["From"] = settings.SMTP_USERNAME
         msg["To"] = to_email
-        msg["Subject"] = "¡Verifica tu cuenta!"
+        msg["Subject"] = subject
 
-        text = """¡Activa tu cuenta ahora!"""
+        msg.attach(MIMEText(text, "plain"))
+        msg.attach(MIMEText(html, "html"))
+        return msg
 
+    @staticmethod
+    def render(
+        kind: EmailKinds, to_name: str, to_email: str, verification_code: str
+    ) -> MIMEMultipart:
+        """Construye el correo de un mensaje del outbox; lo usa el worker."""
         html = new_user_verification_code_email_tempalte(
             user_name=to_name, code=verification_code
         )
 
-        try:
-            first_part = MIMEText(text, "plain")
-            second_part = MIMEText(html, "html")
-
-            msg.attach(first_part)
-            msg.attach(second_part)
-
-            mail = smtplib.SMTP(smtp_server, smtp_port)
-
-            mail.ehlo()
-
-            mail.starttls()
-
-            mail.login(smtp_username, smtp_password)
-            mail.sendmail(smtp_username, to_email, msg.as_string())
-
-        except smtplib.SMTPException:
-            PayTrackHttpResponse.internal_error()
+        if kind == EmailKinds.VERIFICATION:
+            return EmailService.build_message(
+                to_email=to_email,
+                subject="¡Verifica tu cuenta!",
+                text="""¡Activa tu cuenta ahora!""",
+                html=html,
+            )
+
+        if kind == EmailKinds.PASSWORD_RESET:
+            return EmailService.build_message(
+                to_email=to_email,
+                subject="Restablece tu contraseña",
+                text="""Usa este código para restablecer tu contraseña""",
+                html=html,
+            )
+
+        return EmailService.build_message(
+            to_email=to_email,
+            subject="¡Este es tu numero de conexión!",
+            text="""¡Tu numero de Conexión!""",
+            html=html,
+        )
 
+    @staticmethod
+    async def enqueue(
+        kind: EmailKinds, to_name: str, to_email: str, verification_code: str
+    ):
+        try:
+            await email_outbox.enqueue(
+                kind=kind,
+                to_name=to_name,
+                to_email=to_email,
+                verification_code=verification_code,
+            )
         except Exception:
             PayTrackHttpResponse.internal_error()
 
-        finally:
-            mail.quit()
+    @staticmethod
+    async def send_verification_email(
+        to_name: str, to_email: str, verification_code: str
+    ):
+        await EmailService.enqueue(
+            EmailKinds.VERIFICATION, to_name, to_email, verification_code
+        )
 
     @staticmethod
     async def send_conection_code_email(
         to_name: str, to_email: str, verification_code: str
     ):
-        smtp_server = settings.SMTP_SERVER
-        smtp_port = settings.SMTP_PORT
-        smtp_username = settings.SMTP_USERNAME
-        smtp_password = settings.SMTP_PASSWORD
-        verification_code = verification_code
-
-        msg = MIMEMultipart("alternative")
-        msg["From"] = smtp_username
-        msg["To"] = to_email
-        msg["Subject"] = "¡Este es tu numero de conexión!"
-
-        text = """¡Tu numero de Conexión!"""
-
-        html = new_user_verification_code_email_tempalte(
-            user_name=to_name, code=verification_code
+        await EmailService.enqueue(
+            EmailKinds.CONNECTION_CODE, to_name, to_email, verification_code
         )
 
-        try:
-            first_part = MIMEText(text, "plain")
-            second_part = MIMEText(html, "html")
-
-            msg.attach(first_part)
-            msg.attach(second_part)
-
-            mail = smtplib.SMTP(smtp_server, smtp_port)
-
-            mail.ehlo()
-
-            mail.starttls()
-
-            mail.login(smtp_username, smtp_password)
-            mail.sendmail(smtp_username, to_email, msg.as_string())
-
-        except smtplib.SMTPException:
-            PayTrackHttpResponse.internal_error()
-
-        except Exception as e:
-            PayTrackHttpResponse.internal_error()
-
-        finally:
-            mail.quit()
+    @staticmethod
+    async def send_password_reset_email(
+        to_name: str, to_email: str, verification_code: str
+    ):
+        await EmailService.enqueue(
+            EmailKinds.PASSWORD_RESET, to_name, to_email, verification_code
+        )
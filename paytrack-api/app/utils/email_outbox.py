@@ -0,0 +1,161 @@
+import time
+from uuid import uuid4
+from typing import Optional
+
+import orjson
+from redis.asyncio import Redis
+
+from app.core.redis import redis_client
+from app.core.settings import settings
+from app.constants.email_constants import EmailKinds
+
+
+# Mueve hasta ARGV[1] mensajes de la cola al set de procesamiento de forma
+# atómica, con un lease que vence en ARGV[2]: si el worker se cae, otro los
+# recupera al vencer el lease.
+CLAIM_BATCH_SCRIPT = """
+local items = redis.call('RPOP', KEYS[1], ARGV[1])
+if not items then
+    return {}
+end
+for _, item in ipairs(items) do
+    redis.call('ZADD', KEYS[2], ARGV[2], item)
+end
+return items
+"""
+
+# Regresa al frente de la cola los mensajes con lease vencido.
+RECOVER_EXPIRED_SCRIPT = """
+local items = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+for _, item in ipairs(items) do
+    redis.call('ZREM', KEYS[1], item)
+    redis.call('RPUSH', KEYS[2], item)
+end
+return #items
+"""
+
+# Regresa a la cola los reintentos cuyo backoff ya venció.
+PROMOTE_RETRIES_SCRIPT = """
+local items = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+for _, item in ipairs(items) do
+    redis.call('ZREM', KEYS[1], item)
+    redis.call('LPUSH', KEYS[2], item)
+end
+return #items
+"""
+
+
+class EmailOutbox:
+    """
+    Cola de correos salientes en Redis.
+
+    La petición HTTP solo hace un LPUSH; el worker (`app.workers.email_worker`)
+    reclama lotes, los entrega por SMTP y los reintenta con backoff exponencial
+    hasta `max_attempts`, después de lo cual pasan a la lista de dead letters.
+    Los mensajes reclamados quedan en un sorted set con su vencimiento de
+    lease (`lease_timeout`); solo los vencidos vuelven a la cola, así varios
+    workers pueden correr a la vez sin reenviar lo que otro está enviando.
+    """
+
+    QUEUE_KEY = "paytrack:email:outbox"
+    PROCESSING_KEY = "paytrack:email:leases"
+    RETRY_KEY = "paytrack:email:retry"
+    DEAD_LETTER_KEY = "paytrack:email:dead"
+
+    def __init__(
+        self,
+        redis: Redis,
+        max_attempts: int = 5,
+        base_backoff: float = 2.0,
+        max_backoff: float = 300.0,
+        lease_timeout: float = 300.0,
+    ):
+        self.redis = redis
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.lease_timeout = lease_timeout
+        self._claim_batch = redis.register_script(CLAIM_BATCH_SCRIPT)
+        self._promote_retries = redis.register_script(PROMOTE_RETRIES_SCRIPT)
+        self._recover_expired = redis.register_script(RECOVER_EXPIRED_SCRIPT)
+
+    async def enqueue(
+        self,
+        kind: EmailKinds,
+        to_name: str,
+        to_email: str,
+        verification_code: str,
+    ) -> str:
+        message_id = str(uuid4())
+        message = {
+            "id": message_id,
+            "kind": kind.value,
+            "to_name": to_name,
+            "to_email": to_email,
+            "verification_code": verification_code,
+            "attempts": 0,
+            "enqueued_at": time.time(),
+        }
+        await self.redis.lpush(self.QUEUE_KEY, orjson.dumps(message))
+        return message_id
+
+    async def claim_batch(self, size: int) -> list[bytes]:
+        return await self._claim_batch(
+            keys=[self.QUEUE_KEY, self.PROCESSING_KEY],
+            args=[size, time.time() + self.lease_timeout],
+        )
+
+    async def ack(self, raw: bytes) -> None:
+        await self.redis.zrem(self.PROCESSING_KEY, raw)
+
+    async def dead_letter(self, raw: bytes) -> None:
+        """Manda a dead letters, tal cual, un mensaje que no se puede procesar."""
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zrem(self.PROCESSING_KEY, raw)
+            pipe.lpush(self.DEAD_LETTER_KEY, raw)
+            await pipe.execute()
+
+    async def retry(self, raw: bytes, error: Optional[str] = None) -> bool:
+        """Programa un reintento; regresa True si el mensaje terminó en dead letters."""
+        message = orjson.loads(raw)
+        message["attempts"] += 1
+        message["last_error"] = error
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zrem(self.PROCESSING_KEY, raw)
+            is_dead = message["attempts"] >= self.max_attempts
+            if is_dead:
+                pipe.lpush(self.DEAD_LETTER_KEY, orjson.dumps(message))
+            else:
+                backoff = min(
+                    self.base_backoff * 2 ** (message["attempts"] - 1),
+                    self.max_backoff,
+                )
+                pipe.zadd(
+                    self.RETRY_KEY, {orjson.dumps(message): time.time() + backoff}
+                )
+            await pipe.execute()
+        return is_dead
+
+    async def promote_due_retries(self, limit: int = 100) -> int:
+        return await self._promote_retries(
+            keys=[self.RETRY_KEY, self.QUEUE_KEY], args=[time.time(), limit]
+        )
+
+    async def recover_expired(self, limit: int = 100) -> int:
+        """Devuelve a la cola lo que un worker caído dejó sin confirmar."""
+        return await self._recover_expired(
+            keys=[self.PROCESSING_KEY, self.QUEUE_KEY], args=[time.time(), limit]
+        )
+
+    async def size(self) -> int:
+        return await self.redis.llen(self.QUEUE_KEY)
+
+
+email_outbox = EmailOutbox(
+    redis=redis_client,
+    max_attempts=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+    base_backoff=settings.EMAIL_OUTBOX_BASE_BACKOFF,
+    max_backoff=settings.EMAIL_OUTBOX_MAX_BACKOFF,
+    lease_timeout=settings.EMAIL_OUTBOX_LEASE_TIMEOUT,
+)
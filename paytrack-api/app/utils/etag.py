@@ -0,0 +1,19 @@
+import base64
+import hashlib
+from typing import Optional
+
+
+def strong_etag(*parts) -> str:
+    """ETag fuerte a partir de los valores que determinan la representación."""
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode()).digest()
+    return '"' + base64.urlsafe_b64encode(digest[:16]).rstrip(b"=").decode() + '"'
+
+
+def if_none_match(header: Optional[str], etag: str) -> bool:
+    """True si el header If-None-Match incluye el ETag (comparación débil, RFC 9110)."""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    tag = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == tag for candidate in header.split(","))
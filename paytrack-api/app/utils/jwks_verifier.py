@@ -0,0 +1,118 @@
+"""
+Verificación local de JWT de PayTrack para otros servicios.
+
+    verifier = JWKSVerifier("https://api.paytrack.dev/.well-known/jwks.json")
+    claims = verifier.verify(token)
+
+Las llaves se parsean una vez y se cachean por `kid` durante el max-age que
+anuncia el endpoint. Un `kid` desconocido (llave recién rotada) fuerza una
+recarga, como mucho cada `min_refresh_interval` segundos. Si la recarga
+falla se siguen usando las llaves conocidas. Este módulo solo depende de
+PyJWT (con cryptography): puede copiarse tal cual a otro servicio.
+
+Los refresh tokens se firman con las mismas llaves, así que `verify` los
+rechaza salvo con `allow_refresh=True`, igual que Oauth2AccessTokenBearer.
+"""
+import re
+import json
+import time
+import logging
+import threading
+import urllib.request
+from typing import Callable, Optional
+
+import jwt
+
+logger = logging.getLogger(__name__)
+
+MAX_AGE = re.compile(r"max-age=(\d+)")
+
+JWKSFetcher = Callable[[], tuple[dict, Optional[int]]]
+
+
+def http_fetcher(url: str, timeout: float = 5.0) -> JWKSFetcher:
+    def fetch() -> tuple[dict, Optional[int]]:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            match = MAX_AGE.search(response.headers.get("Cache-Control", ""))
+            return json.load(response), int(match.group(1)) if match else None
+
+    return fetch
+
+
+class JWKSVerifier:
+    def __init__(
+        self,
+        jwks_url: Optional[str] = None,
+        fetch: Optional[JWKSFetcher] = None,
+        algorithms: tuple[str, ...] = ("EdDSA", "ES256"),
+        default_max_age: int = 3600,
+        min_refresh_interval: float = 30.0,
+    ):
+        if fetch is None:
+            if jwks_url is None:
+                raise ValueError("jwks_url or fetch is required")
+            fetch = http_fetcher(jwks_url)
+        self.fetch = fetch
+        self.algorithms = algorithms
+        self.default_max_age = default_max_age
+        self.min_refresh_interval = min_refresh_interval
+
+        self._keys: dict[str, jwt.PyJWK] = {}
+        self._expires_at = 0.0
+        self._last_refresh = float("-inf")
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_jwks(cls, jwks: dict, **kwargs) -> "JWKSVerifier":
+        return cls(fetch=lambda: (jwks, None), **kwargs)
+
+    def _refresh(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_refresh < self.min_refresh_interval and now < self._expires_at:
+                return
+            self._last_refresh = now
+            try:
+                jwks, max_age = self.fetch()
+            except Exception as e:
+                if not self._keys:
+                    raise
+                logger.warning("JWKS refresh failed, keeping %d cached keys: %r", len(self._keys), e)
+                return
+
+            keys = {}
+            for data in jwks.get("keys", []):
+                try:
+                    key = jwt.PyJWK(data)
+                except jwt.PyJWKError as e:
+                    logger.warning("Skipping JWK %s: %s", data.get("kid"), e)
+                    continue
+                if key.key_id and key.algorithm_name in self.algorithms:
+                    keys[key.key_id] = key
+            self._keys = keys
+            self._expires_at = now + (max_age if max_age is not None else self.default_max_age)
+
+    def get_key(self, kid: str) -> jwt.PyJWK:
+        now = time.monotonic()
+        if now >= self._expires_at:
+            self._refresh()
+
+        key = self._keys.get(kid)
+        if key is None and now - self._last_refresh >= self.min_refresh_interval:
+            self._refresh()
+            key = self._keys.get(kid)
+        if key is None:
+            raise jwt.InvalidTokenError(f"Unknown signing key: {kid}")
+        return key
+
+    def verify(self, token: str, allow_refresh: bool = False, **options) -> dict:
+        """Regresa los claims o lanza jwt.InvalidTokenError."""
+        kid = jwt.get_unverified_header(token).get("kid")
+        if not kid:
+            raise jwt.InvalidTokenError("Token has no kid")
+        key = self.get_key(kid)
+        # El algoritmo sale de la llave, nunca del header del token
+        claims = jwt.decode(token, key.key, algorithms=[key.algorithm_name], **options)
+        if claims.get("refresh") and not allow_refresh:
+            raise jwt.InvalidTokenError("Refresh tokens are not accepted")
+        return claims
@@ -0,0 +1,115 @@
+"""
+Llaves asimétricas para firmar JWT (EdDSA con Ed25519 o ES256 con P-256).
+
+Cada archivo `<kid>.pem` de JWT_KEYS_DIR es una llave privada; JWT_ACTIVE_KID
+elige con cuál se firma y todas sirven para verificar. Las llaves públicas se
+publican en /.well-known/jwks.json.
+
+Rotación:
+1. Agregar la llave nueva al directorio y reiniciar: se publica pero no firma.
+2. Tras al menos JWKS_CACHE_MAX_AGE, cambiar JWT_ACTIVE_KID a la nueva.
+3. Cuando expire el último token firmado con la anterior (REFRESH_TOKEN_TTL),
+   borrar su archivo.
+
+    python -m app.utils.jwt_keys generate --dir keys --kid 2026-10 [--alg ES256]
+"""
+import os
+import argparse
+from typing import Optional
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from jwt.algorithms import ECAlgorithm, OKPAlgorithm
+
+ALGORITHMS = ("EdDSA", "ES256")
+
+
+def key_algorithm(private_key) -> str:
+    if isinstance(private_key, ed25519.Ed25519PrivateKey):
+        return "EdDSA"
+    if isinstance(private_key, ec.EllipticCurvePrivateKey) and isinstance(
+        private_key.curve, ec.SECP256R1
+    ):
+        return "ES256"
+    raise ValueError(f"Unsupported JWT signing key type: {type(private_key).__name__}")
+
+
+def generate_private_key(algorithm: str):
+    if algorithm == "EdDSA":
+        return ed25519.Ed25519PrivateKey.generate()
+    if algorithm == "ES256":
+        return ec.generate_private_key(ec.SECP256R1())
+    raise ValueError(f"Unsupported algorithm: {algorithm}")
+
+
+class JWTKey:
+    def __init__(self, kid: str, private_key):
+        self.kid = kid
+        self.private_key = private_key
+        self.public_key = private_key.public_key()
+        self.algorithm = key_algorithm(private_key)
+
+    def jwk(self) -> dict:
+        encoder = OKPAlgorithm if self.algorithm == "EdDSA" else ECAlgorithm
+        return {
+            **encoder.to_jwk(self.public_key, as_dict=True),
+            "kid": self.kid,
+            "alg": self.algorithm,
+            "use": "sig",
+        }
+
+
+class JWTKeyRing:
+    def __init__(self, keys: list[JWTKey], active_kid: str):
+        self.keys = {key.kid: key for key in keys}
+        if active_kid not in self.keys:
+            raise ValueError(f"JWT_ACTIVE_KID {active_kid!r} not found among {sorted(self.keys)}")
+        self.active = self.keys[active_kid]
+
+    @classmethod
+    def from_directory(cls, path: str, active_kid: str) -> "JWTKeyRing":
+        keys = []
+        for filename in sorted(os.listdir(path)):
+            if not filename.endswith(".pem"):
+                continue
+            with open(os.path.join(path, filename), "rb") as f:
+                private_key = serialization.load_pem_private_key(f.read(), password=None)
+            keys.append(JWTKey(filename[: -len(".pem")], private_key))
+        return cls(keys, active_kid)
+
+    def verification_key(self, kid: str) -> Optional[JWTKey]:
+        return self.keys.get(kid)
+
+    def jwks(self) -> dict:
+        return {"keys": [key.jwk() for key in self.keys.values()]}
+
+
+def write_private_key(path: str, kid: str, algorithm: str) -> str:
+    os.makedirs(path, exist_ok=True)
+    filename = os.path.join(path, f"{kid}.pem")
+    pem = generate_private_key(algorithm).private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+    # El archivo se crea con permisos 0600 desde el inicio
+    fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(pem)
+    return filename
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Genera llaves para firmar JWT")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    generate = subparsers.add_parser("generate")
+    generate.add_argument("--dir", required=True)
+    generate.add_argument("--kid", required=True)
+    generate.add_argument("--alg", choices=ALGORITHMS, default="EdDSA")
+    args = parser.parse_args()
+
+    print(write_private_key(args.dir, args.kid, args.alg))
+
+
+if __name__ == "__main__":
+    main()
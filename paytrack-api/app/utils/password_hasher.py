@@ -0,0 +1,63 @@
+import os
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from app.core.settings import settings
+from app.core.http_response import PayTrackHttpResponse
+from app.core.metrics import BCRYPT_HASH_TIME, BCRYPT_VERIFY_TIME
+from app.utils.security import get_password_hash, verify_password
+
+R = TypeVar("R")
+
+
+class PasswordHasher:
+    """
+    Ejecuta bcrypt en un pool de procesos para no bloquear el event loop.
+    Si hay demasiadas operaciones en cola responde 503 de inmediato en lugar
+    de acumular latencia.
+    """
+
+    def __init__(
+        self, max_workers: Optional[int] = None, max_pending: Optional[int] = None
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.max_workers * 4
+        self.pending = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    async def _run(self, func: Callable[..., R], *args) -> R:
+        # El contador solo se toca desde el event loop, no necesita lock
+        if self.pending >= self.max_pending:
+            PayTrackHttpResponse.service_unavailable(retry_after=1)
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self.pending -= 1
+
+    async def hash(self, password: str) -> str:
+        with BCRYPT_HASH_TIME.time():
+            return await self._run(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        with BCRYPT_VERIFY_TIME.time():
+            return await self._run(verify_password, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
@@ -0,0 +1,177 @@
+import time
+import asyncio
+import hashlib
+import logging
+from uuid import UUID
+from typing import Iterable, Optional
+
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlmodel import select
+
+from app.models.users.user_qr_code_model import UserQRCodeModel
+
+logger = logging.getLogger(__name__)
+
+NIL_UUID = UUID(int=0)
+
+
+class QRCodeFilter:
+    """
+    Conjunto compacto (digests de 64 bits) de los `qr_code_string` vivos, por worker.
+
+    Un código que no está en el conjunto se rechaza sin tocar Postgres; uno que
+    sí está se confirma en la base. Nunca debe faltar un código vivo (sería un
+    rechazo en el punto de pago); sobrar alguno solo cuesta una consulta.
+
+    Se carga completo desde la base y se mantiene al día por un canal de Redis:
+
+    - Las altas se anuncian con `announce` antes del commit. Si el anuncio
+      falla, la emisión se aborta y el código nunca queda vivo sin que los
+      demás workers lo conozcan.
+    - Las bajas se publican con `publish_removed` después del commit; si se
+      pierden solo queda un código de más hasta la siguiente recarga.
+    - Una recarga reemplaza el conjunto con la base, pero conserva las altas
+      recibidas en los últimos `pending_ttl` segundos: su transacción pudo no
+      haber terminado cuando se leyó la base.
+
+    Pub/sub no guarda mensajes: se suscribe antes de cargar (lo publicado
+    durante la carga se aplica después), recarga todo en cada reconexión y
+    cada `reload_interval`, y sin suscripción `ready` es False y la
+    validación debe ir directo a la base.
+    """
+
+    CHANNEL = "paytrack:qr_codes:changes"
+
+    def __init__(
+        self,
+        redis: Optional[Redis] = None,
+        batch_size: int = 5000,
+        reload_interval: float = 60.0,
+        pending_ttl: float = 60.0,
+    ):
+        self.redis = redis
+        self.batch_size = batch_size
+        self.reload_interval = reload_interval
+        self.pending_ttl = pending_ttl
+        self.ready = False
+
+        self._digests: set[int] = set()
+        # digest -> time.monotonic() de su alta
+        self._recent_adds: dict[int, float] = {}
+
+    @staticmethod
+    def digest(qr_code_string: str) -> int:
+        return int.from_bytes(
+            hashlib.blake2b(qr_code_string.encode(), digest_size=8).digest(), "big"
+        )
+
+    def _add_digest(self, digest: int) -> None:
+        self._digests.add(digest)
+        self._recent_adds[digest] = time.monotonic()
+
+    def _discard_digest(self, digest: int) -> None:
+        self._digests.discard(digest)
+        self._recent_adds.pop(digest, None)
+
+    def add(self, qr_code_string: str) -> None:
+        self._add_digest(self.digest(qr_code_string))
+
+    def discard(self, qr_code_string: str) -> None:
+        self._discard_digest(self.digest(qr_code_string))
+
+    def might_contain(self, qr_code_string: str) -> bool:
+        return self.digest(qr_code_string) in self._digests
+
+    def __len__(self) -> int:
+        return len(self._digests)
+
+    async def announce(self, added: Iterable[str]) -> None:
+        """
+        Agrega códigos que aún no se confirman en la base y los anuncia a los
+        demás workers. Va antes del commit: si falla, el llamador debe abortar.
+        """
+        changes = []
+        for qr_code_string in added:
+            self.add(qr_code_string)
+            changes.append(f"+{self.digest(qr_code_string):016x}")
+        if self.redis is not None and changes:
+            await self.redis.publish(self.CHANNEL, " ".join(changes))
+
+    async def publish_removed(self, removed: Iterable[str]) -> None:
+        """Quita códigos ya revocados en la base y lo anuncia a los demás workers."""
+        changes = []
+        for qr_code_string in removed:
+            self.discard(qr_code_string)
+            changes.append(f"-{self.digest(qr_code_string):016x}")
+
+        if self.redis is None or not changes:
+            return
+        try:
+            await self.redis.publish(self.CHANNEL, " ".join(changes))
+        except Exception as e:
+            # Un código de más no rechaza a nadie; la siguiente recarga lo quita
+            logger.error("QR code filter publish failed: %r", e)
+
+    def apply(self, message: bytes | str) -> None:
+        if isinstance(message, bytes):
+            message = message.decode()
+        for change in message.split():
+            digest = int(change[1:], 16)
+            if change[0] == "+":
+                self._add_digest(digest)
+            else:
+                self._discard_digest(digest)
+
+    async def reload(self, session_maker: async_sessionmaker) -> int:
+        """Reemplaza el conjunto con los QR vivos de la base; regresa cuántos son."""
+        started_at = time.monotonic()
+        digests: set[int] = set()
+        cursor = NIL_UUID
+        async with session_maker() as session:
+            while True:
+                statement = (
+                    select(UserQRCodeModel.qr_code_string, UserQRCodeModel.qr_code_id)
+                    .where(UserQRCodeModel.is_alive, UserQRCodeModel.qr_code_id > cursor)
+                    .order_by(UserQRCodeModel.qr_code_id)
+                    .limit(self.batch_size)
+                )
+                rows = (await session.exec(statement)).all()
+                for qr_code_string, qr_code_id in rows:
+                    digests.add(self.digest(qr_code_string))
+                    cursor = qr_code_id
+                if len(rows) < self.batch_size:
+                    break
+
+        # Altas anunciadas antes de terminar la lectura, quizá sin commit todavía
+        # cuando se leyó su página; las que llegaron durante la lectura también
+        self._recent_adds = {
+            digest: added_at
+            for digest, added_at in self._recent_adds.items()
+            if added_at > started_at - self.pending_ttl
+        }
+        self._digests = digests | self._recent_adds.keys()
+        return len(self._digests)
+
+    async def run_forever(self, session_maker: async_sessionmaker, retry_after: float = 1.0) -> None:
+        while True:
+            try:
+                async with self.redis.pubsub() as pubsub:
+                    await pubsub.subscribe(self.CHANNEL)
+                    await self.reload(session_maker)
+                    self.ready = True
+                    next_reload = time.monotonic() + self.reload_interval
+
+                    while True:
+                        message = await pubsub.get_message(
+                            ignore_subscribe_messages=True, timeout=1.0
+                        )
+                        if message is not None:
+                            self.apply(message["data"])
+                        if time.monotonic() >= next_reload:
+                            await self.reload(session_maker)
+                            next_reload = time.monotonic() + self.reload_interval
+            except Exception as e:
+                self.ready = False
+                logger.error("QR code filter sync failed: %r", e)
+            await asyncio.sleep(retry_after)
@@ -0,0 +1,115 @@
+"""
+Payloads de QR firmados y verificables sin base de datos.
+
+Formato: `PT2.` + base64url(version | user_id | qr_code_id | expires_at | firma)
+
+- version: 1 byte
+- user_id, qr_code_id: 16 bytes cada uno (UUID)
+- expires_at: epoch en segundos, uint32 big-endian
+- firma: Ed25519 de los 37 bytes anteriores (64 bytes)
+
+La API firma con la llave privada (QR_SIGNING_KEY_FILE); los escáneres solo
+reciben la pública (GET /qr-codes/signing-key), así que pueden verificar
+pero no emitir. Este módulo no depende de la app: un escáner puede copiarlo
+y verificar con `QRPayloadVerifier` y su lista de revocación local.
+
+    python -m app.utils.jwt_keys generate --dir keys --kid qr  # llave Ed25519
+"""
+import time
+import base64
+import struct
+from uuid import UUID
+from dataclasses import dataclass
+from typing import Container, Optional
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519
+
+PREFIX = "PT2."
+VERSION = 2
+SIGNATURE_SIZE = 64
+_BODY = struct.Struct(">B16s16sI")
+
+
+class InvalidQRPayload(ValueError):
+    """El payload está malformado, la firma no coincide, expiró o fue revocado."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+@dataclass(frozen=True)
+class QRPayload:
+    user_id: UUID
+    qr_code_id: UUID
+    expires_at: int
+
+
+def load_private_key(pem: bytes) -> ed25519.Ed25519PrivateKey:
+    private_key = serialization.load_pem_private_key(pem, password=None)
+    if not isinstance(private_key, ed25519.Ed25519PrivateKey):
+        raise ValueError("QR signing key must be an Ed25519 private key")
+    return private_key
+
+
+def load_public_key(raw: bytes) -> ed25519.Ed25519PublicKey:
+    """Llave pública a partir de sus 32 bytes (el `x` del JWK, decodificado)."""
+    return ed25519.Ed25519PublicKey.from_public_bytes(raw)
+
+
+class QRPayloadVerifier:
+    def __init__(self, public_key: ed25519.Ed25519PublicKey):
+        self.public_key = public_key
+
+    def verify(
+        self,
+        token: str,
+        revoked: Container[UUID] = (),
+        now: Optional[float] = None,
+    ) -> QRPayload:
+        if not token.startswith(PREFIX):
+            raise InvalidQRPayload("malformed")
+
+        encoded = token[len(PREFIX):]
+        try:
+            raw = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+        except ValueError:
+            raise InvalidQRPayload("malformed")
+
+        if len(raw) != _BODY.size + SIGNATURE_SIZE:
+            raise InvalidQRPayload("malformed")
+
+        body, signature = raw[: _BODY.size], raw[_BODY.size:]
+        try:
+            self.public_key.verify(signature, body)
+        except InvalidSignature:
+            raise InvalidQRPayload("bad_signature")
+
+        version, user_id, qr_code_id, expires_at = _BODY.unpack(body)
+        if version != VERSION:
+            raise InvalidQRPayload("unsupported_version")
+
+        if expires_at <= (now if now is not None else time.time()):
+            raise InvalidQRPayload("expired")
+
+        payload = QRPayload(
+            user_id=UUID(bytes=user_id),
+            qr_code_id=UUID(bytes=qr_code_id),
+            expires_at=expires_at,
+        )
+        if payload.qr_code_id in revoked:
+            raise InvalidQRPayload("revoked")
+        return payload
+
+
+class QRPayloadSigner(QRPayloadVerifier):
+    def __init__(self, private_key: ed25519.Ed25519PrivateKey):
+        super().__init__(private_key.public_key())
+        self.private_key = private_key
+
+    def sign(self, user_id: UUID, qr_code_id: UUID, expires_at: int) -> str:
+        body = _BODY.pack(VERSION, user_id.bytes, qr_code_id.bytes, expires_at)
+        raw = body + self.private_key.sign(body)
+        return PREFIX + base64.urlsafe_b64encode(raw).decode().rstrip("=")
@@ -0,0 +1,187 @@
+import time
+from abc import ABC, abstractmethod
+from enum import Enum
+from uuid import UUID, uuid4
+from typing import Optional
+
+from redis.asyncio import Redis
+
+from app.core.redis import redis_client
+from app.core.settings import settings
+
+
+class RefreshTokenResult(Enum):
+    VALID = "VALID"
+    UNKNOWN = "UNKNOWN"
+    REUSED = "REUSED"
+
+
+class RefreshTokenStore(ABC):
+    """
+    Registro de refresh tokens para rotación.
+
+    Cada refresh token lleva un `jti` y el id de su familia (la cadena de
+    rotaciones desde un login). Rotar consume el token y registra su sucesor
+    en la misma familia en una sola operación atómica; presentar uno ya
+    consumido significa que alguien más lo tiene, así que se revoca toda la
+    familia. Una familia revocada no puede volver a recibir tokens. Las
+    llaves expiran junto con los tokens.
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+
+    @abstractmethod
+    async def issue(self, user_id: UUID) -> tuple[str, str]:
+        """Registra el primer token de una familia nueva y regresa (jti, family_id)."""
+
+    @abstractmethod
+    async def rotate(
+        self, user_id: UUID, jti: str, family_id: str
+    ) -> tuple[RefreshTokenResult, Optional[str]]:
+        """
+        Consume el token y, si era válido, registra su sucesor en la familia.
+        Regresa el resultado y el jti del sucesor (None si no es VALID); si el
+        token ya se había usado revoca la familia.
+        """
+
+    @abstractmethod
+    async def revoke_user(self, user_id: UUID) -> None:
+        """Revoca todas las familias del usuario (p. ej. al cambiar la contraseña)."""
+
+
+# KEYS: jti actual, familia, jti sucesor, familias del usuario; ARGV: ttl
+# 0 = desconocido/expirado o familia revocada, 1 = válido (rotado), 2 = reutilizado
+ROTATE_SCRIPT = """
+if redis.call('EXISTS', KEYS[2]) == 0 then
+    return 0
+end
+local state = redis.call('GET', KEYS[1])
+if not state then
+    return 0
+end
+if state == 'used' then
+    redis.call('DEL', KEYS[2])
+    return 2
+end
+redis.call('SET', KEYS[1], 'used', 'KEEPTTL')
+redis.call('SET', KEYS[3], 'active', 'EX', ARGV[1])
+redis.call('EXPIRE', KEYS[2], ARGV[1])
+redis.call('EXPIRE', KEYS[4], ARGV[1])
+return 1
+"""
+
+_SCRIPT_RESULTS = {
+    0: RefreshTokenResult.UNKNOWN,
+    1: RefreshTokenResult.VALID,
+    2: RefreshTokenResult.REUSED,
+}
+
+
+class RedisRefreshTokenStore(RefreshTokenStore):
+    """
+    jti -> "active"/"used" y familia -> user_id con TTL nativo, más un set
+    de familias por usuario. rotate es un solo round trip (script Lua).
+    """
+
+    KEY_PREFIX = "paytrack:rt"
+
+    def __init__(self, redis: Redis, **kwargs):
+        super().__init__(**kwargs)
+        self.redis = redis
+        self._rotate = redis.register_script(ROTATE_SCRIPT)
+
+    def jti_key(self, jti: str) -> str:
+        return f"{self.KEY_PREFIX}:jti:{jti}"
+
+    def family_key(self, family_id: str) -> str:
+        return f"{self.KEY_PREFIX}:family:{family_id}"
+
+    def user_key(self, user_id: UUID) -> str:
+        return f"{self.KEY_PREFIX}:user:{user_id}"
+
+    async def issue(self, user_id: UUID) -> tuple[str, str]:
+        jti = uuid4().hex
+        family_id = uuid4().hex
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.set(self.jti_key(jti), "active", ex=self.ttl)
+            pipe.set(self.family_key(family_id), str(user_id), ex=self.ttl)
+            pipe.sadd(self.user_key(user_id), family_id)
+            pipe.expire(self.user_key(user_id), self.ttl)
+            await pipe.execute()
+        return jti, family_id
+
+    async def rotate(
+        self, user_id: UUID, jti: str, family_id: str
+    ) -> tuple[RefreshTokenResult, Optional[str]]:
+        next_jti = uuid4().hex
+        result = _SCRIPT_RESULTS[int(await self._rotate(
+            keys=[
+                self.jti_key(jti),
+                self.family_key(family_id),
+                self.jti_key(next_jti),
+                self.user_key(user_id),
+            ],
+            args=[self.ttl],
+        ))]
+        return result, next_jti if result == RefreshTokenResult.VALID else None
+
+    async def revoke_user(self, user_id: UUID) -> None:
+        user_key = self.user_key(user_id)
+        families = await self.redis.smembers(user_key)
+        keys = [self.family_key(f.decode() if isinstance(f, bytes) else f) for f in families]
+        await self.redis.delete(user_key, *keys)
+
+
+class LocalRefreshTokenStore(RefreshTokenStore):
+    """
+    Stand-in en memoria del proceso para pruebas sin Redis; no sirve con
+    varios workers. Los métodos no ceden el loop, así que rotate es atómico.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.tokens: dict[str, tuple[str, float]] = {}
+        self.families: dict[str, tuple[UUID, float]] = {}
+        self.user_families: dict[UUID, set[str]] = {}
+
+    async def issue(self, user_id: UUID) -> tuple[str, str]:
+        jti = uuid4().hex
+        family_id = uuid4().hex
+        expires_at = time.time() + self.ttl
+        self.tokens[jti] = ("active", expires_at)
+        self.families[family_id] = (user_id, expires_at)
+        self.user_families.setdefault(user_id, set()).add(family_id)
+        return jti, family_id
+
+    async def rotate(
+        self, user_id: UUID, jti: str, family_id: str
+    ) -> tuple[RefreshTokenResult, Optional[str]]:
+        now = time.time()
+        family = self.families.get(family_id)
+        token = self.tokens.get(jti)
+        if family is None or family[1] <= now or token is None or token[1] <= now:
+            return RefreshTokenResult.UNKNOWN, None
+        if token[0] == "used":
+            del self.families[family_id]
+            return RefreshTokenResult.REUSED, None
+        self.tokens[jti] = ("used", token[1])
+
+        next_jti = uuid4().hex
+        expires_at = now + self.ttl
+        self.tokens[next_jti] = ("active", expires_at)
+        self.families[family_id] = (family[0], expires_at)
+        return RefreshTokenResult.VALID, next_jti
+
+    async def revoke_user(self, user_id: UUID) -> None:
+        for family_id in self.user_families.pop(user_id, set()):
+            self.families.pop(family_id, None)
+
+
+def build_refresh_token_store() -> RefreshTokenStore:
+    if settings.REFRESH_TOKEN_BACKEND == "memory":
+        return LocalRefreshTokenStore(ttl=settings.REFRESH_TOKEN_TTL)
+    return RedisRefreshTokenStore(redis_client, ttl=settings.REFRESH_TOKEN_TTL)
+
+
+refresh_token_store = build_refresh_token_store()
@@ -1,32 +1,65 @@
 import jwt
 import time
+import orjson
 import logging
 from uuid import UUID
+from functools import cache
 from datetime import datetime, timezone, timedelta
 
-from typing import Optional
-from passlib.context import CryptContext
+from typing import TYPE_CHECKING, Optional
 
+from app.core.metrics import JWT_DECODE_TIME
 from app.core.settings import settings
 
-from app.models.users.user_model import UserModel
 from app.constants.user_constants import UserRoles
 
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+    from app.models.users.user_model import UserModel
+    from app.utils.jwt_keys import JWTKeyRing
+
 ACCESS_TOKEN_EXPIRY = 3600
 
-password_context = CryptContext(schemes=["bcrypt"])
+
+@cache
+def key_ring() -> Optional["JWTKeyRing"]:
+    """Llaves de firma asimétricas, o None si se firma con JWT_SECRET_KEY."""
+    if not settings.JWT_KEYS_DIR:
+        return None
+    from app.utils.jwt_keys import JWTKeyRing
+
+    return JWTKeyRing.from_directory(settings.JWT_KEYS_DIR, settings.JWT_ACTIVE_KID)
+
+
+@cache
+def password_context() -> "CryptContext":
+    # passlib/bcrypt solo se cargan donde se hashea (los procesos del PasswordHasher)
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"])
+
+
+@cache
+def jwks_document() -> bytes:
+    """JWKS público ya serializado; con HMAC no se publica ninguna llave."""
+    keys = key_ring()
+    return orjson.dumps(keys.jwks() if keys is not None else {"keys": []})
 
 
 def get_password_hash(password: str) -> str:
-    return password_context.hash(password)
+    return password_context().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return password_context.verify(plain_password, hashed_password)
+    return password_context().verify(plain_password, hashed_password)
 
 
 def create_access_token(
-    user_data: dict, expires_delta: timedelta = None, refresh_token: bool = False
+    user_data: dict,
+    expires_delta: timedelta = None,
+    refresh_token: bool = False,
+    jti: Optional[str] = None,
+    family_id: Optional[str] = None,
 ) -> str:
     payload = {
         "sub": user_data["id"],
@@ -42,6 +75,17 @@ def create_access_token(
         "iat": int(time.time()),
         "refresh": refresh_token,
     }
+    if jti is not None:
+        payload["jti"] = jti
+        payload["fam"] = family_id
+    keys = key_ring()
+    if keys is not None:
+        return jwt.encode(
+            payload=payload,
+            key=keys.active.private_key,
+            algorithm=keys.active.algorithm,
+            headers={"kid": keys.active.kid},
+        )
     token = jwt.encode(
         payload=payload, key=settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM
     )
@@ -50,9 +94,21 @@ def create_access_token(
 
 def decode_token(token: str) -> Optional[dict]:
     try:
-        token_data = jwt.decode(
-            jwt=token, key=settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
-        )
+        with JWT_DECODE_TIME.time():
+            keys = key_ring()
+            kid = jwt.get_unverified_header(token).get("kid") if keys is not None else None
+            if kid is not None:
+                key = keys.verification_key(kid)
+                if key is None:
+                    raise jwt.InvalidKeyError(f"Unknown signing key: {kid}")
+                # El algoritmo sale de la llave, nunca del header del token
+                return jwt.decode(jwt=token, key=key.public_key, algorithms=[key.algorithm])
+            if keys is not None and not settings.JWT_ACCEPT_LEGACY_HMAC:
+                raise jwt.InvalidTokenError("Token has no kid")
+
+            token_data = jwt.decode(
+                jwt=token, key=settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
+            )
         return token_data
 
     except jwt.PyJWTError as e:
@@ -61,8 +117,10 @@ def decode_token(token: str) -> Optional[dict]:
 
 
 def get_user_token(
-    user: UserModel,
+    user: "UserModel",
     is_refresh: bool = False,
+    jti: Optional[str] = None,
+    family_id: Optional[str] = None,
 ) -> str:
     # Validar que el rol del usuario esté en UserRoles
     if user.role not in [role.value for role in UserRoles]:
@@ -75,6 +133,8 @@ def get_user_token(
     }
     return create_access_token(
         user_data=user_data,
-        expires_delta=timedelta(days=2) if is_refresh else timedelta(hours=1),
+        expires_delta=timedelta(seconds=settings.REFRESH_TOKEN_TTL) if is_refresh else timedelta(hours=1),
         refresh_token=is_refresh,
+        jti=jti,
+        family_id=family_id,
     )
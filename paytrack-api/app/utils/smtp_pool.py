@@ -0,0 +1,132 @@
+import time
+import asyncio
+from dataclasses import dataclass, field
+from email.message import Message
+from typing import Optional
+
+import aiosmtplib
+
+from app.core.metrics import SMTP_SEND_TIME
+from app.core.settings import settings
+
+
+@dataclass
+class _PooledConnection:
+    client: aiosmtplib.SMTP
+    created_at: float = field(default_factory=time.monotonic)
+    last_used_at: float = field(default_factory=time.monotonic)
+    messages_sent: int = 0
+
+
+class SMTPConnectionPool:
+    """
+    Pool de conexiones SMTP autenticadas y reutilizables.
+
+    Cada conexión hace EHLO + STARTTLS + LOGIN una sola vez; después cada
+    correo cuesta un intercambio MAIL/RCPT/DATA. Las conexiones se reciclan
+    al superar `max_messages` o `idle_timeout` y se validan con NOOP antes
+    de reutilizarse. Con `start_tls=False` y sin credenciales sirve contra un
+    servidor SMTP local de pruebas (p. ej. `aiosmtpd`).
+    """
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        start_tls: bool = True,
+        max_size: int = 4,
+        max_messages: int = 100,
+        idle_timeout: float = 60.0,
+        timeout: float = 10.0,
+    ):
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.password = password
+        self.start_tls = start_tls
+        self.max_size = max_size
+        self.max_messages = max_messages
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+
+        self._idle: list[_PooledConnection] = []
+        self._slots = asyncio.Semaphore(max_size)
+
+    async def _connect(self) -> _PooledConnection:
+        client = aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            start_tls=self.start_tls,
+            timeout=self.timeout,
+        )
+        await client.connect()
+        if self.username and self.password:
+            await client.login(self.username, self.password)
+        return _PooledConnection(client=client)
+
+    async def _close(self, conn: _PooledConnection) -> None:
+        try:
+            await conn.client.quit()
+        except Exception:
+            conn.client.close()
+
+    def _is_expired(self, conn: _PooledConnection) -> bool:
+        return (
+            conn.messages_sent >= self.max_messages
+            or time.monotonic() - conn.last_used_at > self.idle_timeout
+        )
+
+    async def _is_healthy(self, conn: _PooledConnection) -> bool:
+        if not conn.client.is_connected:
+            return False
+        try:
+            await conn.client.noop()
+            return True
+        except aiosmtplib.SMTPException:
+            return False
+
+    async def _acquire(self) -> _PooledConnection:
+        while self._idle:
+            conn = self._idle.pop()
+            if not self._is_expired(conn) and await self._is_healthy(conn):
+                return conn
+            await self._close(conn)
+        return await self._connect()
+
+    async def _release(self, conn: _PooledConnection) -> None:
+        conn.messages_sent += 1
+        conn.last_used_at = time.monotonic()
+        if conn.messages_sent >= self.max_messages:
+            await self._close(conn)
+        else:
+            self._idle.append(conn)
+
+    async def send_message(self, message: Message) -> None:
+        async with self._slots:
+            conn = await self._acquire()
+            try:
+                with SMTP_SEND_TIME.time():
+                    await conn.client.send_message(message)
+            except Exception:
+                # La conexión puede haber quedado en un estado inconsistente
+                await self._close(conn)
+                raise
+            await self._release(conn)
+
+    async def close(self) -> None:
+        while self._idle:
+            await self._close(self._idle.pop())
+
+
+smtp_pool = SMTPConnectionPool(
+    hostname=settings.SMTP_SERVER,
+    port=settings.SMTP_PORT,
+    username=settings.SMTP_USERNAME,
+    password=settings.SMTP_PASSWORD,
+    start_tls=settings.SMTP_START_TLS,
+    max_size=settings.SMTP_POOL_SIZE,
+    max_messages=settings.SMTP_MAX_MESSAGES_PER_CONNECTION,
+    idle_timeout=settings.SMTP_IDLE_TIMEOUT,
+)
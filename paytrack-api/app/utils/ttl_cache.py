@@ -0,0 +1,116 @@
+import time
+import asyncio
+from collections import OrderedDict
+from typing import Awaitable, Callable, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# Resultado del future compartido cuando se cancela la corrutina que cargaba
+_RETRY = object()
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Cache LRU en memoria con expiración por entrada.
+
+    `get_or_load` coalesce las cargas concurrentes de una misma llave: solo la
+    primera corrutina ejecuta el loader y las demás esperan su resultado. Los
+    errores del loader se propagan a todos los que esperaban y no se cachean.
+    Si la que cargaba se cancela (p. ej. el cliente cortó la conexión) las
+    demás no se cancelan: una de ellas vuelve a ejecutar el loader.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 60.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._inflight: dict[K, asyncio.Future] = {}
+
+    def get(self, key: K) -> Optional[V]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V, expires_at: Optional[float] = None) -> None:
+        """`expires_at` es un timestamp epoch; nunca se excede el TTL del cache."""
+        max_expires_at = time.time() + self.ttl
+        if expires_at is None or expires_at > max_expires_at:
+            expires_at = max_expires_at
+
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: K) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def get_or_load(
+        self,
+        key: K,
+        loader: Callable[[], Awaitable[tuple[V, Optional[float]]]],
+    ) -> V:
+        """`loader` regresa `(valor, expires_at)`."""
+        while True:
+            value = self.get(key)
+            if value is not None:
+                self.hits += 1
+                return value
+
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                return await self._load(key, loader)
+
+            self.coalesced += 1
+            value = await asyncio.shield(inflight)
+            if value is not _RETRY:
+                return value
+
+    async def _load(
+        self,
+        key: K,
+        loader: Callable[[], Awaitable[tuple[V, Optional[float]]]],
+    ) -> V:
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value, expires_at = await loader()
+        except asyncio.CancelledError:
+            future.set_result(_RETRY)
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Evita el warning de "exception was never retrieved" sin esperas
+            future.exception()
+            raise
+        else:
+            self.set(key, value, expires_at)
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "size": len(self._entries),
+        }
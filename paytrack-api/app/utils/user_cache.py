@@ -0,0 +1,183 @@
+import time
+import logging
+from uuid import UUID
+from typing import NamedTuple, Optional, Protocol
+
+import orjson
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.redis import redis_client
+from app.core.settings import settings
+from app.models.users.user_model import UserModel
+from app.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class UserCacheBackend(Protocol):
+    async def get(self, key: str) -> Optional[bytes]: ...
+
+    async def set(self, key: str, value: bytes, ttl: float, only_if_absent: bool = False) -> None: ...
+
+    async def delete(self, *keys: str) -> None: ...
+
+
+class RedisUserCacheBackend:
+    def __init__(self, redis: Redis):
+        self.redis = redis
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.redis.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float, only_if_absent: bool = False) -> None:
+        await self.redis.set(key, value, px=int(ttl * 1000), nx=only_if_absent)
+
+    async def delete(self, *keys: str) -> None:
+        await self.redis.delete(*keys)
+
+
+class LocalUserCacheBackend:
+    """Backend en memoria del proceso: fallback cuando Redis no responde y stand-in para pruebas."""
+
+    def __init__(self, max_size: int = 10000, ttl: float = 30.0):
+        self.cache: TTLCache[str, bytes] = TTLCache(max_size=max_size, ttl=ttl)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self.cache.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float, only_if_absent: bool = False) -> None:
+        if only_if_absent and self.cache.get(key) is not None:
+            return
+        self.cache.set(key, value, expires_at=time.time() + ttl)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.cache.invalidate(key)
+
+
+# Valor de una llave recién invalidada (ver UserCache.invalidate)
+PINNED = b""
+
+
+class CacheLookup(NamedTuple):
+    user: Optional[UserModel]
+    pinned: bool = False
+
+
+class UserCache:
+    """
+    Cache compartido de usuarios indexado por email y por user_id.
+
+    Los registros se serializan con orjson y se guardan bajo ambas llaves. Si
+    el backend principal falla se usa el local durante `retry_after` segundos
+    antes de volver a intentar con Redis. Los `UserModel` que regresa no están
+    ligados a ninguna sesión: no deben modificarse y persistirse directamente.
+
+    El hash de la contraseña nunca se guarda: los usuarios del cache traen
+    `password` vacío y la verificación lo lee de la base
+    (UserService.get_password_hash).
+
+    Invalidar no borra las llaves: las deja "fijadas" durante `pin_ttl`
+    segundos (el atraso máximo de una réplica). Mientras tanto los lookups
+    regresan `pinned=True` y el usuario debe leerse del primario; los datos
+    leídos de una réplica se guardan con `only_if_absent` para no pisar una
+    invalidación con una fila atrasada.
+    """
+
+    EXCLUDED_FIELDS = {"password"}
+
+    KEY_PREFIX = "paytrack:user"
+
+    def __init__(
+        self,
+        primary: UserCacheBackend,
+        fallback: Optional[UserCacheBackend] = None,
+        ttl: float = 300.0,
+        pin_ttl: float = 10.0,
+        retry_after: float = 5.0,
+    ):
+        self.primary = primary
+        self.fallback = fallback or LocalUserCacheBackend()
+        self.ttl = ttl
+        self.pin_ttl = pin_ttl
+        self.retry_after = retry_after
+        self._primary_down_until = 0.0
+
+    @classmethod
+    def email_key(cls, email: str) -> str:
+        return f"{cls.KEY_PREFIX}:email:{email.lower()}"
+
+    @classmethod
+    def id_key(cls, user_id: UUID) -> str:
+        return f"{cls.KEY_PREFIX}:id:{user_id}"
+
+    def _backend(self) -> UserCacheBackend:
+        if time.monotonic() < self._primary_down_until:
+            return self.fallback
+        return self.primary
+
+    def _mark_primary_down(self, error: Exception) -> None:
+        logger.warning("User cache backend unavailable, using local fallback: %r", error)
+        self._primary_down_until = time.monotonic() + self.retry_after
+
+    async def _get(self, key: str) -> CacheLookup:
+        backend = self._backend()
+        try:
+            raw = await backend.get(key)
+        except (RedisError, OSError) as e:
+            self._mark_primary_down(e)
+            raw = await self.fallback.get(key)
+
+        if raw is None:
+            return CacheLookup(None)
+        if raw == PINNED:
+            return CacheLookup(None, pinned=True)
+        return CacheLookup(UserModel.model_validate({**orjson.loads(raw), "password": ""}))
+
+    async def lookup_by_email(self, email: str) -> CacheLookup:
+        return await self._get(self.email_key(email))
+
+    async def lookup_by_id(self, user_id: UUID) -> CacheLookup:
+        return await self._get(self.id_key(user_id))
+
+    async def set(self, user: UserModel, only_if_absent: bool = False) -> None:
+        raw = orjson.dumps(user.model_dump(mode="json", exclude=self.EXCLUDED_FIELDS))
+        keys = (self.email_key(user.email), self.id_key(user.user_id))
+        backend = self._backend()
+        try:
+            for key in keys:
+                await backend.set(key, raw, self.ttl, only_if_absent=only_if_absent)
+        except (RedisError, OSError) as e:
+            self._mark_primary_down(e)
+
+    async def invalidate(self, user_id: UUID, email: Optional[str] = None) -> None:
+        keys = [self.id_key(user_id)]
+        if email:
+            keys.append(self.email_key(email))
+
+        # Se invalida en ambos backends para no dejar copias locales obsoletas
+        for key in keys:
+            await self.fallback.set(key, PINNED, self.pin_ttl)
+        try:
+            for key in keys:
+                await self.primary.set(key, PINNED, self.pin_ttl)
+        except (RedisError, OSError) as e:
+            self._mark_primary_down(e)
+
+
+def build_user_cache() -> UserCache:
+    if settings.USER_CACHE_BACKEND == "memory":
+        primary = LocalUserCacheBackend(ttl=settings.USER_CACHE_TTL)
+    else:
+        primary = RedisUserCacheBackend(redis_client)
+
+    return UserCache(
+        primary=primary,
+        fallback=LocalUserCacheBackend(ttl=settings.USER_CACHE_LOCAL_TTL),
+        ttl=settings.USER_CACHE_TTL,
+        pin_ttl=settings.DB_REPLICA_MAX_LAG + settings.DB_REPLICA_HEALTH_INTERVAL,
+    )
+
+
+user_cache = build_user_cache()
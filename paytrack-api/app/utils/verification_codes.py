@@ -0,0 +1,244 @@
+import hmac
+import secrets
+from abc import ABC, abstractmethod
+from enum import Enum
+from uuid import UUID
+from datetime import timedelta
+from typing import Callable
+
+from redis.asyncio import Redis
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlmodel import select
+
+from app.core.base_model import utc_now
+from app.core.database import async_session_maker
+from app.core.redis import redis_client
+from app.core.settings import settings
+from app.core.http_response import PayTrackHttpResponse
+from app.constants.response_codes import PayTrackResponseCodes
+from app.constants.user_constants import VerificationModels
+from app.models.users.verification_code_model import VerificationCodeModel
+from app.models.users.verification_code_password_reset_model import (
+    VerificationCodePasswordResetModel,
+)
+
+
+class VerificationResult(Enum):
+    VALID = "VALID"
+    NOT_FOUND = "NOT_FOUND"
+    INVALID = "INVALID"
+    TOO_MANY_ATTEMPTS = "TOO_MANY_ATTEMPTS"
+
+
+def generate_code(length: int = 6) -> str:
+    return str(secrets.randbelow(10**length)).zfill(length)
+
+
+class VerificationCodeStore(ABC):
+    """
+    Almacén de códigos de verificación de vida corta por tipo (`VerificationModels`).
+
+    Cada usuario tiene a lo sumo un código vivo por tipo: emitir uno nuevo
+    reemplaza al anterior, y un código válido se consume en la misma operación
+    que lo verifica, así que solo puede usarse una vez.
+    """
+
+    def __init__(
+        self,
+        ttl: int = 900,
+        max_attempts: int = 5,
+        code_length: int = 6,
+        code_factory: Callable[[int], str] = generate_code,
+    ):
+        self.ttl = ttl
+        self.max_attempts = max_attempts
+        self.code_length = code_length
+        self.code_factory = code_factory
+
+    @abstractmethod
+    async def issue(self, model_type: VerificationModels, user_id: UUID) -> str:
+        """Genera, guarda y regresa un código nuevo."""
+
+    @abstractmethod
+    async def verify(
+        self, model_type: VerificationModels, user_id: UUID, code: str
+    ) -> VerificationResult:
+        """Verifica y consume el código de forma atómica."""
+
+    async def consume(
+        self, model_type: VerificationModels, user_id: UUID, code: str
+    ) -> None:
+        """Como `verify`, pero responde con el error HTTP correspondiente."""
+        result = await self.verify(model_type, user_id, code)
+
+        if result == VerificationResult.NOT_FOUND:
+            PayTrackHttpResponse.not_found(
+                data={"message": PayTrackResponseCodes.UNEXISTING_CODE.detail},
+                error_id=PayTrackResponseCodes.UNEXISTING_CODE.code,
+            )
+        if result == VerificationResult.INVALID:
+            PayTrackHttpResponse.bad_request(
+                data={"message": PayTrackResponseCodes.INVALID_CODE.detail},
+                error_id=PayTrackResponseCodes.INVALID_CODE.code,
+            )
+        if result == VerificationResult.TOO_MANY_ATTEMPTS:
+            PayTrackHttpResponse.forbidden(
+                data={"message": PayTrackResponseCodes.TOO_MANY_CODE_ATTEMPTS.detail},
+                error_id=PayTrackResponseCodes.TOO_MANY_CODE_ATTEMPTS.code,
+            )
+
+
+# 0 = no existe/expiró, 1 = válido (consumido), 2 = inválido, 3 = demasiados intentos.
+# La comparación recorre siempre todo el código: su tiempo no depende de
+# cuántos dígitos coinciden.
+VERIFY_SCRIPT = """
+local function same(a, b)
+    local acc = (#a - #b) * (#a - #b)
+    for i = 1, math.max(#a, #b) do
+        local d = (string.byte(a, i) or 0) - (string.byte(b, i) or 0)
+        acc = acc + d * d
+    end
+    return acc == 0
+end
+
+local stored = redis.call('HGET', KEYS[1], 'code')
+if not stored then
+    return 0
+end
+if same(stored, ARGV[1]) then
+    redis.call('DEL', KEYS[1])
+    return 1
+end
+local attempts = redis.call('HINCRBY', KEYS[1], 'attempts', 1)
+if attempts >= tonumber(ARGV[2]) then
+    redis.call('DEL', KEYS[1])
+    return 3
+end
+return 2
+"""
+
+_SCRIPT_RESULTS = {
+    0: VerificationResult.NOT_FOUND,
+    1: VerificationResult.VALID,
+    2: VerificationResult.INVALID,
+    3: VerificationResult.TOO_MANY_ATTEMPTS,
+}
+
+
+class RedisVerificationCodeStore(VerificationCodeStore):
+    """Códigos en hashes de Redis con TTL nativo; issue y verify son un round trip cada uno."""
+
+    KEY_PREFIX = "paytrack:vcode"
+
+    def __init__(self, redis: Redis, **kwargs):
+        super().__init__(**kwargs)
+        self.redis = redis
+        self._verify = redis.register_script(VERIFY_SCRIPT)
+
+    def key(self, model_type: VerificationModels, user_id: UUID) -> str:
+        return f"{self.KEY_PREFIX}:{model_type.value}:{user_id}"
+
+    async def issue(self, model_type: VerificationModels, user_id: UUID) -> str:
+        code = self.code_factory(self.code_length)
+        key = self.key(model_type, user_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            pipe.hset(key, mapping={"code": code, "attempts": 0})
+            pipe.expire(key, self.ttl)
+            await pipe.execute()
+        return code
+
+    async def verify(
+        self, model_type: VerificationModels, user_id: UUID, code: str
+    ) -> VerificationResult:
+        result = await self._verify(
+            keys=[self.key(model_type, user_id)], args=[code, self.max_attempts]
+        )
+        return _SCRIPT_RESULTS[int(result)]
+
+
+class SQLVerificationCodeStore(VerificationCodeStore):
+    """
+    Fallback sobre las tablas `verification_codes*`, con la misma semántica que
+    Redis: la expiración se evalúa con `created_at` y los intentos fallidos se
+    cuentan en `attempts`. El código se compara en Python (tiempo constante) y
+    la fila se actualiza solo si `attempts` sigue igual; si otra verificación
+    la cambió en medio se vuelve a leer, así un código se consume una vez.
+    """
+
+    MODELS = {
+        VerificationModels.VERIFICATION_CODE_MODEL: VerificationCodeModel,
+        VerificationModels.VERIFICATION_CODE_PASSWORD_RESET_MODEL: VerificationCodePasswordResetModel,
+    }
+
+    def __init__(self, session_maker: async_sessionmaker, **kwargs):
+        super().__init__(**kwargs)
+        self.session_maker = session_maker
+
+    async def issue(self, model_type: VerificationModels, user_id: UUID) -> str:
+        model = self.MODELS[model_type]
+        code = self.code_factory(self.code_length)
+        async with self.session_maker() as session:
+            await session.execute(
+                update(model)
+                .where(model.user_id == user_id, model.is_alive)
+                .values(is_alive=False, updated_at=utc_now())
+            )
+            session.add(model(user_id=user_id, code=code))
+            await session.commit()
+        return code
+
+    async def verify(
+        self, model_type: VerificationModels, user_id: UUID, code: str
+    ) -> VerificationResult:
+        model = self.MODELS[model_type]
+        async with self.session_maker() as session:
+            while True:
+                row = (
+                    await session.exec(
+                        select(model.verification_code_id, model.code, model.attempts).where(
+                            model.user_id == user_id,
+                            model.is_alive,
+                            model.created_at > utc_now() - timedelta(seconds=self.ttl),
+                        )
+                    )
+                ).first()
+                if row is None:
+                    return VerificationResult.NOT_FOUND
+
+                verification_code_id, stored, attempts = row
+                if hmac.compare_digest(stored.encode(), code.encode()):
+                    result, values = VerificationResult.VALID, {"is_alive": False}
+                elif attempts + 1 >= self.max_attempts:
+                    result = VerificationResult.TOO_MANY_ATTEMPTS
+                    values = {"is_alive": False, "attempts": attempts + 1}
+                else:
+                    result, values = VerificationResult.INVALID, {"attempts": attempts + 1}
+
+                updated = await session.execute(
+                    update(model)
+                    .where(
+                        model.verification_code_id == verification_code_id,
+                        model.is_alive,
+                        model.attempts == attempts,
+                    )
+                    .values(**values, updated_at=utc_now())
+                )
+                await session.commit()
+                if updated.rowcount == 1:
+                    return result
+
+
+def build_verification_code_store() -> VerificationCodeStore:
+    options = {
+        "ttl": settings.VERIFICATION_CODE_TTL,
+        "max_attempts": settings.VERIFICATION_CODE_MAX_ATTEMPTS,
+        "code_length": settings.VERIFICATION_CODE_LENGTH,
+    }
+    if settings.VERIFICATION_CODE_BACKEND == "sql":
+        return SQLVerificationCodeStore(async_session_maker, **options)
+    return RedisVerificationCodeStore(redis_client, **options)
+
+
+verification_code_store = build_verification_code_store()
@@ -0,0 +1,136 @@
+"""
+Worker del outbox de correos.
+
+    python -m app.workers.email_worker
+
+Reclama lotes de la cola de Redis, los entrega por el pool SMTP y reporta el
+throughput en mensajes/segundo.
+"""
+import time
+import signal
+import asyncio
+import logging
+
+import orjson
+
+from app.core.redis import redis_client
+from app.core.settings import settings
+from app.constants.email_constants import EmailKinds
+from app.utils.email import EmailService
+from app.utils.email_outbox import EmailOutbox, email_outbox
+from app.utils.smtp_pool import smtp_pool
+
+logger = logging.getLogger("paytrack.email_worker")
+
+
+class EmailOutboxWorker:
+    def __init__(
+        self,
+        outbox: EmailOutbox,
+        batch_size: int = 50,
+        poll_interval: float = 1.0,
+        report_interval: float = 10.0,
+    ):
+        self.outbox = outbox
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.report_interval = report_interval
+
+        self.sent = 0
+        self.failed = 0
+        self.dead = 0
+        self._stopping = asyncio.Event()
+
+    async def deliver(self, raw: bytes) -> None:
+        try:
+            message = orjson.loads(raw)
+            msg = EmailService.render(
+                kind=EmailKinds(message["kind"]),
+                to_name=message["to_name"],
+                to_email=message["to_email"],
+                verification_code=message["verification_code"],
+            )
+        except Exception as e:
+            # Un mensaje que no se puede leer no mejora con reintentos
+            self.failed += 1
+            self.dead += 1
+            await self.outbox.dead_letter(raw)
+            logger.error("Unreadable message moved to dead letters: %r", e)
+            return
+
+        try:
+            await smtp_pool.send_message(msg)
+        except Exception as e:
+            self.failed += 1
+            if await self.outbox.retry(raw, error=repr(e)):
+                self.dead += 1
+                logger.error("Message %s moved to dead letters: %r", message["id"], e)
+            return
+
+        await self.outbox.ack(raw)
+        self.sent += 1
+
+    async def process_batch(self) -> int:
+        await self.outbox.promote_due_retries(limit=self.batch_size)
+        recovered = await self.outbox.recover_expired(limit=self.batch_size)
+        if recovered:
+            logger.warning("Recovered %d messages with expired leases", recovered)
+        batch = await self.outbox.claim_batch(self.batch_size)
+        # La concurrencia real queda acotada por el tamaño del pool SMTP
+        await asyncio.gather(*(self.deliver(raw) for raw in batch))
+        return len(batch)
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def run(self) -> None:
+        started_at = last_report_at = time.monotonic()
+        sent_at_last_report = 0
+
+        while not self._stopping.is_set():
+            processed = await self.process_batch()
+
+            now = time.monotonic()
+            if now - last_report_at >= self.report_interval:
+                window_rate = (self.sent - sent_at_last_report) / (now - last_report_at)
+                total_rate = self.sent / (now - started_at)
+                logger.info(
+                    "sent=%d failed=%d dead=%d rate=%.1f msg/s avg=%.1f msg/s",
+                    self.sent, self.failed, self.dead, window_rate, total_rate,
+                )
+                last_report_at, sent_at_last_report = now, self.sent
+
+            if processed == 0:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+
+async def run_worker() -> None:
+    worker = EmailOutboxWorker(
+        outbox=email_outbox,
+        batch_size=settings.EMAIL_OUTBOX_BATCH_SIZE,
+        poll_interval=settings.EMAIL_OUTBOX_POLL_INTERVAL,
+    )
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+
+    try:
+        await worker.run()
+    finally:
+        await smtp_pool.close()
+        await redis_client.aclose()
+
+
+def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s"
+    )
+    asyncio.run(run_worker())
+
+
+if __name__ == "__main__":
+    main()
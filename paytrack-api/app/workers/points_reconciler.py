@@ -0,0 +1,104 @@
+"""
+Reconciliación de saldos de puntos contra el ledger.
+
+    python -m app.workers.points_reconciler [--once]
+
+Compara `users.points` con la suma de `points_ledger.delta` por usuario en
+una sola consulta (mismo snapshot) y reporta las diferencias. No corrige
+nada: un descuadre indica una escritura fuera del ledger y hay que revisarla.
+"""
+import asyncio
+import logging
+import argparse
+from uuid import UUID
+from dataclasses import dataclass
+
+from sqlalchemy import func
+from sqlmodel import select
+
+from app.core.database import async_session_maker, dispose_engine
+from app.core.settings import settings
+from app.models.points.points_ledger_model import PointsLedgerModel
+from app.models.users.user_model import UserModel
+
+logger = logging.getLogger("paytrack.points_reconciler")
+
+
+@dataclass
+class PointsMismatch:
+    user_id: UUID
+    balance: int
+    ledger_total: int
+
+
+class PointsReconciler:
+    def __init__(self, session_maker):
+        self.session_maker = session_maker
+        self.last_mismatches: list[PointsMismatch] = []
+
+    async def run_once(self) -> list[PointsMismatch]:
+        totals = (
+            select(
+                PointsLedgerModel.user_id,
+                func.sum(PointsLedgerModel.delta).label("total"),
+            )
+            .group_by(PointsLedgerModel.user_id)
+            .subquery()
+        )
+        ledger_total = func.coalesce(totals.c.total, 0)
+        statement = (
+            select(UserModel.user_id, UserModel.points, ledger_total)
+            .outerjoin(totals, totals.c.user_id == UserModel.user_id)
+            .where(UserModel.points != ledger_total)
+        )
+
+        async with self.session_maker() as session:
+            rows = (await session.exec(statement)).all()
+
+        mismatches = [
+            PointsMismatch(user_id=user_id, balance=balance, ledger_total=int(total))
+            for user_id, balance, total in rows
+        ]
+        for mismatch in mismatches:
+            logger.error(
+                "Points mismatch for %s: balance=%d ledger=%d",
+                mismatch.user_id, mismatch.balance, mismatch.ledger_total,
+            )
+        logger.info("Points reconciliation done, %d mismatches", len(mismatches))
+
+        self.last_mismatches = mismatches
+        return mismatches
+
+    async def run_forever(self, interval: float) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error("Points reconciliation failed: %r", e)
+            await asyncio.sleep(interval)
+
+
+async def run_reconciler(once: bool) -> int:
+    reconciler = PointsReconciler(async_session_maker)
+    try:
+        if once:
+            return 1 if await reconciler.run_once() else 0
+        await reconciler.run_forever(settings.POINTS_RECONCILE_INTERVAL)
+        return 0
+    finally:
+        await dispose_engine()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Reconcilia users.points con points_ledger")
+    parser.add_argument("--once", action="store_true", help="Una sola pasada; sale con 1 si hay descuadres")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s"
+    )
+    raise SystemExit(asyncio.run(run_reconciler(once=args.once)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""
+Reaper de códigos de verificación y QR muertos o expirados.
+
+    python -m app.workers.reaper [--once] [--force]
+
+También corre dentro de la API (lifespan) si REAPER_ENABLED=true. Cada pasada
+toma antes un lease en Redis que dura REAPER_INTERVAL, así con varios workers
+(y el CLI) corre a lo más una pasada por intervalo en todo el despliegue.
+Borra en lotes acotados por ctid, cada uno en su propia transacción corta y
+con `lock_timeout`, pausando entre lotes para no competir con el tráfico.
+Cada condición debe poder resolverse con un índice (ver
+scripts/explain_user_queries.py). Las filas borradas se exportan en
+`paytrack_reaper_rows_reclaimed_total{table, reason}`.
+"""
+import os
+import time
+import asyncio
+import logging
+import argparse
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Callable, Optional
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.base_model import utc_now
+from app.core.database import dispose_engine, get_engine
+from app.core.metrics import REAPER_ROWS_RECLAIMED
+from app.core.redis import redis_client
+from app.core.settings import settings
+
+logger = logging.getLogger("paytrack.reaper")
+
+
+@dataclass
+class ReaperTarget:
+    table: str
+    # Etiqueta de la métrica: "dead" o "expired"
+    reason: str
+    # Condición SQL con el parámetro :cutoff
+    condition: str
+    retention: Callable[[], timedelta]
+
+
+def _code_ttl() -> timedelta:
+    return timedelta(seconds=settings.VERIFICATION_CODE_TTL)
+
+
+def _qr_retention() -> timedelta:
+    return timedelta(seconds=settings.REAPER_QR_CODE_RETENTION)
+
+
+def default_targets() -> list[ReaperTarget]:
+    targets = []
+    for table in ("verification_codes", "verification_codes_password_reset"):
+        # Un OR no usa ningún índice: muertos (índice parcial) y expirados por separado
+        targets.append(
+            ReaperTarget(
+                table=table, reason="dead", condition="NOT is_alive", retention=_code_ttl
+            )
+        )
+        targets.append(
+            ReaperTarget(
+                table=table,
+                reason="expired",
+                condition="created_at < :cutoff",
+                retention=_code_ttl,
+            )
+        )
+    return [
+        *targets,
+        ReaperTarget(
+            table="user_qr_codes",
+            reason="dead",
+            condition="NOT is_alive AND updated_at < :cutoff",
+            retention=_qr_retention,
+        ),
+    ]
+
+
+class Reaper:
+    LEASE_KEY = "paytrack:reaper:lease"
+
+    def __init__(
+        self,
+        engine: Optional[AsyncEngine],
+        targets: list[ReaperTarget],
+        redis: Optional[Redis] = None,
+        lease: float = 3600.0,
+        batch_size: int = 1000,
+        batch_pause: float = 0.1,
+        max_batches: int = 100,
+        lock_timeout_ms: int = 2000,
+    ):
+        self.engine = engine
+        self.targets = targets
+        self.redis = redis
+        self.lease = lease
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+        self.max_batches = max_batches
+        self.lock_timeout_ms = lock_timeout_ms
+
+        self.last_run: dict[str, int] = {}
+        self.total_reclaimed: dict[str, int] = {}
+
+    @staticmethod
+    def delete_statement(target: ReaperTarget, dialect: str):
+        if dialect != "postgresql":
+            # SQLite (pruebas): rowid y sin bloqueos de fila
+            return text(
+                f"""
+                DELETE FROM {target.table}
+                WHERE rowid IN (
+                    SELECT rowid FROM {target.table}
+                    WHERE {target.condition}
+                    LIMIT :batch_size
+                )
+                """
+            )
+        return text(
+            f"""
+            DELETE FROM {target.table}
+            WHERE ctid IN (
+                SELECT ctid FROM {target.table}
+                WHERE {target.condition}
+                LIMIT :batch_size
+                FOR UPDATE SKIP LOCKED
+            )
+            """
+        )
+
+    async def _delete_batch(self, target: ReaperTarget) -> int:
+        # Sin engine propio usa el de la app, creado en el primer uso
+        engine = self.engine or get_engine()
+        statement = self.delete_statement(target, engine.dialect.name)
+        async with engine.begin() as conn:
+            if engine.dialect.name == "postgresql":
+                await conn.execute(text(f"SET LOCAL lock_timeout = {int(self.lock_timeout_ms)}"))
+            result = await conn.execute(
+                statement,
+                {"cutoff": utc_now() - target.retention(), "batch_size": self.batch_size},
+            )
+            return result.rowcount
+
+    async def reap(self, target: ReaperTarget) -> int:
+        reclaimed = 0
+        for _ in range(self.max_batches):
+            deleted = await self._delete_batch(target)
+            REAPER_ROWS_RECLAIMED.labels(target.table, target.reason).inc(deleted)
+            reclaimed += deleted
+            if deleted < self.batch_size:
+                break
+            await asyncio.sleep(self.batch_pause)
+        return reclaimed
+
+    async def acquire_lease(self) -> bool:
+        """Lease que no se libera al terminar: vence solo, una pasada por intervalo."""
+        if self.redis is None:
+            return True
+        try:
+            return bool(
+                await self.redis.set(
+                    self.LEASE_KEY, f"{os.getpid()}", nx=True, px=int(self.lease * 1000)
+                )
+            )
+        except (RedisError, OSError) as e:
+            logger.warning("Reaper lease unavailable, skipping run: %r", e)
+            return False
+
+    async def run_once(self, force: bool = False) -> dict[str, int]:
+        if not force and not await self.acquire_lease():
+            return {}
+
+        started_at = time.monotonic()
+        stats = {}
+        for target in self.targets:
+            try:
+                reclaimed = await self.reap(target)
+            except Exception as e:
+                logger.error("Reaper failed on %s (%s): %r", target.table, target.condition, e)
+                reclaimed = 0
+            stats[target.table] = stats.get(target.table, 0) + reclaimed
+
+        for table, reclaimed in stats.items():
+            self.total_reclaimed[table] = self.total_reclaimed.get(table, 0) + reclaimed
+        self.last_run = stats
+
+        logger.info(
+            "Reaped %s in %.2fs",
+            ", ".join(f"{table}={rows}" for table, rows in stats.items()),
+            time.monotonic() - started_at,
+        )
+        return stats
+
+    async def run_forever(self, interval: float) -> None:
+        while True:
+            await self.run_once()
+            await asyncio.sleep(interval)
+
+
+reaper = Reaper(
+    engine=None,
+    targets=default_targets(),
+    redis=redis_client,
+    lease=settings.REAPER_INTERVAL,
+    batch_size=settings.REAPER_BATCH_SIZE,
+    batch_pause=settings.REAPER_BATCH_PAUSE,
+    max_batches=settings.REAPER_MAX_BATCHES,
+)
+
+
+async def run_reaper(once: bool, force: bool) -> None:
+    try:
+        if once:
+            await reaper.run_once(force=force)
+        else:
+            await reaper.run_forever(settings.REAPER_INTERVAL)
+    finally:
+        await dispose_engine()
+        await redis_client.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Borra códigos muertos o expirados")
+    parser.add_argument("--once", action="store_true", help="Una sola pasada y salir")
+    parser.add_argument(
+        "--force", action="store_true", help="Con --once, correr aunque otro proceso tenga el lease"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s"
+    )
+    asyncio.run(run_reaper(once=args.once, force=args.force))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Tiempo de arranque en frío hasta la primera respuesta.
+
+    python -m benchmarks.bench_cold_start [--runs 5] [--path /]
+
+Lanza `uvicorn app.main:app` en un proceso nuevo, espera a que el puerto
+responda 200 en --path y reporta el tiempo desde el spawn. Incluye el import
+de app.main, el lifespan y la primera request.
+"""
+import sys
+import time
+import socket
+import argparse
+import statistics
+import subprocess
+import urllib.error
+import urllib.request
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def cold_start(path: str, timeout: float) -> float:
+    port = free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.005)
+        raise TimeoutError(f"No response from {path} after {timeout}s")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def import_time() -> float:
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "import app.main"], check=True, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--path", default="/")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+
+    imports = [import_time() for _ in range(args.runs)]
+    starts = [cold_start(args.path, args.timeout) for _ in range(args.runs)]
+    print(f"import app.main       median {statistics.median(imports) * 1000:>8.0f} ms  min {min(imports) * 1000:>8.0f} ms")
+    print(f"first response ({args.path})  median {statistics.median(starts) * 1000:>8.0f} ms  min {min(starts) * 1000:>8.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
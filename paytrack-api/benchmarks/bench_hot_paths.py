@@ -0,0 +1,157 @@
+"""
+Micro-benchmarks de las funciones que corren en cada request de auth.
+
+    python -m benchmarks.bench_hot_paths run [--save benchmarks/baselines/hot_paths.json]
+    python -m benchmarks.bench_hot_paths compare [--baseline ...] [--threshold 0.25]
+
+Cada caso se mide con timeit (autorange + varias repeticiones) y se guarda
+el mejor tiempo por operación, que es el menos sensible al ruido de la
+máquina. `compare` vuelve a correr la suite y termina con código 1 si algún
+caso es más lento que el baseline por encima del umbral. Los baselines
+dependen de la máquina: regenerarlos al cambiar de entorno.
+"""
+import sys
+import json
+import timeit
+import platform
+import argparse
+import subprocess
+from uuid import uuid4
+from datetime import date, datetime, timezone
+from typing import Callable
+
+from pydantic import BaseModel
+
+from app.core.http_response import PaginationType, PayTrackHttpResponse
+from app.core.mixins.password_validation_mixin import PasswordValidationMixin
+from app.api.auth.auth_schema import SignupSchema
+from app.models.users.user_model import UserModel, UserRole
+from app.utils.security import create_access_token, decode_token, get_user_token
+
+DEFAULT_BASELINE = "benchmarks/baselines/hot_paths.json"
+
+
+class PasswordFields(PasswordValidationMixin):
+    pass
+
+
+def build_cases(items: int) -> dict[str, Callable[[], object]]:
+    user = UserModel(
+        name="Benchmark",
+        last_name="User",
+        birth_date=date(2000, 1, 1),
+        email="bench@paytrack.dev",
+        password="x",
+        role=UserRole.customer,
+    )
+    user_data = {
+        "id": str(user.user_id),
+        "email": user.email,
+        "name": user.name,
+        "role": user.role,
+    }
+    token = create_access_token(user_data)
+    signup_payload = {
+        "name": "Benchmark",
+        "lastName": "User",
+        "email": "bench@paytrack.dev",
+        "password": "Secret123!",
+        "birthDate": "2000-01-01",
+    }
+    now = datetime.now(timezone.utc)
+    rows = [
+        {"userId": uuid4(), "email": f"user{i}@paytrack.dev", "points": i, "createdAt": now}
+        for i in range(items)
+    ]
+    pagination = PaginationType(count=items, currentPage=1, lastPage=1)
+
+    return {
+        "create_access_token": lambda: create_access_token(user_data),
+        "decode_token": lambda: decode_token(token),
+        "get_user_token": lambda: get_user_token(user),
+        "validate_password_fields": lambda: PasswordFields.validate_password_fields("Secret123!"),
+        "password_mixin_model": lambda: PasswordFields(
+            password="Secret123!", confirm_password="Secret123!"
+        ),
+        "signup_schema": lambda: SignupSchema.model_validate(signup_payload),
+        f"http_response_ok_{items}": lambda: PayTrackHttpResponse.ok(rows, pagination),
+    }
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run_suite(items: int, repeat: int) -> dict:
+    results = {}
+    for name, func in build_cases(items).items():
+        seconds = measure(func, repeat)
+        results[name] = {"ns_per_op": round(seconds * 1e9, 1)}
+        print(f"{name:<28} {seconds * 1e6:>12.2f} us/op")
+
+    try:
+        commit = subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    regressions = []
+    print(f"\n{'case':<28} {'baseline':>12} {'current':>12} {'change':>9}")
+    for name, result in current["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            print(f"{name:<28} {'-':>12} {result['ns_per_op']:>12.1f}       new")
+            continue
+        change = result["ns_per_op"] / previous["ns_per_op"] - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(
+            f"{name:<28} {previous['ns_per_op']:>12.1f} {result['ns_per_op']:>12.1f}"
+            f" {change:>+8.1%}{flag}"
+        )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("command", choices=["run", "compare"])
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--save", help="Guardar el resultado como baseline")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args()
+
+    current = run_suite(args.items, args.repeat)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(current, f, indent=2)
+            f.write("\n")
+        print(f"\nBaseline written to {args.save}")
+
+    if args.command == "compare":
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) slower than {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+        print("\nNo regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Micro-benchmark de PayTrackHttpResponse.ok con listas grandes.
+
+    python -m benchmarks.bench_http_response [--items 10000] [--repeat 20]
+
+Compara el camino anterior (jsonable_encoder + JSONResponse de la stdlib) con
+la respuesta orjson de sobre pre-codificado y reporta MB/s de cuerpo generado.
+"""
+import time
+import argparse
+from uuid import uuid4
+from datetime import datetime, timezone
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core.http_response import (
+    HttpResponseMessages,
+    HttpStatus,
+    PaginationType,
+    PayTrackHttpResponse,
+)
+
+
+def build_payload(items: int) -> list[dict]:
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "userId": uuid4(),
+            "name": f"User {i}",
+            "lastName": "Benchmark",
+            "email": f"user{i}@paytrack.dev",
+            "points": i * 1.5,
+            "isVerified": i % 2 == 0,
+            "createdAt": now,
+            "updatedAt": now,
+        }
+        for i in range(items)
+    ]
+
+
+def stdlib_ok(data: list, pagination: PaginationType) -> JSONResponse:
+    return JSONResponse(
+        status_code=HttpStatus.OK,
+        content={
+            "status": HttpStatus.OK,
+            "statusMessage": HttpResponseMessages.SUCCESS,
+            "data": jsonable_encoder(data),
+            "pagination": pagination.model_dump(),
+        },
+    )
+
+
+def measure(label: str, func, repeat: int) -> float:
+    body_size = len(func().body)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    elapsed = time.perf_counter() - started
+    rate = body_size * repeat / elapsed
+    print(
+        f"{label:<10} {body_size / 1024:>10.1f} KiB/resp "
+        f"{elapsed / repeat * 1000:>9.2f} ms/resp {rate / 1024 / 1024:>9.1f} MiB/s"
+    )
+    return rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    data = build_payload(args.items)
+    pagination = PaginationType(count=args.items, currentPage=1, lastPage=1)
+
+    before = measure("stdlib", lambda: stdlib_ok(data, pagination), args.repeat)
+    after = measure(
+        "orjson", lambda: PayTrackHttpResponse.ok(data, pagination), args.repeat
+    )
+    print(f"speedup    {after / before:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
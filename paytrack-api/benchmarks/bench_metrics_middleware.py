@@ -0,0 +1,58 @@
+"""
+Overhead por request de PrometheusMiddleware.
+
+    python -m benchmarks.bench_metrics_middleware [--requests 200000]
+
+Llama directo a una app ASGI mínima (sin servidor ni routing) con y sin el
+middleware; la diferencia por request es el costo de la instrumentación.
+"""
+import time
+import asyncio
+import argparse
+
+from app.core.metrics import PrometheusMiddleware
+
+
+class FakeRoute:
+    path = "/users/{user_id}"
+
+
+async def endpoint(scope, receive, send):
+    scope["route"] = FakeRoute
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def receive():
+    return {"type": "http.request", "body": b""}
+
+
+async def send(message):
+    pass
+
+
+async def measure(app, requests: int) -> float:
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app({"type": "http", "method": "GET", "path": "/users/1"}, receive, send)
+    return (time.perf_counter() - started) / requests
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200000)
+    args = parser.parse_args()
+
+    instrumented = PrometheusMiddleware(endpoint)
+    # Calentar los hijos de labels() cacheados
+    await measure(instrumented, 1000)
+
+    bare = min([await measure(endpoint, args.requests) for _ in range(3)])
+    with_metrics = min([await measure(instrumented, args.requests) for _ in range(3)])
+    print(f"bare       {bare * 1e6:>8.2f} us/req")
+    print(f"metrics    {with_metrics * 1e6:>8.2f} us/req")
+    print(f"overhead   {(with_metrics - bare) * 1e6:>8.2f} us/req")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
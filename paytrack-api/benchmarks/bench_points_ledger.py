@@ -0,0 +1,94 @@
+"""
+Benchmark de créditos concurrentes a un solo usuario "caliente".
+
+    python -m benchmarks.bench_points_ledger [--credits 5000] [--concurrency 200]
+
+Requiere una base Postgres migrada en DATABASE_URL. Crea un usuario de
+prueba y compara créditos/segundo de `PointsService.credit` (una
+transacción por crédito) contra `PointsCreditBatcher`, y verifica al final
+que el saldo coincide con el ledger.
+"""
+import time
+import asyncio
+import argparse
+from uuid import uuid4
+from datetime import date
+
+from sqlalchemy import delete
+from sqlmodel import select
+
+from app.core.database import async_session_maker, dispose_engine
+from app.api.points.points_service import PointsCreditBatcher, PointsService
+from app.models.points.points_ledger_model import PointsLedgerModel
+from app.models.users.user_model import UserModel
+
+
+async def create_user() -> UserModel:
+    async with async_session_maker() as session:
+        user = UserModel(
+            name="Bench",
+            last_name="Points",
+            birth_date=date(2000, 1, 1),
+            email=f"bench-{uuid4()}@paytrack.dev",
+            password="!",
+        )
+        session.add(user)
+        await session.commit()
+        return user
+
+
+async def drop_user(user: UserModel) -> None:
+    async with async_session_maker() as session:
+        await session.exec(
+            delete(PointsLedgerModel).where(PointsLedgerModel.user_id == user.user_id)
+        )
+        await session.exec(delete(UserModel).where(UserModel.user_id == user.user_id))
+        await session.commit()
+
+
+async def run(label: str, credit, credits: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            await credit(f"bench:{label}:{uuid4()}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(credits)))
+    elapsed = time.perf_counter() - started
+    print(f"{label:<8} {credits / elapsed:>10,.0f} credits/s ({elapsed:.2f}s)")
+
+
+async def main(credits: int, concurrency: int) -> None:
+    user = await create_user()
+    batcher = PointsCreditBatcher(async_session_maker)
+
+    async def direct(key: str) -> None:
+        async with async_session_maker() as session:
+            await PointsService.credit(user.user_id, 1, key, "bench", session)
+
+    async def batched(key: str) -> None:
+        await batcher.credit(user.user_id, 1, key, "bench")
+
+    try:
+        await run("direct", direct, credits, concurrency)
+        await run("batched", batched, credits, concurrency)
+
+        async with async_session_maker() as session:
+            balance = (
+                await session.exec(
+                    select(UserModel.points).where(UserModel.user_id == user.user_id)
+                )
+            ).one()
+        print(f"balance={balance} expected={credits * 2}")
+    finally:
+        await drop_user(user)
+        await dispose_engine()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--credits", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.credits, args.concurrency))
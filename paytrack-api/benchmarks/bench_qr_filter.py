@@ -0,0 +1,46 @@
+"""
+Benchmark del camino de validación de QR contra el filtro en memoria.
+
+    python -m benchmarks.bench_qr_filter [--live 100000] [--scans 1000000]
+
+Reporta escaneos/segundo para códigos desconocidos (se rechazan sin tocar
+Postgres) y para códigos vivos (pasan el filtro y se confirmarían en la base).
+"""
+import time
+import secrets
+import argparse
+
+from app.utils.qr_code_filter import QRCodeFilter
+
+
+def measure(label: str, qr_code_filter: QRCodeFilter, codes: list[str]) -> None:
+    started = time.perf_counter()
+    hits = sum(1 for code in codes if qr_code_filter.might_contain(code))
+    elapsed = time.perf_counter() - started
+    print(
+        f"{label:<8} {len(codes) / elapsed:>12,.0f} scans/s "
+        f"{elapsed / len(codes) * 1e9:>8.0f} ns/scan  passed={hits}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--live", type=int, default=100_000)
+    parser.add_argument("--scans", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    qr_code_filter = QRCodeFilter()
+    live = [secrets.token_urlsafe(24) for _ in range(args.live)]
+    for code in live:
+        qr_code_filter.add(code)
+
+    unknown = [secrets.token_urlsafe(24) for _ in range(args.scans)]
+    known = [live[i % len(live)] for i in range(args.scans)]
+
+    print(f"live codes: {len(qr_code_filter):,}")
+    measure("unknown", qr_code_filter, unknown)
+    measure("live", qr_code_filter, known)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+Prueba de carga de la API de autenticación con un driver asyncio + httpx.
+
+    # Contra un servidor ya levantado (misma DATABASE_URL que el servidor)
+    python -m benchmarks.load_test --base-url http://localhost:8000
+
+    # En proceso (ASGI), p. ej. con SQLite: DATABASE_URL=sqlite:///./load.db
+    python -m benchmarks.load_test --create-tables
+
+Escenarios, en orden:
+1. POST /auth/signup con usuarios nuevos.
+2. Los usuarios se marcan verificados directo en la base (no hay endpoint).
+3. POST /auth/signin con esos usuarios.
+4. GET autenticado (por defecto /users/me: valida el token y carga al
+   usuario; `--auth-path` cambia la ruta).
+
+Los correos van al outbox de Redis, así que el camino HTTP no necesita SMTP;
+para el worker puede usarse `python -m aiosmtpd -n -l localhost:1025` con
+SMTP_START_TLS=false. Conviene correr con RATE_LIMIT_ENABLED=false; los 503
+en signup/signin vienen del límite PASSWORD_HASH_MAX_PENDING del hasher.
+
+Escribe throughput y p50/p95/p99 por ruta en un JSON (`--output`) junto
+con el commit actual; `--compare` imprime la diferencia contra otra corrida.
+"""
+import json
+import time
+import asyncio
+import argparse
+import subprocess
+from uuid import UUID, uuid4
+from collections import Counter
+from typing import Awaitable, Callable, Optional
+
+import httpx
+
+from app.api.users.user_service import UserService
+
+PASSWORD = "LoadTest1!"
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class RouteStats:
+    def __init__(self):
+        self.latencies: list[float] = []
+        self.statuses: Counter = Counter()
+        self.errors = 0
+        self.elapsed = 0.0
+
+    def summary(self) -> dict:
+        latencies = sorted(self.latencies)
+        requests = len(latencies)
+        return {
+            "requests": requests,
+            "errors": self.errors,
+            "throughput_rps": round(requests / self.elapsed, 2) if self.elapsed else 0.0,
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+            "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+            "max_ms": round((latencies[-1] if latencies else 0) * 1000, 3),
+            "status_counts": {str(k): v for k, v in sorted(self.statuses.items())},
+        }
+
+
+async def run_phase(
+    stats: RouteStats,
+    count: int,
+    concurrency: int,
+    request: Callable[[int], Awaitable[httpx.Response]],
+) -> list[Optional[httpx.Response]]:
+    semaphore = asyncio.Semaphore(concurrency)
+    responses: list[Optional[httpx.Response]] = [None] * count
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await request(i)
+            except httpx.HTTPError:
+                stats.errors += 1
+                return
+            stats.latencies.append(time.perf_counter() - started)
+            stats.statuses[response.status_code] += 1
+            if response.status_code >= 400:
+                stats.errors += 1
+            responses[i] = response
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(count)))
+    stats.elapsed = time.perf_counter() - started
+    return responses
+
+
+async def verify_users(user_ids: list[str]) -> None:
+    from app.core.database import async_session_maker
+
+    async with async_session_maker() as session:
+        for user_id in user_ids:
+            await UserService.verify_user(UUID(user_id), session)
+
+
+async def create_tables() -> None:
+    from sqlmodel import SQLModel
+
+    import app.models.users  # noqa: F401
+    import app.models.points  # noqa: F401
+    from app.core.database import get_engine
+
+    async with get_engine().begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+
+def build_client(base_url: Optional[str], timeout: float) -> httpx.AsyncClient:
+    if base_url:
+        return httpx.AsyncClient(base_url=base_url, timeout=timeout)
+
+    from app.main import app
+
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://loadtest", timeout=timeout
+    )
+
+
+async def main(args) -> dict:
+    if args.create_tables:
+        await create_tables()
+
+    run_id = uuid4().hex[:8]
+    routes = {
+        "POST /auth/signup": RouteStats(),
+        "POST /auth/signin": RouteStats(),
+        f"GET {args.auth_path}": RouteStats(),
+    }
+    signup, signin, authenticated = routes.values()
+
+    async with build_client(args.base_url, args.timeout) as client:
+        emails = [f"load-{run_id}-{i}@paytrack.dev" for i in range(args.users)]
+        responses = await run_phase(
+            signup,
+            args.users,
+            args.concurrency,
+            lambda i: client.post(
+                "/auth/signup",
+                json={
+                    "name": "Load",
+                    "lastName": "Test",
+                    "email": emails[i],
+                    "password": PASSWORD,
+                    "birthDate": "2000-01-01",
+                },
+            ),
+        )
+        created = [
+            (emails[i], r.json()["user_id"])
+            for i, r in enumerate(responses)
+            if r is not None and r.status_code == 200
+        ]
+        if not created:
+            raise SystemExit("No successful signups; check the server logs")
+        await verify_users([user_id for _, user_id in created])
+
+        responses = await run_phase(
+            signin,
+            args.signins,
+            args.concurrency,
+            lambda i: client.post(
+                "/auth/signin",
+                json={"email": created[i % len(created)][0], "password": PASSWORD},
+            ),
+        )
+        tokens = [r.json()["access_token"] for r in responses if r is not None and r.status_code == 200]
+        if not tokens:
+            raise SystemExit("No successful signins; check the server logs")
+
+        await run_phase(
+            authenticated,
+            args.authenticated,
+            args.concurrency,
+            lambda i: client.get(
+                args.auth_path,
+                headers={"Authorization": f"Bearer {tokens[i % len(tokens)]}"},
+            ),
+        )
+
+    try:
+        commit = subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "target": args.base_url or "in-process",
+        "config": {
+            "users": args.users,
+            "signins": args.signins,
+            "authenticated": args.authenticated,
+            "concurrency": args.concurrency,
+        },
+        "routes": {route: stats.summary() for route, stats in routes.items()},
+    }
+
+
+def print_report(report: dict, baseline: Optional[dict]) -> None:
+    print(f"{'route':<32}{'rps':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'errors':>8}")
+    for route, summary in report["routes"].items():
+        line = (
+            f"{route:<32}{summary['throughput_rps']:>10.1f}{summary['p50_ms']:>10.2f}"
+            f"{summary['p95_ms']:>10.2f}{summary['p99_ms']:>10.2f}{summary['errors']:>8}"
+        )
+        previous = (baseline or {}).get("routes", {}).get(route)
+        if previous and previous["p95_ms"]:
+            change = (summary["p95_ms"] - previous["p95_ms"]) / previous["p95_ms"] * 100
+            line += f"   p95 {change:+.1f}% vs {baseline.get('commit')}"
+        print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", help="Servidor a probar; si se omite corre en proceso")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--signins", type=int, default=200)
+    parser.add_argument("--authenticated", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--auth-path", default="/users/me")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--create-tables", action="store_true")
+    parser.add_argument("--output", default="load_test_results.json")
+    parser.add_argument("--compare", help="JSON de una corrida anterior")
+    args = parser.parse_args()
+
+    report = asyncio.run(main(args))
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print_report(report, baseline)
+    print(f"\nResults written to {args.output}")
@@ -0,0 +1,54 @@
+"""
+Entry point de producción: `gunicorn app.main:app -c gunicorn.conf.py`.
+
+Los workers salen de Settings.WORKERS (WEB_CONCURRENCY o núcleos) y cada uno
+dimensiona su pool con Settings.DB_POOL_LIMITS, así el total de conexiones
+no supera DB_CONNECTION_BUDGET menos lo reservado a procesos auxiliares
+(DB_AUX_CONNECTIONS).
+"""
+import os
+import shutil
+
+from app.core.settings import settings
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = settings.WORKERS
+worker_class = "uvicorn.workers.UvicornWorker"
+# Los workers deben calcular el mismo reparto del pool que el master
+os.environ["WEB_CONCURRENCY"] = str(workers)
+
+# Sin preload: cada worker crea su propio engine y event loop después del fork
+preload_app = False
+timeout = 60
+graceful_timeout = 30
+keepalive = 5
+max_requests = 10000
+max_requests_jitter = 1000
+accesslog = "-"
+
+
+def on_starting(server):
+    web_budget = settings.DB_WEB_CONNECTION_BUDGET
+    if workers > web_budget:
+        raise RuntimeError(
+            f"{workers} workers need at least one DB connection each, but only "
+            f"{web_budget} of DB_CONNECTION_BUDGET={settings.DB_CONNECTION_BUDGET} "
+            f"remain after DB_AUX_CONNECTIONS={settings.DB_AUX_CONNECTIONS}"
+        )
+
+    pool_size, max_overflow = settings.DB_POOL_LIMITS
+    server.log.info(
+        "Starting %d workers, DB pool %d + %d overflow per worker (web budget %d of %d)",
+        workers, pool_size, max_overflow, web_budget, settings.DB_CONNECTION_BUDGET,
+    )
+    multiproc_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if multiproc_dir:
+        shutil.rmtree(multiproc_dir, ignore_errors=True)
+        os.makedirs(multiproc_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -15,6 +15,7 @@ from app.models.users.user_model import UserModel
 from app.models.users.user_qr_code_model import UserQRCodeModel
 from app.models.users.verification_code_model import VerificationCodeModel
 from app.models.users.verification_code_password_reset_model import VerificationCodePasswordResetModel
+from app.models.points.points_ledger_model import PointsLedgerModel
 # Importa los modelos de catálogo
 from app.models.catalog.product_model import ProductModel
 from app.models.catalog.product_category_model import ProductCategoryModel
@@ -0,0 +1,70 @@
+"""points ledger
+
+Revision ID: 55eb56b84a11
+Revises: b319d6c8309a
+Create Date: 2026-10-18 13:02:47.550931
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '55eb56b84a11'
+down_revision: Union[str, Sequence[str], None] = 'b319d6c8309a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Debe coincidir con app.constants.user_constants.POINTS_MINOR_UNITS
+POINTS_MINOR_UNITS = 100
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('points_ledger',
+    sa.Column('ledger_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('delta', sa.BigInteger(), nullable=False),
+    sa.Column('idempotency_key', sqlmodel.sql.sqltypes.AutoString(length=128), nullable=False),
+    sa.Column('reason', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ),
+    sa.PrimaryKeyConstraint('ledger_id'),
+    sa.UniqueConstraint('idempotency_key')
+    )
+    op.create_index('ix_points_ledger_user_id_created_at', 'points_ledger', ['user_id', 'created_at'], unique=False)
+
+    op.alter_column(
+        'users', 'points',
+        existing_type=sa.Float(),
+        type_=sa.BigInteger(),
+        existing_nullable=False,
+        postgresql_using=f'round(points * {POINTS_MINOR_UNITS})::bigint',
+    )
+
+    # Saldo de apertura para que el ledger cuadre con users.points
+    op.execute(
+        """
+        INSERT INTO points_ledger (ledger_id, user_id, delta, idempotency_key, reason, created_at)
+        SELECT gen_random_uuid(), user_id, points, 'opening_balance:' || user_id, 'opening_balance', now() AT TIME ZONE 'utc'
+        FROM users
+        WHERE points <> 0
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column(
+        'users', 'points',
+        existing_type=sa.BigInteger(),
+        type_=sa.Float(),
+        existing_nullable=False,
+        postgresql_using=f'points::double precision / {POINTS_MINOR_UNITS}',
+    )
+    op.drop_index('ix_points_ledger_user_id_created_at', table_name='points_ledger')
+    op.drop_table('points_ledger')
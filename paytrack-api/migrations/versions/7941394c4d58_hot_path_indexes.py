@@ -0,0 +1,54 @@
+"""hot path indexes
+
+Revision ID: 7941394c4d58
+Revises: 710f35a70e2e
+Create Date: 2026-10-18 10:12:31.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7941394c4d58'
+down_revision: Union[str, Sequence[str], None] = '710f35a70e2e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE/DROP INDEX CONCURRENTLY no puede ejecutarse dentro de una transacción
+    with op.get_context().autocommit_block():
+        # users: unicidad sin distinguir mayúsculas y la llave de paginación keyset
+        op.create_index('ix_users_email_lower', 'users', [sa.text('lower(email)')], unique=True, postgresql_concurrently=True)
+        op.drop_index('ix_users_email', table_name='users', postgresql_concurrently=True)
+        op.create_index('ix_users_created_at_user_id', 'users', ['created_at', 'user_id'], unique=False, postgresql_concurrently=True)
+
+        # Índices redundantes: la primary key ya está indexada
+        op.drop_index('ix_user_qr_codes_qr_code_id', table_name='user_qr_codes', postgresql_concurrently=True)
+        op.drop_index('ix_verification_codes_verification_code_id', table_name='verification_codes', postgresql_concurrently=True)
+        op.drop_index('ix_verification_codes_password_reset_verification_code_id', table_name='verification_codes_password_reset', postgresql_concurrently=True)
+
+        # Llaves foráneas y búsquedas de códigos vivos
+        op.create_index('ix_user_qr_codes_user_id_alive', 'user_qr_codes', ['user_id'], unique=False, postgresql_where=sa.text('is_alive'), postgresql_concurrently=True)
+        op.create_index('ix_verification_codes_user_id_code_alive', 'verification_codes', ['user_id', 'code'], unique=False, postgresql_where=sa.text('is_alive'), postgresql_concurrently=True)
+        op.create_index('ix_verification_codes_password_reset_user_id_code_alive', 'verification_codes_password_reset', ['user_id', 'code'], unique=False, postgresql_where=sa.text('is_alive'), postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_verification_codes_password_reset_user_id_code_alive', table_name='verification_codes_password_reset', postgresql_concurrently=True)
+        op.drop_index('ix_verification_codes_user_id_code_alive', table_name='verification_codes', postgresql_concurrently=True)
+        op.drop_index('ix_user_qr_codes_user_id_alive', table_name='user_qr_codes', postgresql_concurrently=True)
+
+        op.create_index('ix_verification_codes_password_reset_verification_code_id', 'verification_codes_password_reset', ['verification_code_id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_verification_codes_verification_code_id', 'verification_codes', ['verification_code_id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_user_qr_codes_qr_code_id', 'user_qr_codes', ['qr_code_id'], unique=False, postgresql_concurrently=True)
+
+        op.drop_index('ix_users_created_at_user_id', table_name='users', postgresql_concurrently=True)
+        op.create_index('ix_users_email', 'users', ['email'], unique=True, postgresql_concurrently=True)
+        op.drop_index('ix_users_email_lower', table_name='users', postgresql_concurrently=True)
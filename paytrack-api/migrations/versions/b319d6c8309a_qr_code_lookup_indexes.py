@@ -0,0 +1,33 @@
+"""qr code lookup indexes
+
+Revision ID: b319d6c8309a
+Revises: 7941394c4d58
+Create Date: 2026-10-18 11:40:05.118263
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b319d6c8309a'
+down_revision: Union[str, Sequence[str], None] = '7941394c4d58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        # Validación en el punto de pago y feed incremental del filtro en memoria
+        op.create_index('ix_user_qr_codes_qr_code_string_alive', 'user_qr_codes', ['qr_code_string'], unique=True, postgresql_where=sa.text('is_alive'), postgresql_concurrently=True)
+        op.create_index('ix_user_qr_codes_updated_at_qr_code_id', 'user_qr_codes', ['updated_at', 'qr_code_id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_user_qr_codes_updated_at_qr_code_id', table_name='user_qr_codes', postgresql_concurrently=True)
+        op.drop_index('ix_user_qr_codes_qr_code_string_alive', table_name='user_qr_codes', postgresql_concurrently=True)
@@ -0,0 +1,35 @@
+"""reaper indexes
+
+Revision ID: c4a7e2f91d3b
+Revises: 55eb56b84a11
+Create Date: 2026-10-18 16:21:34.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a7e2f91d3b'
+down_revision: Union[str, Sequence[str], None] = '55eb56b84a11'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        # Reaper: códigos expirados y códigos muertos, cada condición con su índice
+        for table in ('verification_codes', 'verification_codes_password_reset'):
+            op.create_index(f'ix_{table}_created_at', table, ['created_at'], unique=False, postgresql_concurrently=True)
+            op.create_index(f'ix_{table}_dead', table, ['verification_code_id'], unique=False, postgresql_where=sa.text('NOT is_alive'), postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table in ('verification_codes_password_reset', 'verification_codes'):
+            op.drop_index(f'ix_{table}_dead', table_name=table, postgresql_concurrently=True)
+            op.drop_index(f'ix_{table}_created_at', table_name=table, postgresql_concurrently=True)
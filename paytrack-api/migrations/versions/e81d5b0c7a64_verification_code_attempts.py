@@ -0,0 +1,31 @@
+"""verification code attempts
+
+Revision ID: e81d5b0c7a64
+Revises: c4a7e2f91d3b
+Create Date: 2026-10-18 17:48:12.903315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e81d5b0c7a64'
+down_revision: Union[str, Sequence[str], None] = 'c4a7e2f91d3b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Con default constante Postgres no reescribe la tabla
+    op.add_column('verification_codes', sa.Column('attempts', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('verification_codes_password_reset', sa.Column('attempts', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('verification_codes_password_reset', 'attempts')
+    op.drop_column('verification_codes', 'attempts')
@@ -0,0 +1,62 @@
+"""
+Falla si importar app.main tarda más que IMPORT_TIME_BUDGET_MS.
+
+    python -m scripts.check_import_time [--runs 3] [--budget-ms N] [--top 15]
+
+Corre `python -X importtime -c "import app.main"` en procesos nuevos, toma
+el mejor tiempo acumulado de app.main y muestra qué paquetes de primer nivel
+se llevan más tiempo propio.
+"""
+import re
+import sys
+import argparse
+import subprocess
+from collections import Counter
+
+from app.core.settings import settings
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def measure() -> tuple[int, Counter]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total_us = 0
+    by_package: Counter = Counter()
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, _, module = match.groups()
+        by_package[module.split(".")[0]] += int(self_us)
+        if module == "app.main":
+            total_us = int(cumulative_us)
+    return total_us, by_package
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--budget-ms", type=float, default=settings.IMPORT_TIME_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    total_us, by_package = min((measure() for _ in range(args.runs)), key=lambda r: r[0])
+
+    print(f"{'package':<24} {'self ms':>10}")
+    for package, self_us in by_package.most_common(args.top):
+        print(f"{package:<24} {self_us / 1000:>10.1f}")
+
+    total_ms = total_us / 1000
+    print(f"\nimport app.main: {total_ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    if total_ms > args.budget_ms:
+        print("Import time budget exceeded")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Corre EXPLAIN sobre las consultas de UserService, de los códigos de
+verificación y del reaper, y falla si alguna no usa un índice.
+
+    python -m scripts.explain_user_queries
+
+Con tablas casi vacías el planner prefiere un seq scan aunque exista el
+índice, por eso se desactiva `enable_seqscan` en la sesión: así se comprueba
+que el índice es utilizable por la consulta, no la elección de costo.
+"""
+import sys
+import asyncio
+from uuid import uuid4
+
+import orjson
+from sqlalchemy import DateTime, bindparam, text, tuple_
+from sqlalchemy.sql import Executable
+from sqlmodel import func, select
+
+from app.core.base_model import utc_now
+from app.core.database import dispose_engine, get_engine
+from app.workers.reaper import default_targets
+from app.models.users import (
+    UserModel,
+    UserQRCodeModel,
+    VerificationCodeModel,
+    VerificationCodePasswordResetModel,
+)
+
+INDEX_NODES = {"Index Scan", "Index Only Scan", "Bitmap Index Scan"}
+
+
+def hot_queries() -> dict[str, Executable]:
+    user_id = uuid4()
+    queries = {
+        "UserService.get_user_by_email": select(UserModel).where(
+            func.lower(UserModel.email) == "someone@paytrack.dev"
+        ),
+        "UserService.get_user_by_id": select(UserModel).where(
+            UserModel.user_id == user_id
+        ),
+        "KeysetPaginator(users)": select(UserModel)
+        .where(
+            tuple_(UserModel.created_at, UserModel.user_id)
+            > tuple_(utc_now(), user_id)
+        )
+        .order_by(UserModel.created_at, UserModel.user_id)
+        .limit(21),
+        "UserQRCodeModel alive by user": select(UserQRCodeModel).where(
+            UserQRCodeModel.user_id == user_id, UserQRCodeModel.is_alive
+        ),
+    }
+    for model in (VerificationCodeModel, VerificationCodePasswordResetModel):
+        queries[f"SQLVerificationCodeStore.verify({model.__tablename__})"] = (
+            select(model.verification_code_id, model.code, model.attempts)
+            .where(model.user_id == user_id, model.is_alive, model.created_at > utc_now())
+        )
+    for target in default_targets():
+        statement = text(f"SELECT ctid FROM {target.table} WHERE {target.condition} LIMIT 1000")
+        if ":cutoff" in target.condition:
+            statement = statement.bindparams(
+                bindparam("cutoff", value=utc_now(), type_=DateTime())
+            )
+        queries[f"Reaper({target.table}: {target.condition})"] = statement
+    return queries
+
+
+def plan_nodes(plan: dict) -> list[tuple[str, str | None]]:
+    nodes = [(plan["Node Type"], plan.get("Index Name"))]
+    for child in plan.get("Plans", []):
+        nodes.extend(plan_nodes(child))
+    return nodes
+
+
+async def main() -> int:
+    failures = 0
+    async with get_engine().connect() as conn:
+        await conn.execute(text("SET enable_seqscan = off"))
+        for name, statement in hot_queries().items():
+            compiled = statement.compile(
+                dialect=conn.dialect, compile_kwargs={"literal_binds": True}
+            )
+            # EXPLAIN sin ANALYZE: el UPDATE no se ejecuta
+            result = await conn.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+            plan = result.scalar_one()
+            if isinstance(plan, (str, bytes)):
+                plan = orjson.loads(plan)
+
+            nodes = plan_nodes(plan[0]["Plan"])
+            indexes = [index for node, index in nodes if node in INDEX_NODES]
+            ok = bool(indexes)
+            failures += not ok
+            print(f"{'OK  ' if ok else 'FAIL'} {name}: {', '.join(indexes) or nodes}")
+    await dispose_engine()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,22 @@
+import os
+
+# Valores mínimos para que app.core.settings cargue sin un .env
+for key, value in {
+    "API_V1": "/api/v1",
+    "PROJECT_NAME": "paytrack",
+    "DB_USER": "paytrack",
+    "DB_PASSWORD": "paytrack",
+    "DB_NAME": "paytrack",
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DATABASE_URL": "sqlite:///:memory:",
+    "JWT_SECRET_KEY": "test-secret-key-with-at-least-32-bytes",
+    "JWT_ALGORITHM": "HS256",
+    "REDIS_HOST": "localhost",
+    "REDIS_PORT": "6379",
+    "SMTP_SERVER": "localhost",
+    "SMTP_PORT": "1025",
+    "SMTP_USERNAME": "noreply@paytrack.dev",
+    "SMTP_PASSWORD": "paytrack",
+}.items():
+    os.environ.setdefault(key, value)
@@ -0,0 +1,25 @@
+from datetime import date
+
+import pytest
+from pydantic import ValidationError
+
+from app.api.auth.auth_schema import SignupSchema
+
+SIGNUP = {
+    "name": "Test",
+    "lastName": "User",
+    "email": "test@paytrack.dev",
+    "password": "Secret123!",
+}
+
+
+def test_signup_parses_iso_birth_date():
+    schema = SignupSchema.model_validate({**SIGNUP, "birthDate": "2000-01-31"})
+    assert schema.birth_date == date(2000, 1, 31)
+    assert schema.model_dump(mode="json", by_alias=True)["birthDate"] == "2000-01-31"
+
+
+@pytest.mark.parametrize("birth_date", ["31/01/2000", "2000-02-30", "ayer"])
+def test_signup_rejects_invalid_birth_date(birth_date):
+    with pytest.raises(ValidationError):
+        SignupSchema.model_validate({**SIGNUP, "birthDate": birth_date})
@@ -0,0 +1,24 @@
+from uuid import uuid4
+from datetime import datetime, timezone
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+from app.api.users.user_schema import UserSchema
+from app.core.http_response import dumps
+
+
+def test_models_serialize_like_response_model():
+    user = UserSchema(
+        user_id=uuid4(),
+        rol="user",
+        name="Ximena",
+        last_name="Lopez",
+        email="ximena@paytrack.dev",
+        birth_date=datetime(1990, 5, 17, tzinfo=timezone.utc),
+    )
+
+    body = orjson.loads(dumps({"data": user}))
+
+    assert body["data"] == jsonable_encoder(user, by_alias=True)
+    assert "userId" in body["data"] and "user_id" not in body["data"]
@@ -0,0 +1,38 @@
+import json
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ed25519
+from jwt.algorithms import OKPAlgorithm
+
+from app.utils.jwks_verifier import JWKSVerifier
+
+PRIVATE_KEY = ed25519.Ed25519PrivateKey.generate()
+
+
+def make_verifier() -> JWKSVerifier:
+    jwk = json.loads(OKPAlgorithm.to_jwk(PRIVATE_KEY.public_key()))
+    return JWKSVerifier.from_jwks({"keys": [{**jwk, "kid": "k1", "alg": "EdDSA", "use": "sig"}]})
+
+
+def make_token(refresh: bool) -> str:
+    return jwt.encode(
+        {"sub": "user", "refresh": refresh}, PRIVATE_KEY, algorithm="EdDSA", headers={"kid": "k1"}
+    )
+
+
+def test_accepts_access_token():
+    assert make_verifier().verify(make_token(refresh=False))["sub"] == "user"
+
+
+def test_rejects_refresh_token_by_default():
+    verifier = make_verifier()
+    with pytest.raises(jwt.InvalidTokenError):
+        verifier.verify(make_token(refresh=True))
+    assert verifier.verify(make_token(refresh=True), allow_refresh=True)["refresh"] is True
+
+
+def test_rejects_unknown_kid():
+    token = jwt.encode({"sub": "user"}, PRIVATE_KEY, algorithm="EdDSA", headers={"kid": "k2"})
+    with pytest.raises(jwt.InvalidTokenError):
+        make_verifier().verify(token)
@@ -0,0 +1,109 @@
+import asyncio
+from uuid import uuid4
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+import app.models.users  # noqa: F401
+import app.models.points  # noqa: F401
+from app.core.pagination import KeysetPaginator, decode_cursor, encode_cursor
+from app.models.users.user_model import UserModel
+
+
+def test_cursor_round_trip():
+    keys = [datetime(2026, 1, 2, 3, 4, 5, 678), uuid4(), date(2026, 1, 2), 7, "x"]
+    assert decode_cursor(encode_cursor(keys, 4, "prev")) == (keys, 4, "prev")
+
+
+def test_invalid_cursor_is_bad_request():
+    with pytest.raises(HTTPException) as error:
+        decode_cursor("not-a-cursor")
+    assert error.value.status_code == 400
+
+
+def make_users(count: int, ties: int) -> list[UserModel]:
+    base = datetime(2026, 1, 1)
+    users = []
+    for n in range(count):
+        # Los primeros `ties` comparten created_at: desempata user_id
+        created_at = base if n < ties else base + timedelta(minutes=n)
+        users.append(
+            UserModel(
+                name=f"User{n}",
+                last_name="Test",
+                birth_date=date(1990, 1, 1),
+                email=f"user{n}@paytrack.dev",
+                password="x",
+                created_at=created_at,
+            )
+        )
+    return users
+
+
+def with_users(tmp_path, users, scenario):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'pagination.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        try:
+            async with AsyncSession(engine, expire_on_commit=False) as session:
+                session.add_all(users)
+                await session.commit()
+                return await scenario(session)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+def test_walks_every_row_once_in_both_directions(tmp_path):
+    users = make_users(8, ties=4)
+    expected = [
+        user.user_id
+        for user in sorted(users, key=lambda u: (u.created_at, u.user_id), reverse=True)
+    ]
+    paginator = KeysetPaginator(
+        order_by=[UserModel.created_at, UserModel.user_id], page_size=3, descending=True
+    )
+
+    async def scenario(session):
+        forward, cursor = [], None
+        while True:
+            items, pagination = await paginator.paginate(session, select(UserModel), cursor)
+            forward.append([item.user_id for item in items])
+            if pagination.nextCursor is None:
+                break
+            cursor = pagination.nextCursor
+
+        backward = [forward[-1]]
+        cursor = pagination.prevCursor
+        while cursor:
+            items, pagination = await paginator.paginate(session, select(UserModel), cursor)
+            backward.insert(0, [item.user_id for item in items])
+            cursor = pagination.prevCursor
+        return forward, backward, pagination
+
+    forward, backward, first_page = with_users(tmp_path, users, scenario)
+
+    assert [user_id for page in forward for user_id in page] == expected
+    assert [len(page) for page in forward] == [3, 3, 2]
+    assert backward == forward
+    # Fuera de Postgres no hay estimación del planner: COUNT(*) exacto
+    assert first_page.count == 8 and not first_page.isApproximate
+    assert first_page.currentPage == 1 and first_page.prevPage is None
+
+
+def test_rejects_cursor_with_other_arity(tmp_path):
+    paginator = KeysetPaginator(order_by=[UserModel.created_at, UserModel.user_id])
+    cursor = encode_cursor([datetime(2026, 1, 1)], 2, "next")
+
+    async def scenario(session):
+        await paginator.paginate(session, select(UserModel), cursor)
+
+    with pytest.raises(HTTPException) as error:
+        with_users(tmp_path, [], scenario)
+    assert error.value.status_code == 400
@@ -0,0 +1,84 @@
+import asyncio
+from contextlib import asynccontextmanager
+from uuid import uuid4
+
+import pytest
+
+import app.api.points.points_service as points_service
+from app.api.points.points_service import PointsCreditBatcher
+
+
+class FakeLedger:
+    """apply_credits sobre memoria, con la semántica de ON CONFLICT DO NOTHING."""
+
+    def __init__(self):
+        self.keys: set[str] = set()
+        self.balances: dict = {}
+        self.statements = 0
+
+    async def apply_credits(self, credits, session):
+        self.statements += 1
+        applied = {}
+        for credit in credits:
+            if credit.idempotency_key in self.keys:
+                continue
+            self.keys.add(credit.idempotency_key)
+            self.balances[credit.user_id] = self.balances.get(credit.user_id, 0) + credit.delta
+            applied[credit.idempotency_key] = f"{credit.user_id}@paytrack.dev"
+        return applied
+
+
+class FakeSession:
+    async def commit(self):
+        pass
+
+
+@asynccontextmanager
+async def session_maker():
+    yield FakeSession()
+
+
+@pytest.fixture
+def ledger(monkeypatch):
+    ledger = FakeLedger()
+    invalidated = []
+
+    async def invalidate(user_id, email):
+        invalidated.append((user_id, email))
+
+    monkeypatch.setattr(points_service.PointsService, "apply_credits", ledger.apply_credits)
+    monkeypatch.setattr(points_service.user_cache, "invalidate", invalidate)
+    ledger.invalidated = invalidated
+    return ledger
+
+
+def test_repeated_key_in_one_batch_is_applied_once(ledger):
+    user_id = uuid4()
+
+    async def scenario():
+        batcher = PointsCreditBatcher(session_maker, max_delay=0.01)
+        return await asyncio.gather(
+            batcher.credit(user_id, 100, "order-1", "purchase"),
+            batcher.credit(user_id, 100, "order-1", "purchase"),
+            batcher.credit(user_id, 50, "order-2", "purchase"),
+        )
+
+    results = asyncio.run(scenario())
+
+    assert results == [True, False, True]
+    assert ledger.statements == 1
+    assert ledger.balances == {user_id: 150}
+    assert ledger.invalidated == [(user_id, f"{user_id}@paytrack.dev")]
+
+
+def test_key_already_registered_is_not_applied(ledger):
+    user_id = uuid4()
+
+    async def scenario():
+        batcher = PointsCreditBatcher(session_maker, max_delay=0.01)
+        first = await batcher.credit(user_id, 100, "order-1", "purchase")
+        again = await batcher.credit(user_id, 100, "order-1", "purchase")
+        return first, again
+
+    assert asyncio.run(scenario()) == (True, False)
+    assert ledger.balances == {user_id: 100}
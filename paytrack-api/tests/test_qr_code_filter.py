@@ -0,0 +1,125 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+import app.models.users  # noqa: F401
+import app.models.points  # noqa: F401
+import app.api.qr_codes.qr_code_service as qr_code_service
+from app.models.users import UserQRCodeModel
+from app.utils.qr_code_filter import QRCodeFilter
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+def with_db(tmp_path, live_codes, scenario):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'qr.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        try:
+            async with session_maker() as session:
+                session.add_all(
+                    UserQRCodeModel(user_id=uuid4(), qr_code_string=code) for code in live_codes
+                )
+                await session.commit()
+            return await scenario(session_maker)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+def message(sign: str, *codes: str) -> str:
+    return " ".join(f"{sign}{QRCodeFilter.digest(code):016x}" for code in codes)
+
+
+def test_reload_keeps_adds_announced_before_their_commit(tmp_path):
+    qr_filter = QRCodeFilter()
+
+    async def scenario(session_maker):
+        # "pending" se anunció pero su transacción no había hecho commit al leer
+        qr_filter.apply(message("+", "pending"))
+        await qr_filter.reload(session_maker)
+        kept = qr_filter.might_contain("pending")
+
+        qr_filter.pending_ttl = 0
+        await qr_filter.reload(session_maker)
+        return kept
+
+    kept = with_db(tmp_path, ["live"], scenario)
+
+    assert kept
+    # Pasado pending_ttl manda la base
+    assert not qr_filter.might_contain("pending")
+    assert qr_filter.might_contain("live")
+
+
+def test_removal_after_reload_wins(tmp_path):
+    qr_filter = QRCodeFilter()
+
+    async def scenario(session_maker):
+        await qr_filter.reload(session_maker)
+        qr_filter.apply(message("-", "revoked"))
+        # Una alta seguida de su baja no debe sobrevivir a la recarga
+        qr_filter.apply(message("+", "late") + " " + message("-", "late"))
+        await qr_filter.reload(session_maker)
+
+    with_db(tmp_path, ["revoked", "live"], scenario)
+
+    # "revoked" sigue en la base de prueba: la recarga lo regresa (solo un sobrante)
+    assert qr_filter.might_contain("revoked")
+    assert not qr_filter.might_contain("late")
+    assert qr_filter.might_contain("live")
+
+
+def test_announce_reaches_other_workers_before_commit(tmp_path):
+    redis = fakeredis.FakeAsyncRedis()
+    issuer, payer = QRCodeFilter(redis=redis), QRCodeFilter(redis=redis)
+
+    async def scenario(session_maker):
+        sync = asyncio.create_task(payer.run_forever(session_maker))
+        try:
+            while not payer.ready:
+                await asyncio.sleep(0.01)
+            await issuer.announce(["fresh"])
+            for _ in range(200):
+                if payer.might_contain("fresh"):
+                    break
+                await asyncio.sleep(0.01)
+            return payer.might_contain("fresh")
+        finally:
+            sync.cancel()
+
+    assert with_db(tmp_path, [], scenario)
+
+
+def test_failed_announce_aborts_issue(tmp_path, monkeypatch):
+    server = fakeredis.FakeServer()
+    server.connected = False
+    monkeypatch.setattr(
+        qr_code_service, "qr_code_filter", QRCodeFilter(redis=fakeredis.FakeAsyncRedis(server=server))
+    )
+    user_id = uuid4()
+
+    async def scenario(session_maker):
+        async with session_maker() as session:
+            session.add(UserQRCodeModel(user_id=user_id, qr_code_string="previous"))
+            await session.commit()
+
+            with pytest.raises(HTTPException) as error:
+                await qr_code_service.QRCodeService.issue_qr_code(user_id, session)
+
+            rows = (await session.exec(select(UserQRCodeModel))).all()
+            return error.value.status_code, [(row.qr_code_string, row.is_alive) for row in rows]
+
+    status_code, rows = with_db(tmp_path, [], scenario)
+
+    assert status_code == 503
+    # Ni se emitió el nuevo ni se revocó el anterior
+    assert rows == [("previous", True)]
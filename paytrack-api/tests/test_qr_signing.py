@@ -0,0 +1,75 @@
+import base64
+from uuid import uuid4
+
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ed25519
+from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
+
+from app.utils.qr_signing import (
+    PREFIX,
+    InvalidQRPayload,
+    QRPayloadSigner,
+    QRPayloadVerifier,
+    load_public_key,
+)
+
+NOW = 1_800_000_000
+
+
+@pytest.fixture
+def signer():
+    return QRPayloadSigner(ed25519.Ed25519PrivateKey.generate())
+
+
+def reason(verifier, token, **kwargs) -> str:
+    with pytest.raises(InvalidQRPayload) as error:
+        verifier.verify(token, now=NOW, **kwargs)
+    return error.value.reason
+
+
+def test_scanner_verifies_with_public_key_only(signer):
+    user_id, qr_code_id = uuid4(), uuid4()
+    token = signer.sign(user_id, qr_code_id, expires_at=NOW + 60)
+
+    raw = signer.public_key.public_bytes(Encoding.Raw, PublicFormat.Raw)
+    scanner = QRPayloadVerifier(load_public_key(raw))
+    payload = scanner.verify(token, now=NOW)
+
+    assert token.startswith(PREFIX)
+    assert (payload.user_id, payload.qr_code_id, payload.expires_at) == (
+        user_id, qr_code_id, NOW + 60,
+    )
+    assert not hasattr(scanner, "sign")
+
+
+def test_expired(signer):
+    token = signer.sign(uuid4(), uuid4(), expires_at=NOW)
+    assert reason(signer, token) == "expired"
+
+
+def test_tampered_payload(signer):
+    token = signer.sign(uuid4(), uuid4(), expires_at=NOW + 60)
+    encoded = token[len(PREFIX):]
+    raw = bytearray(base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4)))
+    # Otro user_id con la firma original
+    raw[1] ^= 0x01
+    tampered = PREFIX + base64.urlsafe_b64encode(bytes(raw)).decode().rstrip("=")
+
+    assert reason(signer, tampered) == "bad_signature"
+
+
+def test_other_key_is_rejected(signer):
+    other = QRPayloadSigner(ed25519.Ed25519PrivateKey.generate())
+    token = other.sign(uuid4(), uuid4(), expires_at=NOW + 60)
+    assert reason(signer, token) == "bad_signature"
+
+
+def test_revoked(signer):
+    qr_code_id = uuid4()
+    token = signer.sign(uuid4(), qr_code_id, expires_at=NOW + 60)
+    assert reason(signer, token, revoked={qr_code_id}) == "revoked"
+
+
+@pytest.mark.parametrize("token", ["", "PT2.", "PT2.%%%", "PT1.AAAA", PREFIX + "A" * 40])
+def test_malformed(signer, token):
+    assert reason(signer, token) == "malformed"
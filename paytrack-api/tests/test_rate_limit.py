@@ -0,0 +1,70 @@
+import asyncio
+
+import fakeredis
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.core.rate_limit import BucketLimit, RateLimit, TokenBucketLimiter, get_client_ip
+from app.core.settings import settings
+
+
+def make_request(peer: str, *forwarded: str) -> Request:
+    headers = [(b"x-forwarded-for", value.encode()) for value in forwarded]
+    return Request({
+        "type": "http",
+        "method": "POST",
+        "path": "/auth/signin",
+        "headers": headers,
+        "client": (peer, 4321),
+    })
+
+
+@pytest.fixture
+def behind_proxies(monkeypatch):
+    def configure(hops: int):
+        monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+        monkeypatch.setattr(settings, "RATE_LIMIT_TRUST_FORWARDED", True)
+        monkeypatch.setattr(settings, "RATE_LIMIT_TRUSTED_PROXIES", hops)
+    return configure
+
+
+def test_ignores_forwarded_unless_trusted(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUST_FORWARDED", False)
+    assert get_client_ip(make_request("10.0.0.1", "1.2.3.4")) == "10.0.0.1"
+
+
+def test_uses_entry_appended_by_our_proxy(behind_proxies):
+    behind_proxies(1)
+    # El cliente manda "6.6.6.6"; nuestro proxy agrega la IP real al final
+    assert get_client_ip(make_request("10.0.0.1", "6.6.6.6, 203.0.113.7")) == "203.0.113.7"
+    assert get_client_ip(make_request("10.0.0.1", "6.6.6.6", "203.0.113.7")) == "203.0.113.7"
+
+
+def test_skips_configured_proxy_hops(behind_proxies):
+    behind_proxies(2)
+    request = make_request("10.0.0.1", "6.6.6.6, 203.0.113.7, 10.0.0.2")
+    assert get_client_ip(request) == "203.0.113.7"
+    # Menos entradas que proxies: no pasó por los nuestros, no se confía en el header
+    assert get_client_ip(make_request("10.0.0.1", "6.6.6.6")) == "10.0.0.1"
+
+
+def test_forged_forwarded_for_shares_one_bucket(behind_proxies):
+    behind_proxies(1)
+    limit = RateLimit(
+        scope="signin",
+        per_ip=BucketLimit(capacity=3, period=60),
+        limiter=TokenBucketLimiter(fakeredis.FakeAsyncRedis()),
+    )
+
+    async def attempt(i: int):
+        await limit(make_request("10.0.0.1", f"198.51.100.{i}, 203.0.113.7"))
+
+    async def run():
+        for i in range(3):
+            await attempt(i)
+        with pytest.raises(HTTPException) as exc:
+            await attempt(3)
+        return exc.value
+
+    assert asyncio.run(run()).status_code == 429
@@ -0,0 +1,117 @@
+import asyncio
+from uuid import uuid4
+from datetime import timedelta
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+import app.models.users  # noqa: F401
+import app.models.points  # noqa: F401
+from app.core.base_model import utc_now
+from app.core.settings import settings
+from app.models.users import UserQRCodeModel, VerificationCodeModel
+from app.workers.reaper import Reaper, default_targets
+
+
+def reclaimed(table: str, reason: str) -> float:
+    labels = {"table": table, "reason": reason}
+    return REGISTRY.get_sample_value("paytrack_reaper_rows_reclaimed_total", labels) or 0
+
+
+def seed_rows() -> tuple[list, set[str]]:
+    """Filas de cada caso; regresa también los códigos que deben sobrevivir."""
+    now, user_id = utc_now(), uuid4()
+    expired = now - timedelta(seconds=settings.VERIFICATION_CODE_TTL + 60)
+    old = now - timedelta(seconds=settings.REAPER_QR_CODE_RETENTION + 60)
+
+    def code(value: str, is_alive: bool, created_at):
+        return VerificationCodeModel(
+            user_id=user_id, code=value, is_alive=is_alive, created_at=created_at
+        )
+
+    def qr(value: str, is_alive: bool, updated_at):
+        return UserQRCodeModel(
+            user_id=user_id, qr_code_string=value, is_alive=is_alive, updated_at=updated_at
+        )
+
+    rows = [
+        code("live", True, now),
+        *(code(f"dead{n}", False, now) for n in range(3)),
+        *(code(f"expired{n}", True, expired) for n in range(2)),
+        qr("qr-live", True, old),
+        qr("qr-dead-recent", False, now),
+        qr("qr-dead-old", False, old),
+    ]
+    return rows, {"live", "qr-live", "qr-dead-recent"}
+
+
+def run_reaper(tmp_path, scenario):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'reaper.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        rows, survivors = seed_rows()
+        try:
+            async with AsyncSession(engine) as session:
+                session.add_all(rows)
+                await session.commit()
+            return await scenario(engine, survivors)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+async def remaining(engine) -> set[str]:
+    async with AsyncSession(engine) as session:
+        codes = (await session.exec(select(VerificationCodeModel.code))).all()
+        qr_codes = (await session.exec(select(UserQRCodeModel.qr_code_string))).all()
+    return {*codes, *qr_codes}
+
+
+def test_deletes_dead_and_expired_rows_in_batches(tmp_path):
+    counters = [
+        ("verification_codes", "dead"),
+        ("verification_codes", "expired"),
+        ("user_qr_codes", "dead"),
+    ]
+    before = {key: reclaimed(*key) for key in counters}
+
+    async def scenario(engine, survivors):
+        reaper = Reaper(engine, default_targets(), batch_size=2, batch_pause=0)
+        stats = await reaper.run_once()
+        return stats, await remaining(engine), survivors
+
+    stats, left, survivors = run_reaper(tmp_path, scenario)
+
+    assert left == survivors
+    assert stats == {
+        "verification_codes": 5,
+        "verification_codes_password_reset": 0,
+        "user_qr_codes": 1,
+    }
+    assert [reclaimed(*key) - before[key] for key in counters] == [3, 2, 1]
+
+
+def test_one_run_per_lease_across_processes(tmp_path):
+    fakeredis = pytest.importorskip("fakeredis")
+    redis = fakeredis.FakeAsyncRedis()
+
+    async def scenario(engine, survivors):
+        first = Reaper(engine, default_targets(), redis=redis, lease=60, batch_pause=0)
+        second = Reaper(engine, default_targets(), redis=redis, lease=60, batch_pause=0)
+        leader = await first.run_once()
+        follower = await second.run_once()
+        forced = await second.run_once(force=True)
+        return leader, follower, forced, await remaining(engine), survivors
+
+    leader, follower, forced, left, survivors = run_reaper(tmp_path, scenario)
+
+    assert leader["verification_codes"] == 5
+    # Sin lease no toca la base
+    assert follower == {}
+    assert forced["verification_codes"] == 0
+    assert left == survivors
@@ -0,0 +1,98 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from app.utils.refresh_tokens import (
+    LocalRefreshTokenStore,
+    RedisRefreshTokenStore,
+    RefreshTokenResult,
+)
+
+
+def local_store():
+    return LocalRefreshTokenStore(ttl=60)
+
+
+def redis_store():
+    fakeredis = pytest.importorskip("fakeredis")
+    return RedisRefreshTokenStore(fakeredis.FakeAsyncRedis(), ttl=60)
+
+
+@pytest.fixture(params=[local_store, redis_store], ids=["local", "redis"])
+def make_store(request):
+    return request.param
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_rotate_chains_within_family(make_store):
+    async def scenario():
+        store, user_id = make_store(), uuid4()
+        jti, family_id = await store.issue(user_id)
+
+        result, next_jti = await store.rotate(user_id, jti, family_id)
+        assert result == RefreshTokenResult.VALID
+        assert next_jti not in (None, jti)
+
+        result, _ = await store.rotate(user_id, next_jti, family_id)
+        assert result == RefreshTokenResult.VALID
+
+    run(scenario())
+
+
+def test_reuse_revokes_family(make_store):
+    async def scenario():
+        store, user_id = make_store(), uuid4()
+        jti, family_id = await store.issue(user_id)
+        _, next_jti = await store.rotate(user_id, jti, family_id)
+
+        assert await store.rotate(user_id, jti, family_id) == (RefreshTokenResult.REUSED, None)
+        # El sucesor legítimo también deja de servir
+        assert await store.rotate(user_id, next_jti, family_id) == (RefreshTokenResult.UNKNOWN, None)
+
+    run(scenario())
+
+
+def test_concurrent_rotation_of_same_token(make_store):
+    async def scenario():
+        store, user_id = make_store(), uuid4()
+        jti, family_id = await store.issue(user_id)
+
+        results = await asyncio.gather(
+            store.rotate(user_id, jti, family_id), store.rotate(user_id, jti, family_id)
+        )
+        assert sorted(result.value for result, _ in results) == ["REUSED", "VALID"]
+
+        winner = next(next_jti for result, next_jti in results if next_jti is not None)
+        assert await store.rotate(user_id, winner, family_id) == (RefreshTokenResult.UNKNOWN, None)
+
+    run(scenario())
+
+
+def test_revoked_family_is_not_resurrected(make_store):
+    async def scenario():
+        store, user_id = make_store(), uuid4()
+        jti, family_id = await store.issue(user_id)
+        _, next_jti = await store.rotate(user_id, jti, family_id)
+
+        await store.revoke_user(user_id)
+        assert await store.rotate(user_id, next_jti, family_id) == (RefreshTokenResult.UNKNOWN, None)
+
+        # Una familia nueva (login) no se ve afectada
+        jti, family_id = await store.issue(user_id)
+        assert (await store.rotate(user_id, jti, family_id))[0] == RefreshTokenResult.VALID
+
+    run(scenario())
+
+
+def test_unknown_token(make_store):
+    async def scenario():
+        store, user_id = make_store(), uuid4()
+        _, family_id = await store.issue(user_id)
+        assert await store.rotate(user_id, "missing", family_id) == (RefreshTokenResult.UNKNOWN, None)
+        assert await store.rotate(user_id, "missing", "missing") == (RefreshTokenResult.UNKNOWN, None)
+
+    run(scenario())
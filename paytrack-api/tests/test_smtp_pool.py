@@ -0,0 +1,127 @@
+import time
+import socket
+import asyncio
+import threading
+from email.message import EmailMessage
+
+import pytest
+
+aiosmtpd = pytest.importorskip("aiosmtpd")
+from aiosmtpd.controller import Controller
+from aiosmtpd.handlers import Sink
+from aiosmtpd.smtp import SMTP
+
+from app.utils.smtp_pool import SMTPConnectionPool
+
+
+class TrackingSMTP(SMTP):
+    def __init__(self, server, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.server = server
+
+    def connection_made(self, transport):
+        self.server.on_open(self)
+        super().connection_made(transport)
+
+    def connection_lost(self, error):
+        self.server.on_close(self)
+        super().connection_lost(error)
+
+
+class StubSMTPServer(Controller):
+    """Servidor SMTP local que cuenta conexiones y puede tirarlas."""
+
+    def __init__(self):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        super().__init__(Sink(), hostname="127.0.0.1", port=port)
+        self.lock = threading.Lock()
+        self.open: set[TrackingSMTP] = set()
+        self.total = 0
+        self.peak = 0
+
+    def factory(self):
+        return TrackingSMTP(self, self.handler)
+
+    def on_open(self, session):
+        with self.lock:
+            self.open.add(session)
+            self.total += 1
+            self.peak = max(self.peak, len(self.open))
+
+    def on_close(self, session):
+        with self.lock:
+            self.open.discard(session)
+
+    def reset(self):
+        for _ in range(100):
+            if not self.open:
+                break
+            time.sleep(0.01)
+        with self.lock:
+            self.total = self.peak = 0
+
+    def drop_all(self):
+        for session in list(self.open):
+            self.loop.call_soon_threadsafe(session.transport.close)
+
+
+@pytest.fixture
+def server():
+    controller = StubSMTPServer()
+    controller.start()
+    # start() abre una conexión propia para saber que el servidor ya escucha
+    controller.reset()
+    yield controller
+    controller.stop()
+
+
+def make_pool(server, **kwargs):
+    return SMTPConnectionPool(
+        hostname=server.hostname, port=server.port, start_tls=False, **kwargs
+    )
+
+
+def message(n: int) -> EmailMessage:
+    msg = EmailMessage()
+    msg["From"] = "noreply@paytrack.dev"
+    msg["To"] = f"user{n}@paytrack.dev"
+    msg["Subject"] = "test"
+    msg.set_content("hola")
+    return msg
+
+
+def test_reuses_one_connection(server):
+    async def scenario():
+        pool = make_pool(server)
+        for n in range(5):
+            await pool.send_message(message(n))
+        await pool.close()
+
+    asyncio.run(scenario())
+    assert server.total == 1
+
+
+def test_reconnects_after_dropped_connection(server):
+    async def scenario():
+        pool = make_pool(server)
+        await pool.send_message(message(0))
+        server.drop_all()
+        await asyncio.sleep(0.2)
+        await pool.send_message(message(1))
+        await pool.close()
+
+    asyncio.run(scenario())
+    assert server.total == 2
+
+
+def test_caps_concurrent_connections(server):
+    async def scenario():
+        pool = make_pool(server, max_size=2)
+        await asyncio.gather(*(pool.send_message(message(n)) for n in range(10)))
+        await pool.close()
+
+    asyncio.run(scenario())
+    assert server.peak <= 2
+    assert server.total <= 2
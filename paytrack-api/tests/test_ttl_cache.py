@@ -0,0 +1,26 @@
+import asyncio
+
+from app.utils.ttl_cache import TTLCache
+
+
+def test_cancelled_loader_does_not_cancel_waiters():
+    async def scenario():
+        cache, calls = TTLCache(ttl=60), []
+
+        async def loader():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "value", None
+
+        leader = asyncio.create_task(cache.get_or_load("key", loader))
+        await asyncio.sleep(0.01)
+        waiters = [asyncio.create_task(cache.get_or_load("key", loader)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+
+        assert await asyncio.gather(*waiters) == ["value"] * 3
+        assert leader.cancelled()
+        # Solo una de las que esperaban repite la carga
+        assert len(calls) == 2
+
+    asyncio.run(scenario())
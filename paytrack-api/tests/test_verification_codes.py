@@ -0,0 +1,108 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+import app.models.users  # noqa: F401
+import app.models.points  # noqa: F401
+from app.constants.user_constants import VerificationModels
+from app.utils.verification_codes import (
+    RedisVerificationCodeStore,
+    SQLVerificationCodeStore,
+    VerificationResult,
+)
+
+SIGNUP = VerificationModels.VERIFICATION_CODE_MODEL
+RESET = VerificationModels.VERIFICATION_CODE_PASSWORD_RESET_MODEL
+OPTIONS = {"ttl": 60, "max_attempts": 3}
+
+
+async def redis_store(tmp_path, scenario):
+    fakeredis = pytest.importorskip("fakeredis")
+    await scenario(RedisVerificationCodeStore(fakeredis.FakeAsyncRedis(), **OPTIONS))
+
+
+async def sql_store(tmp_path, scenario):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'codes.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    try:
+        session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        await scenario(SQLVerificationCodeStore(session_maker, **OPTIONS))
+    finally:
+        await engine.dispose()
+
+
+@pytest.fixture(params=[redis_store, sql_store], ids=["redis", "sql"])
+def with_store(request, tmp_path):
+    return lambda scenario: asyncio.run(request.param(tmp_path, scenario))
+
+
+def wrong(code: str) -> str:
+    return str((int(code) + 1) % 10 ** len(code)).zfill(len(code))
+
+
+def test_code_is_consumed_once(with_store):
+    async def scenario(store):
+        user_id = uuid4()
+        code = await store.issue(SIGNUP, user_id)
+
+        assert await store.verify(SIGNUP, user_id, code) == VerificationResult.VALID
+        assert await store.verify(SIGNUP, user_id, code) == VerificationResult.NOT_FOUND
+
+    with_store(scenario)
+
+
+def test_new_code_replaces_previous_one(with_store):
+    async def scenario(store):
+        user_id = uuid4()
+        first = await store.issue(SIGNUP, user_id)
+        second = await store.issue(SIGNUP, user_id)
+
+        if first != second:
+            assert await store.verify(SIGNUP, user_id, first) == VerificationResult.INVALID
+        assert await store.verify(SIGNUP, user_id, second) == VerificationResult.VALID
+
+    with_store(scenario)
+
+
+def test_attempts_are_exhausted(with_store):
+    async def scenario(store):
+        user_id = uuid4()
+        code = await store.issue(SIGNUP, user_id)
+
+        assert await store.verify(SIGNUP, user_id, wrong(code)) == VerificationResult.INVALID
+        assert await store.verify(SIGNUP, user_id, wrong(code)) == VerificationResult.INVALID
+        assert await store.verify(SIGNUP, user_id, wrong(code)) == VerificationResult.TOO_MANY_ATTEMPTS
+        # El código muere al agotar los intentos, aunque después llegue el correcto
+        assert await store.verify(SIGNUP, user_id, code) == VerificationResult.NOT_FOUND
+
+    with_store(scenario)
+
+
+def test_types_and_users_are_independent(with_store):
+    async def scenario(store):
+        user_id, other_id = uuid4(), uuid4()
+        code = await store.issue(SIGNUP, user_id)
+
+        assert await store.verify(RESET, user_id, code) == VerificationResult.NOT_FOUND
+        assert await store.verify(SIGNUP, other_id, code) == VerificationResult.NOT_FOUND
+        assert await store.verify(SIGNUP, user_id, code) == VerificationResult.VALID
+
+    with_store(scenario)
+
+
+def test_concurrent_verifications_consume_once(with_store):
+    async def scenario(store):
+        user_id = uuid4()
+        code = await store.issue(SIGNUP, user_id)
+
+        results = await asyncio.gather(
+            *(store.verify(SIGNUP, user_id, code) for _ in range(3))
+        )
+        assert results.count(VerificationResult.VALID) == 1
+
+    with_store(scenario)